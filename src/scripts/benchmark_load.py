@@ -0,0 +1,148 @@
+"""
+Benchmark loading the consolidated HED test files.
+
+Compares a cold load (json.load of the source) with a warm load from the
+marshal snapshot kept next to the source by corpus.load_consolidated, and
+reports the compression ratio and streaming read throughput of the plain,
+gzip, and xz forms of each file. Each measurement is the best of several
+repeats.
+
+Usage:
+    python src/scripts/benchmark_load.py
+    python src/scripts/benchmark_load.py --repeat 10
+    python src/scripts/benchmark_load.py --input json_test_data/validation_tests.json
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List
+
+try:
+    from .corpus import CONSOLIDATED_FILES, compress_artifact, iter_artifact, load_consolidated, snapshot_path
+except ImportError:
+    from corpus import CONSOLIDATED_FILES, compress_artifact, iter_artifact, load_consolidated, snapshot_path
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """
+    Return the fastest of several timed calls.
+
+    Parameters:
+        func (Callable[[], object]): Function to time
+        repeat (int): Number of calls
+
+    Returns:
+        float: Fastest call in seconds
+    """
+    best = float("inf")
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_file(path: Path, repeat: int) -> dict:
+    """
+    Time cold and warm loads of one consolidated file.
+
+    Parameters:
+        path (Path): Path to a consolidated JSON file
+        repeat (int): Number of timed calls per measurement
+
+    Returns:
+        dict: Source bytes, snapshot bytes, and cold, rebuild, and warm seconds
+    """
+    snapshot = snapshot_path(path)
+    snapshot.unlink(missing_ok=True)
+    rebuild = best_time(lambda: load_consolidated(path, snapshot=True), 1)
+    cold = best_time(lambda: load_consolidated(path), repeat)
+    warm = best_time(lambda: load_consolidated(path, snapshot=True), repeat)
+    return {
+        "source_bytes": path.stat().st_size,
+        "snapshot_bytes": snapshot.stat().st_size if snapshot.exists() else 0,
+        "cold": cold,
+        "rebuild": rebuild,
+        "warm": warm,
+    }
+
+
+def benchmark_formats(path: Path, repeat: int) -> Dict[str, dict]:
+    """
+    Time streaming reads of the plain, gzip, and xz forms of one consolidated file.
+
+    The compressed copies are written to a temporary directory.
+
+    Parameters:
+        path (Path): Path to a plain consolidated JSON file
+        repeat (int): Number of timed reads per format
+
+    Returns:
+        Dict[str, dict]: File bytes, compression ratio, and read seconds by format name
+    """
+    size = path.stat().st_size
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        copy = temp_dir / path.name
+        shutil.copyfile(path, copy)
+        paths = {"json": copy}
+        paths.update({suffix.lstrip("."): output for suffix, output in compress_artifact(copy).items()})
+        results = {}
+        for name, format_path in paths.items():
+            compressed = format_path.stat().st_size
+            seconds = best_time(lambda p=format_path: deque(iter_artifact(p), maxlen=0), repeat)
+            results[name] = {"bytes": compressed, "ratio": size / compressed if compressed else 0.0, "seconds": seconds}
+        return results
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function to benchmark corpus loading.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark cold and warm loads of the consolidated test files")
+    parser.add_argument("--input", type=str, nargs="+", help="Consolidated test files (default: both)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed calls per measurement (default: 5)")
+    args = parser.parse_args(arg_list)
+
+    # Get paths
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+    if args.input:
+        input_paths = [Path(path) for path in args.input]
+    else:
+        input_paths = [project_root / "json_test_data" / name for name in CONSOLIDATED_FILES]
+
+    for input_path in input_paths:
+        try:
+            result = benchmark_file(input_path, args.repeat)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Failed to load {input_path}: {e}")
+            return 1
+        print(f"{input_path.name} ({result['source_bytes']:,} bytes, snapshot {result['snapshot_bytes']:,} bytes)")
+        print(f"  Cold (json.load):     {result['cold'] * 1000:8.2f} ms")
+        print(f"  Snapshot rebuild:     {result['rebuild'] * 1000:8.2f} ms")
+        print(f"  Warm (snapshot):      {result['warm'] * 1000:8.2f} ms")
+        if result["warm"] > 0:
+            print(f"  Speedup:              {result['cold'] / result['warm']:8.1f}x")
+        print("  Streaming read by format:")
+        for name, stats in benchmark_formats(input_path, args.repeat).items():
+            throughput = result["source_bytes"] / stats["seconds"] / 1e6 if stats["seconds"] else 0.0
+            print(
+                f"    {name:5} {stats['bytes']:>10,} bytes  {stats['ratio']:5.1f}x  "
+                f"{stats['seconds'] * 1000:8.2f} ms  {throughput:7.1f} MB/s"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
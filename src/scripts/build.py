@@ -0,0 +1,479 @@
+"""
+Build every generated artifact from a single pass over the test files.
+
+Running consolidate_tests.py, validate_test_structure.py, generate_test_index.py
+and check_coverage.py one after another walks and parses the test directories
+four times. This script walks json_test_data/validation_tests/ and
+json_test_data/schema_tests/ once, parses each file once, and feeds every file
+and test case to a list of stages:
+
+    validate      Check each file against the test schema and print the results
+    consolidate   Write the consolidated, lean, and metadata files
+    dictionaries  Write the code and test name dictionaries and the code graphs
+    index         Write docs/test_index.md
+    coverage      Print the coverage report (and write --coverage-markdown)
+
+Each stage writes the same files as the script it replaces. The lean files are
+written from the test cases already in memory and their parse times are not
+measured, so the consolidated files are never parsed a second time.
+
+With --memprofile, allocations are traced with tracemalloc and the peak and
+retained memory of each stage and the largest allocation sites are reported.
+--max-bytes-per-case turns the peak into a check that fails the build, and
+implies --memprofile.
+
+Usage:
+    python src/scripts/build.py
+    python src/scripts/build.py --stage validate --stage consolidate
+    python src/scripts/build.py --coverage-markdown coverage.md
+    python src/scripts/build.py --max-bytes-per-case 20000
+"""
+
+import argparse
+import json
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from .check_coverage import CoverageAnalyzer
+    from .consolidate_tests import (
+        TestStatistics,
+        format_lean_report,
+        print_statistics,
+        safe_print,
+        source_digests,
+        validate_test_case,
+        write_dictionaries,
+        write_lean_artifact,
+        write_source_digests,
+    )
+    from .generate_test_index import TestIndexGenerator
+    from .hooks import close_metrics, open_metrics
+    from .memory_profile import MemoryProfile, exceeds_threshold, print_memory_profile
+    from .validate_test_structure import TestValidator, print_results
+except ImportError:
+    from check_coverage import CoverageAnalyzer
+    from consolidate_tests import (
+        TestStatistics,
+        format_lean_report,
+        print_statistics,
+        safe_print,
+        source_digests,
+        validate_test_case,
+        write_dictionaries,
+        write_lean_artifact,
+        write_source_digests,
+    )
+    from generate_test_index import TestIndexGenerator
+    from hooks import close_metrics, open_metrics
+    from memory_profile import MemoryProfile, exceeds_threshold, print_memory_profile
+    from validate_test_structure import TestValidator, print_results
+
+# Test kinds in the order every script processes them
+CATEGORIES = ["validation", "schema"]
+
+# Stages in the order they finish (dictionaries need the consolidated files)
+STAGE_NAMES = ["validate", "consolidate", "dictionaries", "index", "coverage"]
+
+# Files the consolidated outputs leave out
+EXCLUDE_PREFIXES = ["VERSION_DEPRECATED"]
+
+
+class Stage:
+    """A build step that sees every test file and test case of the single pass."""
+
+    name = ""
+
+    def add_file(self, category: str, test_file: Path, data, error: Optional[Exception]):
+        """
+        Receive a parsed test file.
+
+        Parameters:
+            category (str): "validation" or "schema"
+            test_file (Path): Path to the test file
+            data: Decoded JSON document, or None if the file could not be read
+            error (Optional[Exception]): Read or decode error, or None
+        """
+
+    def add_case(self, category: str, test_file: Path, test_case: dict):
+        """
+        Receive one test case of a file that holds a list.
+
+        Parameters:
+            category (str): "validation" or "schema"
+            test_file (Path): Path to the test file
+            test_case (dict): Test case data
+        """
+
+    def finish(self) -> bool:
+        """
+        Write the stage's outputs and print its report.
+
+        Returns:
+            bool: Whether the stage succeeded
+        """
+        return True
+
+
+class ValidateStage(Stage):
+    """Validate each test file against the test schema, as validate_test_structure.py does."""
+
+    name = "validate"
+
+    def __init__(self, validator: TestValidator, root: Path, verbose: bool = False):
+        self.validator = validator
+        self.root = root
+        self.verbose = verbose
+        self.results = {}
+
+    def add_file(self, category: str, test_file: Path, data, error: Optional[Exception]):
+        if isinstance(error, json.JSONDecodeError):
+            result = (False, [f"JSON syntax error: {error}"])
+        elif error is not None:
+            result = (False, [f"Error reading file: {error}"])
+        else:
+            result = self.validator.validate_data(data)
+        self.results[str(test_file.relative_to(self.root))] = result
+
+    def finish(self) -> bool:
+        print_results(self.results, verbose=self.verbose)
+        return all(is_valid for is_valid, _ in self.results.values())
+
+
+class ConsolidateStage(Stage):
+    """Write the consolidated, lean, and metadata files, as consolidate_tests.py does."""
+
+    name = "consolidate"
+
+    def __init__(self, json_test_data_dir: Path, exclude_prefixes: List[str], verbose: bool = False):
+        self.json_test_data_dir = json_test_data_dir
+        self.exclude_prefixes = exclude_prefixes
+        self.verbose = verbose
+        self.cases: Dict[str, List[dict]] = {category: [] for category in CATEGORIES}
+        self.stats: Dict[str, TestStatistics] = {category: TestStatistics() for category in CATEGORIES}
+        self.files: Dict[str, List[Path]] = {category: [] for category in CATEGORIES}
+        self.skip_file = False
+
+    def add_file(self, category: str, test_file: Path, data, error: Optional[Exception]):
+        self.skip_file = any(test_file.name.startswith(prefix) for prefix in self.exclude_prefixes)
+        if self.skip_file:
+            return
+        self.files[category].append(test_file)
+        stats = self.stats[category]
+        if self.verbose:
+            print(f"  - {test_file.name}")
+        if isinstance(error, json.JSONDecodeError):
+            message = f"JSON decode error in {test_file.name}: {error}"
+        elif error is not None:
+            message = f"Error processing {test_file.name}: {error}"
+        elif not isinstance(data, list):
+            warning = f"    WARNING: {test_file.name} does not contain a list"
+            print(warning)
+            stats.add_warning(warning)
+            return
+        else:
+            return
+        print(f"  ERROR: {message}")
+        stats.add_error(message)
+
+    def add_case(self, category: str, test_file: Path, test_case: dict):
+        if self.skip_file:
+            return
+        stats = self.stats[category]
+        for error in validate_test_case(test_case, test_file.name):
+            stats.add_error(error)
+            if self.verbose:
+                print(f"    ERROR: {error}")
+        self.cases[category].append(test_case)
+        stats.add_test_case(test_case)
+
+    def finish(self) -> bool:
+        all_stats = TestStatistics()
+        for category in CATEGORIES:
+            stats = self.stats[category]
+            output_path = self.json_test_data_dir / f"{category}_tests.json"
+            try:
+                with open(output_path, "w", encoding="utf-8") as f:
+                    json.dump(self.cases[category], f, indent=4)
+                safe_print(f"✓ Wrote {len(self.cases[category])} test cases to {output_path.name}")
+                write_source_digests(output_path, source_digests(self.files[category]))
+                report = write_lean_artifact(
+                    output_path,
+                    self.json_test_data_dir / f"{category}_tests_lean.json",
+                    self.json_test_data_dir / f"{category}_tests_metadata.json",
+                    measure_parse=False,
+                    test_cases=self.cases[category],
+                )
+                print(format_lean_report(f"{category}_tests_lean.json", report))
+            except OSError as e:
+                error = f"Failed to write {output_path.name}: {e}"
+                print(f"  ERROR: {error}")
+                stats.add_error(error)
+            all_stats.merge(stats)
+        print_statistics(all_stats)
+        return not all_stats.errors
+
+
+class DictionariesStage(Stage):
+    """Write the dictionaries and code graphs from the consolidation statistics."""
+
+    name = "dictionaries"
+
+    def __init__(self, consolidate: ConsolidateStage):
+        self.consolidate = consolidate
+
+    def finish(self) -> bool:
+        json_test_data_dir = self.consolidate.json_test_data_dir
+        try:
+            for category in CATEGORIES:
+                write_dictionaries(json_test_data_dir, category, self.consolidate.stats[category])
+        except OSError as e:
+            print(f"  ERROR: Failed to write dictionary files: {e}")
+            return False
+        print(f"Wrote code and test name dictionaries and code graphs to {json_test_data_dir.name}/")
+        return True
+
+
+class IndexStage(Stage):
+    """Write the test index, as generate_test_index.py does."""
+
+    name = "index"
+
+    def __init__(self, json_test_data_dir: Path, output_path: Path, output_format: str = "markdown"):
+        self.generator = TestIndexGenerator(json_test_data_dir)
+        self.output_path = output_path
+        self.output_format = output_format
+        self.skip_file = False
+
+    def add_file(self, category: str, test_file: Path, data, error: Optional[Exception]):
+        self.skip_file = not isinstance(data, list)
+        if error is not None:
+            print(f"ERROR: Failed to process {test_file.name}: {error}")
+
+    def add_case(self, category: str, test_file: Path, test_case: dict):
+        if self.skip_file:
+            return
+        try:
+            self.generator.add_test_case(test_case, test_file, category)
+        except Exception as e:
+            # Like the script, drop the rest of a file once one of its cases fails
+            print(f"ERROR: Failed to process {test_file.name}: {e}")
+            self.skip_file = True
+
+    def finish(self) -> bool:
+        self.generator.sort_index()
+        print(f"Found {len(self.generator.index_data)} test cases")
+        if self.output_format == "markdown":
+            self.generator.generate_markdown(self.output_path)
+        else:
+            self.generator.generate_json(self.output_path)
+        return True
+
+
+class CoverageStage(Stage):
+    """Print the coverage report, as check_coverage.py does."""
+
+    name = "coverage"
+
+    def __init__(self, json_test_data_dir: Path, markdown_path: Optional[Path] = None):
+        self.analyzer = CoverageAnalyzer(json_test_data_dir)
+        self.markdown_path = markdown_path
+        self.skip_file = False
+
+    def add_file(self, category: str, test_file: Path, data, error: Optional[Exception]):
+        self.skip_file = not isinstance(data, list)
+        if isinstance(error, json.JSONDecodeError):
+            print(f"ERROR: Failed to parse {test_file.name}: {error}")
+        elif error is not None:
+            print(f"ERROR: Failed to process {test_file.name}: {error}")
+        elif self.skip_file:
+            print(f"WARNING: {test_file.name} is not a list")
+
+    def add_case(self, category: str, test_file: Path, test_case: dict):
+        if self.skip_file:
+            return
+        try:
+            self.analyzer.add_test_case(test_case.get("error_code", "UNKNOWN"), test_case, test_file, category)
+        except Exception as e:
+            print(f"ERROR: Failed to process {test_file.name}: {e}")
+            self.skip_file = True
+
+    def finish(self) -> bool:
+        self.analyzer.print_report()
+        if self.markdown_path:
+            self.analyzer.generate_markdown(self.markdown_path)
+        return True
+
+
+def _measure(profile: Optional[MemoryProfile], name: str):
+    """Return a context that measures the memory of a stage call, or does nothing without a profile."""
+    return profile.measure(name) if profile else nullcontext()
+
+
+def run_stages(json_test_data_dir: Path, stages: List[Stage], profile: Optional[MemoryProfile] = None) -> Dict[str, float]:
+    """
+    Walk and parse the test files once, feeding each file and test case to every stage.
+
+    Parameters:
+        json_test_data_dir (Path): Path to the json_test_data directory
+        stages (List[Stage]): Stages in the order they receive data and finish
+        profile (Optional[MemoryProfile]): Profile that measures the memory of each stage call
+
+    Returns:
+        Dict[str, float]: Seconds spent by each stage and by "parse", including finishing
+    """
+    timings = {"parse": 0.0, **{stage.name: 0.0 for stage in stages}}
+    for category in CATEGORIES:
+        directory = json_test_data_dir / f"{category}_tests"
+        if not directory.exists():
+            continue
+        for test_file in sorted(directory.glob("*.json")):
+            start = time.perf_counter()
+            data, error = None, None
+            with _measure(profile, "parse"):
+                try:
+                    with open(test_file, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except Exception as e:
+                    error = e
+            timings["parse"] += time.perf_counter() - start
+            if profile and isinstance(data, list):
+                profile.cases += len(data)
+
+            for stage in stages:
+                start = time.perf_counter()
+                with _measure(profile, stage.name):
+                    stage.add_file(category, test_file, data, error)
+                    if isinstance(data, list):
+                        for test_case in data:
+                            stage.add_case(category, test_file, test_case)
+                timings[stage.name] += time.perf_counter() - start
+    return timings
+
+
+def finish_stages(stages: List[Stage], timings: Dict[str, float], profile: Optional[MemoryProfile] = None) -> List[str]:
+    """
+    Finish each stage in order.
+
+    Parameters:
+        stages (List[Stage]): Stages that have received the corpus
+        timings (Dict[str, float]): Seconds by stage, increased by the finishing time
+        profile (Optional[MemoryProfile]): Profile that measures the memory of finishing each stage
+
+    Returns:
+        List[str]: Names of the stages that failed
+    """
+    failed = []
+    for stage in stages:
+        print(f"\n--- {stage.name} ---")
+        start = time.perf_counter()
+        with _measure(profile, stage.name):
+            finished = stage.finish()
+        if not finished:
+            failed.append(stage.name)
+        timings[stage.name] += time.perf_counter() - start
+    return failed
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function to build the generated artifacts in one pass.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Build every generated artifact from a single pass over the test files")
+    parser.add_argument(
+        "--stage", type=str, action="append", choices=STAGE_NAMES, help="Stage to run (repeatable, default: all stages)"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Show detailed processing information")
+    parser.add_argument("--schema", type=str, help="Path to schema file (default: src/schemas/test_schema.json)")
+    parser.add_argument(
+        "--index-output", type=str, default="docs/test_index.md", help="Test index file (default: docs/test_index.md)"
+    )
+    parser.add_argument("--index-format", choices=["markdown", "json"], default="markdown", help="Test index format")
+    parser.add_argument("--coverage-markdown", type=str, help="Also write the coverage report as markdown to this path")
+    parser.add_argument(
+        "--memprofile", action="store_true", help="Trace allocations and report peak and retained memory per stage"
+    )
+    parser.add_argument(
+        "--memprofile-top", type=int, default=10, help="Number of allocation sites to list with --memprofile (default: 10)"
+    )
+    parser.add_argument(
+        "--max-bytes-per-case",
+        type=float,
+        help="Fail if the peak traced memory per test case is above this many bytes (implies --memprofile)",
+    )
+    parser.add_argument("--metrics", type=str, help="Append per-case index and coverage timing events to this JSON-lines file")
+    args = parser.parse_args(arg_list)
+    if args.max_bytes_per_case is not None:
+        # The threshold is checked against the memory profile
+        args.memprofile = True
+
+    # Get paths
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+    json_test_data_dir = project_root / "json_test_data"
+    schema_path = Path(args.schema) if args.schema else project_root / "src" / "schemas" / "test_schema.json"
+
+    selected = set(args.stage or STAGE_NAMES)
+    if "dictionaries" in selected:
+        # The dictionaries come from the consolidation statistics and the graphs hash its output
+        selected.add("consolidate")
+
+    stages = []
+    consolidate = None
+    for name in STAGE_NAMES:
+        if name not in selected:
+            continue
+        if name == "validate":
+            try:
+                validator = TestValidator(schema_path)
+            except Exception as e:
+                print(f"ERROR: Failed to load schema: {e}")
+                return 1
+            stages.append(ValidateStage(validator, project_root, verbose=args.verbose))
+        elif name == "consolidate":
+            consolidate = ConsolidateStage(json_test_data_dir, EXCLUDE_PREFIXES, verbose=args.verbose)
+            stages.append(consolidate)
+        elif name == "dictionaries":
+            stages.append(DictionariesStage(consolidate))
+        elif name == "index":
+            stages.append(IndexStage(json_test_data_dir, project_root / args.index_output, args.index_format))
+        else:
+            markdown_path = Path(args.coverage_markdown) if args.coverage_markdown else None
+            stages.append(CoverageStage(json_test_data_dir, markdown_path))
+
+    profile = MemoryProfile() if args.memprofile else None
+    metrics = open_metrics(args.metrics)
+    try:
+        if profile:
+            profile.start()
+        timings = run_stages(json_test_data_dir, stages, profile)
+        failed = finish_stages(stages, timings, profile)
+        sites = profile.top_sites(args.memprofile_top) if profile else []
+    finally:
+        if profile:
+            profile.stop()
+        close_metrics(metrics)
+
+    print("\n" + "=" * 60)
+    print("Build Summary")
+    print("=" * 60)
+    for name, seconds in timings.items():
+        status = "FAILED" if name in failed else "ok"
+        print(f"  {name:<14} {1000 * seconds:9.1f} ms  {status}")
+    print(f"  {'total':<14} {1000 * sum(timings.values()):9.1f} ms")
+
+    if profile:
+        print_memory_profile(profile, sites, args.max_bytes_per_case)
+        if exceeds_threshold(profile, args.max_bytes_per_case):
+            failed.append("memory")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    exit(main())
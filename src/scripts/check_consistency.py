@@ -0,0 +1,340 @@
+"""
+Check cross-file consistency rules over the whole HED test suite.
+
+The other checks look at one file (validate_test_structure.py) or one test
+directory (duplicate names in consolidate_tests.py). This script reads every
+file in json_test_data/validation_tests/ and json_test_data/schema_tests/
+once, builds one hash index of test names, error codes, and files, and runs
+these rules against it:
+
+    duplicate-name        Test case names are unique across both test directories
+    unknown-alt-code      Every alt_codes entry is the error_code of some test case
+    unknown-related-code  Every related_errors entry is the error_code of some test case
+    file-code-mismatch    A case's error_code names its file (CODE.json or CODE_<qualifier>.json)
+    unreadable-file       Every test file is valid JSON holding a list of test cases
+
+Each violation is reported with its file and the position of the case in the
+file. Building the index and running every rule are linear in the number of
+test cases.
+
+Known violations can be listed in a baseline file (by rule, file, and message,
+so they survive cases moving within a file). With --baseline, only violations
+not in the baseline fail the check, and baseline entries that are no longer
+found are reported so they can be removed. CI runs the check against
+.github/consistency_baseline.json.
+
+Usage:
+    python src/scripts/check_consistency.py
+    python src/scripts/check_consistency.py --ignore unknown-related-code
+    python src/scripts/check_consistency.py --json violations.json
+    python src/scripts/check_consistency.py --baseline .github/consistency_baseline.json
+    python src/scripts/check_consistency.py --write-baseline .github/consistency_baseline.json
+"""
+
+import argparse
+import json
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# (file path relative to json_test_data, position of the case in the file; -1 for the whole file)
+Location = Tuple[str, int]
+
+RULES = {
+    "duplicate-name": "Test case names are unique across both test directories",
+    "unknown-alt-code": "Every alt_codes entry is the error_code of some test case",
+    "unknown-related-code": "Every related_errors entry is the error_code of some test case",
+    "file-code-mismatch": "A case's error_code names its file (CODE.json or CODE_<qualifier>.json)",
+    "unreadable-file": "Every test file is valid JSON holding a list of test cases",
+}
+
+TEST_DIRECTORIES = ["validation_tests", "schema_tests"]
+
+
+class CorpusIndex:
+    """Hash index of the test names, error codes, and files of the test suite."""
+
+    def __init__(self):
+        self.case_count = 0
+        self.file_count = 0
+        # Test name -> every location that uses it
+        self.names: Dict[str, List[Location]] = defaultdict(list)
+        # Primary error code -> every location that expects it
+        self.codes: Dict[str, List[Location]] = defaultdict(list)
+        # (field, referenced code, location) for each alt_codes and related_errors entry
+        self.references: List[Tuple[str, str, Location]] = []
+        # File -> (position, error code) of each of its cases
+        self.files: Dict[str, List[Tuple[int, str]]] = {}
+        # File -> reason it could not be indexed
+        self.unreadable: Dict[str, str] = {}
+
+    def add_file(self, file_name: str, test_cases: list):
+        """
+        Index the test cases of one file.
+
+        Parameters:
+            file_name (str): File path relative to json_test_data
+            test_cases (list): Decoded test cases of the file
+        """
+        self.file_count += 1
+        entries = self.files.setdefault(file_name, [])
+        for position, test_case in enumerate(test_cases):
+            if not isinstance(test_case, dict):
+                continue
+            self.case_count += 1
+            location = (file_name, position)
+            name = test_case.get("name")
+            if name:
+                self.names[name].append(location)
+            error_code = test_case.get("error_code", "UNKNOWN")
+            self.codes[error_code].append(location)
+            entries.append((position, error_code))
+            for field in ["alt_codes", "related_errors"]:
+                codes = test_case.get(field, []) or []
+                # A single code written as a string is one reference, not one per character
+                for code in [codes] if isinstance(codes, str) else codes:
+                    self.references.append((field, code, location))
+
+
+def build_index(json_test_data_dir: Path) -> CorpusIndex:
+    """
+    Read every test file once and index it.
+
+    Parameters:
+        json_test_data_dir (Path): Path to the json_test_data directory
+
+    Returns:
+        CorpusIndex: Index of the whole test suite
+    """
+    index = CorpusIndex()
+    for directory_name in TEST_DIRECTORIES:
+        directory = json_test_data_dir / directory_name
+        if not directory.exists():
+            continue
+        for test_file in sorted(directory.glob("*.json")):
+            file_name = f"{directory_name}/{test_file.name}"
+            try:
+                with open(test_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                index.unreadable[file_name] = str(e)
+                continue
+            if not isinstance(data, list):
+                index.unreadable[file_name] = "does not contain a list"
+                continue
+            index.add_file(file_name, data)
+    return index
+
+
+def _violation(rule: str, location: Location, message: str) -> dict:
+    """Return a violation record."""
+    return {"rule": rule, "file": location[0], "position": location[1], "message": message}
+
+
+def check_duplicate_names(index: CorpusIndex) -> List[dict]:
+    """Report every use of a test name after its first."""
+    violations = []
+    for name, locations in index.names.items():
+        first = locations[0]
+        for location in locations[1:]:
+            message = f"Duplicate test case name '{name}' (first used in {first[0]} [{first[1]}])"
+            violations.append(_violation("duplicate-name", location, message))
+    return violations
+
+
+def check_references(index: CorpusIndex) -> List[dict]:
+    """Report alt_codes and related_errors entries that no test case expects."""
+    violations = []
+    for field, code, location in index.references:
+        if code not in index.codes:
+            rule = "unknown-alt-code" if field == "alt_codes" else "unknown-related-code"
+            violations.append(_violation(rule, location, f"{field} entry {code} is not the error_code of any test case"))
+    return violations
+
+
+def check_file_codes(index: CorpusIndex) -> List[dict]:
+    """Report cases whose error_code does not name their file."""
+    violations = []
+    for file_name, entries in index.files.items():
+        stem = Path(file_name).stem
+        for position, error_code in entries:
+            if stem != error_code and not stem.startswith(f"{error_code}_"):
+                message = f"error_code {error_code} does not match the file name"
+                violations.append(_violation("file-code-mismatch", (file_name, position), message))
+    return violations
+
+
+def check_unreadable(index: CorpusIndex) -> List[dict]:
+    """Report files that could not be indexed."""
+    return [_violation("unreadable-file", (file_name, -1), reason) for file_name, reason in index.unreadable.items()]
+
+
+CHECKS = [check_unreadable, check_duplicate_names, check_references, check_file_codes]
+
+
+def check_index(index: CorpusIndex, ignore: List[str] = None) -> List[dict]:
+    """
+    Run every rule against the index.
+
+    Parameters:
+        index (CorpusIndex): Index from build_index
+        ignore (List[str]): Rules to leave out
+
+    Returns:
+        List[dict]: Violations with "rule", "file", "position", and "message", by file and position
+    """
+    ignored = set(ignore or [])
+    violations = [violation for check in CHECKS for violation in check(index) if violation["rule"] not in ignored]
+    violations.sort(key=lambda v: (v["file"], v["position"], v["rule"]))
+    return violations
+
+
+def print_violations(violations: List[dict]):
+    """
+    Print each violation and the number of violations of each rule.
+
+    Parameters:
+        violations (List[dict]): Violations from check_index
+    """
+    for violation in violations:
+        position = "" if violation["position"] < 0 else f" [{violation['position']}]"
+        print(f"{violation['file']}{position}: {violation['rule']}: {violation['message']}")
+
+    counts = defaultdict(int)
+    for violation in violations:
+        counts[violation["rule"]] += 1
+    print("\n" + "=" * 70)
+    for rule in RULES:
+        print(f"  {rule:<22} {counts[rule]}")
+    print("=" * 70)
+
+
+def baseline_key(violation: dict) -> Tuple[str, str, str]:
+    """Return the fields that identify a violation in a baseline; positions are left out."""
+    return violation["rule"], violation["file"], violation["message"]
+
+
+def load_baseline(path: Path) -> List[dict]:
+    """
+    Load the known violations of a baseline file.
+
+    Parameters:
+        path (Path): Baseline written by --write-baseline
+
+    Returns:
+        List[dict]: Entries with "rule", "file", and "message"
+
+    Raises:
+        ValueError: If the file does not contain a list
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if not isinstance(baseline, list):
+        raise ValueError(f"{path.name} does not contain a list")
+    return baseline
+
+
+def write_baseline(path: Path, violations: List[dict]):
+    """Write the violations as a baseline, without positions."""
+    entries = [{"rule": v["rule"], "file": v["file"], "message": v["message"]} for v in violations]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=4)
+        f.write("\n")
+
+
+def compare_baseline(violations: List[dict], baseline: List[dict]) -> Tuple[List[dict], List[dict]]:
+    """
+    Split violations into those a baseline does not list and baseline entries that were not found.
+
+    Parameters:
+        violations (List[dict]): Violations from check_index
+        baseline (List[dict]): Known violations from load_baseline
+
+    Returns:
+        Tuple[List[dict], List[dict]]: (new violations, baseline entries no longer found)
+    """
+    remaining = Counter(baseline_key(entry) for entry in baseline)
+    new = []
+    for violation in violations:
+        key = baseline_key(violation)
+        if remaining[key]:
+            remaining[key] -= 1
+        else:
+            new.append(violation)
+    fixed = []
+    for entry in baseline:
+        key = baseline_key(entry)
+        if remaining[key]:
+            remaining[key] -= 1
+            fixed.append(entry)
+    return new, fixed
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function to check cross-file consistency.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Check cross-file consistency rules over the HED test suite")
+    parser.add_argument("--ignore", type=str, action="append", choices=list(RULES), help="Rule to skip (repeatable)")
+    parser.add_argument("--json", type=str, help="Also write the violations as JSON to this path")
+    parser.add_argument("--baseline", type=str, help="Baseline of known violations; only other violations fail")
+    parser.add_argument("--write-baseline", type=str, help="Write the current violations as a baseline to this path")
+    args = parser.parse_args(arg_list)
+
+    # Get paths
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+    json_test_data_dir = project_root / "json_test_data"
+
+    if not json_test_data_dir.exists():
+        print(f"ERROR: Test data directory not found: {json_test_data_dir}")
+        return 1
+
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = load_baseline(Path(args.baseline))
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Failed to load baseline {args.baseline}: {e}")
+            return 1
+
+    start = time.perf_counter()
+    index = build_index(json_test_data_dir)
+    violations = check_index(index, args.ignore)
+    elapsed = time.perf_counter() - start
+
+    print_violations(violations)
+    print(f"Checked {index.case_count} test cases in {index.file_count} files in {1000 * elapsed:.1f} ms")
+    print(f"Violations: {len(violations)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(violations, f, indent=4)
+        print(f"Violations written to: {args.json}")
+    if args.write_baseline:
+        write_baseline(Path(args.write_baseline), violations)
+        print(f"Baseline written to: {args.write_baseline}")
+        return 0
+
+    if baseline is None:
+        return 1 if violations else 0
+    new, fixed = compare_baseline(violations, baseline)
+    print(f"Known (in {args.baseline}): {len(violations) - len(new)} | New: {len(new)}")
+    if fixed:
+        print(f"\nNo longer found; remove these from {args.baseline}:")
+        for entry in fixed:
+            print(f"  {entry['file']}: {entry['rule']}: {entry['message']}")
+    if new:
+        print("\nNew violations (fix them or add them to the baseline):")
+        for violation in new:
+            print(f"  {violation['file']} [{violation['position']}]: {violation['rule']}: {violation['message']}")
+    return 1 if new else 0
+
+
+if __name__ == "__main__":
+    exit(main())
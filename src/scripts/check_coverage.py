@@ -8,16 +8,40 @@ This script analyzes the test suite to report:
 - AI metadata completeness
 - Coverage gaps
 
+With --markdown-pages, the markdown report is written as one page per error
+code plus a navigation page, and only the pages whose content changed are
+rewritten.
+
+With --schema, it instead reports which nodes, units, and value classes of a
+local HED schema file (.mediawiki or .xml) the HED strings of the consolidated
+corpus exercise. A tag value exercises the value classes of the # node under
+the tag it is a value of.
+
 Usage:
     python src/scripts/check_coverage.py
     python src/scripts/check_coverage.py --markdown report.md
+    python src/scripts/check_coverage.py --markdown-pages docs/coverage --workers 4
+    python src/scripts/check_coverage.py --schema HED8.4.0.mediawiki
 """
 
 import argparse
 import json
-from collections import defaultdict
+import re
+import xml.etree.ElementTree as ET
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator, List, Set, Tuple
+
+try:
+    from .corpus import load_consolidated
+    from .hed_tokens import iter_case_hed, iter_tags
+    from .hooks import HOOKS, start_span
+    from .paged_markdown import format_page_summary, page_name, write_pages
+except ImportError:
+    from corpus import load_consolidated
+    from hed_tokens import iter_case_hed, iter_tags
+    from hooks import HOOKS, start_span
+    from paged_markdown import format_page_summary, page_name, write_pages
 
 
 class CoverageAnalyzer:
@@ -74,16 +98,16 @@ class CoverageAnalyzer:
 
                 for test_case in test_data:
                     error_code = test_case.get("error_code", "UNKNOWN")
-                    self._process_test_case(error_code, test_case, test_file, category)
+                    self.add_test_case(error_code, test_case, test_file, category)
 
             except json.JSONDecodeError as e:
                 print(f"ERROR: Failed to parse {test_file.name}: {e}")
             except Exception as e:
                 print(f"ERROR: Failed to process {test_file.name}: {e}")
 
-    def _process_test_case(self, error_code: str, test_case: dict, test_file: Path, category: str):
+    def add_test_case(self, error_code: str, test_case: dict, test_file: Path, category: str):
         """
-        Process a single test case.
+        Add a single test case to the coverage statistics.
 
         Parameters:
             error_code (str): Error code
@@ -91,6 +115,7 @@ class CoverageAnalyzer:
             test_file (Path): Source file
             category (str): Test category
         """
+        span = start_span("coverage.case", name=test_case.get("name"), error_code=error_code) if HOOKS else None
         data = self.coverage_data[error_code]
 
         # Count test case
@@ -122,6 +147,9 @@ class CoverageAnalyzer:
         else:
             data["error_count"] += 1
 
+        if span:
+            span.end()
+
     def get_summary(self) -> Dict:
         """
         Get summary statistics.
@@ -251,19 +279,331 @@ class CoverageAnalyzer:
 
         print(f"\n[SUCCESS] Markdown report written to: {output_file}")
 
+    def generate_markdown_pages(self, output_dir: Path, workers: int = 1) -> Dict[str, List[str]]:
+        """
+        Generate a paged markdown coverage report with one page per error code.
+
+        Parameters:
+            output_dir (Path): Directory for index.md and the error code pages
+            workers (int): Number of processes that render and write pages
+
+        Returns:
+            Dict[str, List[str]]: Page file names that were "written", "unchanged", and "removed"
+        """
+        # Plain dicts, since the defaultdict factory cannot be sent to worker processes
+        rows = [(error_code, dict(self.coverage_data[error_code])) for error_code in sorted(self.coverage_data)]
+        pages = [("index.md", render_coverage_navigation, (self.get_summary(), rows))]
+        pages.extend((page_name(row[0]), render_coverage_page, row) for row in rows)
+        result = write_pages(output_dir, pages, workers=workers)
+
+        print(f"\n[SUCCESS] Paged report: {format_page_summary(output_dir, result)}")
+        return result
+
+
+def render_coverage_navigation(report: Tuple[Dict, List[Tuple[str, Dict]]]) -> Iterator[str]:
+    """
+    Render the navigation page of a paged coverage report.
+
+    Parameters:
+        report (Tuple[Dict, List[Tuple[str, Dict]]]): (summary from get_summary, (error code, coverage data) by code)
+
+    Yields:
+        str: Lines of the page
+    """
+    summary, rows = report
+    yield "# HED Test Coverage Report"
+    yield ""
+    yield f"- **Total error codes covered**: {summary['total_error_codes']}"
+    yield f"- **Total test cases**: {summary['total_test_cases']}"
+    yield (
+        f"- **Error codes with AI metadata**: {summary['codes_with_ai_metadata']} "
+        f"({summary['ai_metadata_percentage']:.1f}%)"
+    )
+    yield ""
+    yield "| Error Code | Test Cases | Test Types | AI Metadata |"
+    yield "|------------|------------|------------|-------------|"
+    for error_code, data in rows:
+        ai_marker = "✓" if data["has_ai_metadata"] else "✗"
+        test_types_str = ", ".join(sorted(data["test_types"]))
+        yield f"| [{error_code}]({page_name(error_code)}) | {data['test_cases']} | {test_types_str} | {ai_marker} |"
+    yield ""
+
+
+def render_coverage_page(row: Tuple[str, Dict]) -> Iterator[str]:
+    """
+    Render the coverage page of one error code.
+
+    Parameters:
+        row (Tuple[str, Dict]): (error code, its coverage data)
+
+    Yields:
+        str: Lines of the page
+    """
+    error_code, data = row
+    yield f"# {error_code}"
+    yield ""
+    yield "[Coverage report](index.md)"
+    yield ""
+    yield f"- **Test cases**: {data['test_cases']} ({data['error_count']} errors, {data['warning_count']} warnings)"
+    yield f"- **Test types**: {', '.join(sorted(data['test_types'])) or 'none'}"
+    yield f"- **AI metadata**: {'yes' if data['has_ai_metadata'] else 'no'}"
+    yield f"- **Schema versions**: {', '.join(sorted(data['schema_versions'])) or 'any'}"
+    yield ""
+    yield "## Files"
+    yield ""
+    for filename in data["files"]:
+        yield f"- `{filename}`"
+    yield ""
+
+
+# valueClass=<name> in the attributes of a mediawiki schema line
+_VALUE_CLASS_ATTRIBUTE = re.compile(r"\bvalueClass=(\w+)")
+
+
+def _mediawiki_name(line: str) -> str:
+    """Return the element name of a mediawiki schema line such as "** Red {attr} [description]"."""
+    text = line.lstrip("*").strip()
+    if text.startswith("'''"):
+        text = text[3:].split("'''", 1)[0]
+    for stop in (" {", " [", "{", "["):
+        text = text.split(stop, 1)[0]
+    return text.strip()
+
+
+def _xml_value_classes(root: ET.Element) -> Dict[str, Set[str]]:
+    """Return the value classes of an XML schema and the lowercase tags whose # child takes each."""
+    value_classes = {
+        name.text.strip(): set() for name in root.iterfind(".//valueClassDefinition/name") if name.text and name.text.strip()
+    }
+    for node in root.iterfind(".//schema//node"):
+        for child in node.findall("node"):
+            if (child.findtext("name") or "").strip() != "#":
+                continue
+            for attribute in child.findall("attribute"):
+                if (attribute.findtext("name") or "").strip() == "valueClass":
+                    for value in attribute.findall("value"):
+                        if value.text:
+                            value_classes.setdefault(value.text.strip(), set()).add(node.findtext("name", "").strip().lower())
+    return value_classes
+
+
+def load_schema_terms(schema_path: Path) -> Tuple[Set[str], Set[str], Dict[str, Set[str]]]:
+    """
+    Load the tag names, unit names, and value classes of a HED schema file.
+
+    Parameters:
+        schema_path (Path): Path to a .mediawiki or .xml HED schema
+
+    Returns:
+        Tuple[Set[str], Set[str], Dict[str, Set[str]]]: (tag node names, unit names, value classes),
+            tag names in lowercase; each value class maps to the tags whose # child takes it
+
+    Raises:
+        ValueError: If the file is not a .mediawiki or .xml schema
+    """
+    tags, units = set(), set()
+    value_classes: Dict[str, Set[str]] = {}
+    if schema_path.suffix == ".mediawiki":
+        section = None
+        # Depth -> lowercase name of the last tag seen at that depth
+        parents: Dict[int, str] = {}
+        with open(schema_path, "r", encoding="utf-8") as f:
+            for raw_line in f:
+                line = raw_line.strip()
+                if line == "!# start schema":
+                    section = "tags"
+                elif line == "!# end schema":
+                    section = None
+                elif line.startswith("'''Unit classes'''"):
+                    section = "units"
+                elif line.startswith("'''Value classes'''"):
+                    section = "value classes"
+                elif line.startswith("'''") and section in ("units", "value classes"):
+                    section = None
+                elif section == "tags" and (line.startswith("'''") or line.startswith("*")):
+                    name = _mediawiki_name(line)
+                    depth = len(line) - len(line.lstrip("*"))
+                    parents[depth] = name.lower()
+                    tags.add(name.lower())
+                    if name == "#" and depth - 1 in parents:
+                        for value_class in _VALUE_CLASS_ATTRIBUTE.findall(line):
+                            value_classes.setdefault(value_class, set()).add(parents[depth - 1])
+                elif section == "units" and line.startswith("**") and not line.startswith("***"):
+                    units.add(_mediawiki_name(line))
+                elif section == "value classes" and line.startswith("*") and not line.startswith("**"):
+                    value_classes.setdefault(_mediawiki_name(line), set())
+    elif schema_path.suffix == ".xml":
+        root = ET.parse(schema_path).getroot()
+        tags = {name.text.strip().lower() for name in root.iterfind(".//schema//node/name") if name.text}
+        units = {name.text.strip() for name in root.iterfind(".//unitClassDefinition/unit/name") if name.text}
+        value_classes = _xml_value_classes(root)
+    else:
+        raise ValueError(f"Unsupported schema file type: {schema_path.suffix}")
+    tags.discard("#")
+    tags.discard("")
+    return tags, units, value_classes
+
+
+class TagCoverageAnalyzer:
+    """Analyzer for which schema tags, units, and value classes the corpus HED strings exercise."""
+
+    def __init__(self, schema_tags: Set[str], schema_units: Set[str], value_classes: Dict[str, Set[str]] = None):
+        """
+        Initialize the tag coverage analyzer.
+
+        Parameters:
+            schema_tags (Set[str]): Lowercase tag node names of the schema
+            schema_units (Set[str]): Unit names of the schema
+            value_classes (Dict[str, Set[str]]): Value classes and the lowercase tags whose values take each
+        """
+        self.schema_tags = schema_tags
+        self.schema_units = schema_units
+        self.value_classes = value_classes or {}
+        # Lowercase tag name -> value classes its values take
+        self.tag_value_classes: Dict[str, List[str]] = defaultdict(list)
+        for value_class, tag_names in sorted(self.value_classes.items()):
+            for tag_name in tag_names:
+                self.tag_value_classes[tag_name].append(value_class)
+        # Distinct tag strings are counted here and resolved against the schema afterwards
+        self.tag_strings: Counter = Counter()
+        self.tag_counts: Counter = Counter()
+        self.unit_counts: Counter = Counter()
+        self.value_class_counts: Counter = Counter()
+        self.unknown_tags: Counter = Counter()
+        self.hed_strings = 0
+
+    def analyze(self, test_cases: List[dict]):
+        """
+        Count tag usage in the HED strings of test cases in one pass.
 
-def main():
-    """Main function."""
+        Parameters:
+            test_cases (List[dict]): Consolidated test cases
+        """
+        # HED strings repeat across sub-tests, so tokenize each distinct string once
+        hed_strings = Counter(hed_string for test_case in test_cases for _, hed_string in iter_case_hed(test_case))
+        self.hed_strings += hed_strings.total()
+        for hed_string, count in hed_strings.items():
+            for tag in iter_tags(hed_string):
+                self.tag_strings[tag] += count
+        self._resolve()
+
+    def _resolve(self):
+        """Map the distinct tag strings to schema nodes, units, and value classes."""
+        self.tag_counts.clear()
+        self.unit_counts.clear()
+        self.value_class_counts.clear()
+        self.unknown_tags.clear()
+        for tag, count in self.tag_strings.items():
+            matched = False
+            segments = tag.split("/")
+            for position, segment in enumerate(segments):
+                name = segment.strip().lower()
+                if name in self.schema_tags:
+                    self.tag_counts[name] += count
+                    matched = True
+                    continue
+                # The first segment that is not a node is a value; its last word may be a unit
+                if matched and position == len(segments) - 1:
+                    for value_class in self.tag_value_classes.get(segments[position - 1].strip().lower(), []):
+                        self.value_class_counts[value_class] += count
+                    words = segment.split()
+                    if len(words) > 1 and words[-1] in self.schema_units:
+                        self.unit_counts[words[-1]] += count
+                break
+            if not matched:
+                self.unknown_tags[tag] += count
+
+    def unexercised_tags(self) -> List[str]:
+        """Return the schema tag names no corpus tag uses, sorted."""
+        return sorted(self.schema_tags - set(self.tag_counts))
+
+    def unexercised_units(self) -> List[str]:
+        """Return the schema units no corpus value uses, sorted."""
+        return sorted(self.schema_units - set(self.unit_counts))
+
+    def unexercised_value_classes(self) -> List[str]:
+        """Return the schema value classes no corpus value takes, sorted."""
+        return sorted(set(self.value_classes) - set(self.value_class_counts))
+
+    def print_report(self):
+        """Print the tag coverage report to console."""
+        unexercised_tags = self.unexercised_tags()
+        unexercised_units = self.unexercised_units()
+        unexercised_value_classes = self.unexercised_value_classes()
+        tag_total, unit_total = len(self.schema_tags), len(self.schema_units)
+        value_class_total = len(self.value_classes)
+
+        print("\n" + "=" * 70)
+        print("HED Schema Tag Coverage Report")
+        print("=" * 70)
+        print(f"\n  HED strings: {self.hed_strings}")
+        print(f"  Distinct tags: {len(self.tag_strings)} ({len(self.unknown_tags)} not in the schema)")
+        if tag_total:
+            print(f"  Schema tags exercised: {tag_total - len(unexercised_tags)} of {tag_total}")
+        if unit_total:
+            print(f"  Schema units exercised: {unit_total - len(unexercised_units)} of {unit_total}")
+        if value_class_total:
+            exercised = value_class_total - len(unexercised_value_classes)
+            print(f"  Schema value classes exercised: {exercised} of {value_class_total}")
+
+        print(f"\n[TAGS] Unexercised schema tags ({len(unexercised_tags)})")
+        for name in unexercised_tags:
+            print(f"  {name}")
+        print(f"\n[UNITS] Unexercised schema units ({len(unexercised_units)})")
+        for name in unexercised_units:
+            print(f"  {name}")
+        print("\n[VALUE CLASSES] Values taking each schema value class")
+        for name, count in sorted(self.value_class_counts.items()):
+            print(f"  {name}: {count}")
+        print(f"\n[VALUE CLASSES] Unexercised schema value classes ({len(unexercised_value_classes)})")
+        for name in unexercised_value_classes:
+            print(f"  {name}")
+        print("=" * 70)
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
     parser = argparse.ArgumentParser(description="Check HED test coverage")
     parser.add_argument("--markdown", type=str, help="Generate markdown report at specified path")
-
-    args = parser.parse_args()
+    parser.add_argument(
+        "--markdown-pages", type=str, help="Generate a paged markdown report (one page per error code) in this directory"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Number of processes that render and write pages (default: 1)")
+    parser.add_argument(
+        "--schema", type=str, help="Report tag, unit, and value class coverage of a local .mediawiki or .xml schema"
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default="json_test_data/validation_tests.json",
+        help="Consolidated file for --schema (default: json_test_data/validation_tests.json)",
+    )
+
+    args = parser.parse_args(arg_list)
 
     # Get paths
     script_dir = Path(__file__).parent
     project_root = script_dir.parent.parent
     test_data_dir = project_root / "json_test_data"
 
+    if args.schema:
+        try:
+            schema_tags, schema_units, value_classes = load_schema_terms(Path(args.schema))
+            test_cases = load_consolidated(project_root / args.corpus, snapshot=True)
+        except (OSError, ValueError, ET.ParseError) as e:
+            print(f"ERROR: {e}")
+            return 1
+        tag_analyzer = TagCoverageAnalyzer(schema_tags, schema_units, value_classes)
+        tag_analyzer.analyze(test_cases)
+        tag_analyzer.print_report()
+        return 0
+
     if not test_data_dir.exists():
         print(f"ERROR: Test data directory not found: {test_data_dir}")
         return 1
@@ -279,6 +619,8 @@ def main():
     if args.markdown:
         output_path = Path(args.markdown)
         analyzer.generate_markdown(output_path)
+    if args.markdown_pages:
+        analyzer.generate_markdown_pages(Path(args.markdown_pages), workers=args.workers)
 
     return 0
 
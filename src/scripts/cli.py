@@ -0,0 +1,106 @@
+"""
+Single hed-tests command for all of the test suite scripts.
+
+Each subcommand runs the main() of one script with the remaining arguments,
+so "hed-tests consolidate --dry-run" is the same as
+"python src/scripts/consolidate_tests.py --dry-run". A script module, and the
+modules it imports (such as jsonschema for validate), is imported only when
+its subcommand runs, so listing the commands stays fast.
+
+The scripts find json_test_data and src/schemas relative to their own files,
+so the command only works from an editable install of a hed-tests checkout
+(pip install -e .), where the installed hed_tests_scripts package is the
+checkout's src/scripts directory. From any other install it reports this and
+exits instead of looking for test data inside site-packages.
+
+Usage:
+    hed-tests --help
+    hed-tests consolidate --dry-run
+    hed-tests validate json_test_data/validation_tests
+    hed-tests index --format json --output docs/test_index.json
+    hed-tests coverage --help
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+# Subcommand -> (script module, description)
+COMMANDS = {
+    "build": ("build", "Build every generated artifact from a single pass over the test files"),
+    "make": ("make_targets", "Rebuild only the generated artifacts whose inputs changed"),
+    "consolidate": ("consolidate_tests", "Consolidate HED test files for validator consumption"),
+    "validate": ("validate_test_structure", "Validate HED test files against JSON schema"),
+    "index": ("generate_test_index", "Generate HED test suite index"),
+    "coverage": ("check_coverage", "Check HED test coverage"),
+    "consistency": ("check_consistency", "Check cross-file consistency rules over the HED test suite"),
+    "select": ("select_tests", "Select the HED tests affected by a validator change"),
+    "shard": ("shard_tests", "Split HED test cases into cost-balanced shards"),
+    "smoke": ("smoke_subset", "Generate a minimal smoke-test subset covering every code and kind"),
+    "schedule": ("schedule_tests", "Failure-prioritized, time-budgeted ordering of HED sub-tests"),
+    "compact-schemas": ("schema_templates", "Store schema tests as shared skeletons plus per-case deltas"),
+    "materialize": ("materialize", "Materialize HED test inputs as content-addressed files"),
+    "extract": ("extract_kinds", "Write flat per-kind extracts of the HED test suite"),
+    "export-sqlite": ("export_sqlite", "Export the HED test suite to a SQLite database"),
+    "benchmark": ("benchmark_load", "Benchmark cold and warm loads of the consolidated test files"),
+    "serve": ("serve", "Serve HED test cases and indexes over HTTP on localhost"),
+}
+
+
+# Checkout the scripts belong to (src/scripts/cli.py -> checkout root)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def load_command(command: str):
+    """
+    Import the script module of a subcommand.
+
+    Parameters:
+        command (str): Subcommand name
+
+    Returns:
+        module: The script module, imported the same way as this module
+    """
+    module = COMMANDS[command][0]
+    return importlib.import_module(f"{__package__}.{module}" if __package__ else module)
+
+
+# Built-in generics instead of typing, which would add to the startup time of every command
+def main(arg_list: list[str] = None):
+    """
+    Main function to run a subcommand.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    width = max(len(command) for command in COMMANDS)
+    parser = argparse.ArgumentParser(
+        prog="hed-tests",
+        description="HED test suite tools",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n"
+        + "\n".join(f"  {command:<{width}}  {description}" for command, (_, description) in COMMANDS.items())
+        + "\n\nRun 'hed-tests <command> --help' for the options of a command.",
+    )
+    parser.add_argument("command", choices=list(COMMANDS), metavar="command", help="Command to run (see below)")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments for the command")
+    args = parser.parse_args(arg_list)
+
+    if not os.path.isdir(os.path.join(PROJECT_ROOT, "json_test_data")):
+        print(f"ERROR: No json_test_data directory in {PROJECT_ROOT}")
+        print("hed-tests runs the scripts of a hed-tests checkout; install it with 'pip install -e .' from the checkout")
+        return 1
+
+    # Scripts build their usage line from the program name
+    program = sys.argv[0]
+    sys.argv[0] = f"hed-tests {args.command}"
+    try:
+        return load_command(args.command).main(args.args)
+    finally:
+        sys.argv[0] = program
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,192 @@
+"""
+Error-code graph with a precomputed closure for impact-based test selection.
+
+Error codes are connected when a test case accepts one as an alternative to
+the other (error_code and alt_codes) or lists one as related to the other
+(error_code and related_errors). For every code the closure stores the test
+names grouped by graph distance: tests expecting the code itself at depth 0,
+tests expecting a neighboring code at depth 1, and so on. Selecting the
+tests within depth N of a code is then a lookup and a slice.
+
+consolidate_tests.py writes the graph next to the code dictionaries:
+
+    {
+        "format": 1,
+        "source": "<SHA-256 of the consolidated file>",
+        "edges": {"TAG_INVALID": ["CHARACTER_INVALID", ...], ...},
+        "tests_by_depth": {"TAG_INVALID": [["test-a", ...], ["test-b", ...], ...], ...}
+    }
+
+Usage:
+    from code_graph import load_code_graph, select_by_code
+
+    graph = load_code_graph(json_test_data / "validation_tests.json")
+    names = select_by_code(graph, "TAG_INVALID", depth=1)
+"""
+
+import hashlib
+import json
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+GRAPH_FORMAT = 1
+
+
+def code_graph_path(consolidated_path: Path) -> Path:
+    """Return the code graph path of a consolidated file (validation_tests.json -> validation_code_graph.json)."""
+    return consolidated_path.with_name(f"{consolidated_path.stem.removesuffix('_tests')}_code_graph.json")
+
+
+def build_edges(name_dict: Dict[str, List[str]], related_dict: Dict[str, List[str]]) -> Dict[str, Set[str]]:
+    """
+    Connect each test's error code to its alternative and related codes.
+
+    Parameters:
+        name_dict (Dict[str, List[str]]): Test name -> [error code, alt codes...]
+        related_dict (Dict[str, List[str]]): Test name -> related error codes
+
+    Returns:
+        Dict[str, Set[str]]: Undirected adjacency of error codes
+    """
+    edges: Dict[str, Set[str]] = defaultdict(set)
+    for name, codes in name_dict.items():
+        if not codes:
+            continue
+        primary = codes[0]
+        edges.setdefault(primary, set())
+        for other in list(codes[1:]) + list(related_dict.get(name, [])):
+            if other != primary:
+                edges[primary].add(other)
+                edges[other].add(primary)
+    return edges
+
+
+def _distances(edges: Dict[str, Set[str]], start: str) -> Dict[str, int]:
+    """Return the breadth-first distance from a code to every code it reaches."""
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        code = queue.popleft()
+        for neighbor in edges.get(code, ()):
+            if neighbor not in distances:
+                distances[neighbor] = distances[code] + 1
+                queue.append(neighbor)
+    return distances
+
+
+def build_closure(name_dict: Dict[str, List[str]], related_dict: Dict[str, List[str]]) -> dict:
+    """
+    Build the error-code graph and the tests within each distance of every code.
+
+    A test's distance from a code is the smallest distance from the code to any
+    code the test accepts (its error code or an alternative code).
+
+    Parameters:
+        name_dict (Dict[str, List[str]]): Test name -> [error code, alt codes...]
+        related_dict (Dict[str, List[str]]): Test name -> related error codes
+
+    Returns:
+        dict: Graph document with "format", "edges", and "tests_by_depth"
+    """
+    edges = build_edges(name_dict, related_dict)
+    tests_by_code: Dict[str, List[str]] = defaultdict(list)
+    for name, codes in name_dict.items():
+        for code in dict.fromkeys(codes):
+            tests_by_code[code].append(name)
+
+    tests_by_depth = {}
+    for code in sorted(edges):
+        distances = _distances(edges, code)
+        test_depth: Dict[str, int] = {}
+        for other, distance in distances.items():
+            for name in tests_by_code.get(other, []):
+                if distance < test_depth.get(name, distance + 1):
+                    test_depth[name] = distance
+        levels: List[List[str]] = [[] for _ in range(max(test_depth.values(), default=-1) + 1)]
+        for name, distance in test_depth.items():
+            levels[distance].append(name)
+        tests_by_depth[code] = [sorted(level) for level in levels]
+
+    return {
+        "format": GRAPH_FORMAT,
+        "edges": {code: sorted(neighbors) for code, neighbors in sorted(edges.items())},
+        "tests_by_depth": tests_by_depth,
+    }
+
+
+def write_code_graph(consolidated_path: Path, name_dict: Dict[str, List[str]], related_dict: Dict[str, List[str]]) -> dict:
+    """
+    Build the code graph of a consolidated file and write it next to the file.
+
+    Parameters:
+        consolidated_path (Path): Path of the consolidated file the dictionaries describe
+        name_dict (Dict[str, List[str]]): Test name -> [error code, alt codes...]
+        related_dict (Dict[str, List[str]]): Test name -> related error codes
+
+    Returns:
+        dict: The graph document
+    """
+    closure = build_closure(name_dict, related_dict)
+    graph = {
+        "format": closure["format"],
+        "source": hashlib.sha256(consolidated_path.read_bytes()).hexdigest(),
+        "edges": closure["edges"],
+        "tests_by_depth": closure["tests_by_depth"],
+    }
+    with open(code_graph_path(consolidated_path), "w", encoding="utf-8") as f:
+        json.dump(graph, f, indent=4)
+    return graph
+
+
+def closure_from_test_cases(test_cases: List[dict]) -> dict:
+    """Build the graph document directly from consolidated test cases."""
+    name_dict = {}
+    related_dict = {}
+    for test_case in test_cases:
+        name = test_case.get("name", "")
+        if name and name not in name_dict:
+            name_dict[name] = [test_case.get("error_code", "UNKNOWN")] + list(test_case.get("alt_codes", []) or [])
+            related_dict[name] = list(test_case.get("related_errors", []) or [])
+    return build_closure(name_dict, related_dict)
+
+
+def load_code_graph(consolidated_path: Path, test_cases: Optional[List[dict]] = None) -> dict:
+    """
+    Load the code graph of a consolidated file, rebuilding it in memory if missing or stale.
+
+    Parameters:
+        consolidated_path (Path): Path of the consolidated file
+        test_cases (Optional[List[dict]]): Already loaded test cases of the file
+
+    Returns:
+        dict: The graph document
+    """
+    try:
+        with open(code_graph_path(consolidated_path), "r", encoding="utf-8") as f:
+            graph = json.load(f)
+        source = hashlib.sha256(consolidated_path.read_bytes()).hexdigest()
+        if graph.get("format") == GRAPH_FORMAT and graph.get("source") == source:
+            return graph
+    except (OSError, ValueError, AttributeError):
+        pass
+    if test_cases is None:
+        with open(consolidated_path, "r", encoding="utf-8") as f:
+            test_cases = json.load(f)
+    return closure_from_test_cases(test_cases)
+
+
+def select_by_code(graph: dict, code: str, depth: int = 0) -> List[str]:
+    """
+    Return the tests within a graph distance of an error code.
+
+    Parameters:
+        graph (dict): Graph document
+        code (str): Error code
+        depth (int): Largest distance to include (0 selects tests expecting the code itself)
+
+    Returns:
+        List[str]: Test names, nearest first and sorted within each distance
+    """
+    levels = graph["tests_by_depth"].get(code, [])
+    return [name for level in levels[: max(depth, 0) + 1] for name in level]
@@ -5,18 +5,61 @@ This script combines separate test files from json_test_data/validation_tests/
 and json_test_data/schema_tests/ into consolidated files used by validators.
 
 Usage:
-    python src/scripts/consolidate_tests.py [--dry-run] [--verbose]
+    python src/scripts/consolidate_tests.py [--dry-run] [--verbose] [--stream] [--since <git-ref>] [--workers N] [--compress] [--metrics <file>]
 
 Arguments:
     --dry-run: Preview consolidation without writing files
     --verbose: Show detailed processing information
+    --stream: Parse and write test cases one at a time to bound memory use
+    --since: Only process test files changed since a git reference and merge them
+             into the existing consolidated files. The existing files are checked
+             against the .sources digests of a local run, or, in a fresh clone or
+             CI, must be the consolidated files committed at the reference
+    --workers: Read and check test files in this many processes and merge the
+               per-file results in file order (output is identical to a serial run)
+    --compress: Also write gzip (.gz) and xz (.xz) copies of the consolidated artifacts
+    --metrics: Append consolidate and consolidate.file events (see hooks.py) to a JSON-lines file
 """
 
 import argparse
+import hashlib
 import json
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .code_graph import write_code_graph
+    from .corpus import compress_artifact
+    from .git_changes import ChangeSet, GitError, get_changes
+    from .hooks import HOOKS, close_metrics, file_size, open_metrics, start_span
+    from .json_stream import JsonArrayWriter, JsonObjectWriter, NotAnArrayError, iter_json_array
+except ImportError:
+    from code_graph import write_code_graph
+    from corpus import compress_artifact
+    from git_changes import ChangeSet, GitError, get_changes
+    from hooks import HOOKS, close_metrics, file_size, open_metrics, start_span
+    from json_stream import JsonArrayWriter, JsonObjectWriter, NotAnArrayError, iter_json_array
+
+# Fields validators execute; the rest of each test case is documentation metadata
+LEAN_FIELDS = ["error_code", "alt_codes", "name", "schema", "warning", "definitions", "tests"]
+
+# Suffix of the file next to a consolidated output that records the digests of its source files
+SOURCES_SUFFIX = ".sources"
+
+# Artifacts that get compressed copies with --compress
+COMPRESSED_ARTIFACTS = [
+    "validation_tests.json",
+    "validation_tests_lean.json",
+    "validation_tests_metadata.json",
+    "schema_tests.json",
+    "schema_tests_lean.json",
+    "schema_tests_metadata.json",
+]
 
 
 def safe_print(text: str):
@@ -42,6 +85,10 @@ class TestStatistics:
         self.code_dict: Dict[str, List[str]] = defaultdict(list)
         # Maps test case name -> list of error codes (including alt_codes)
         self.name_dict: Dict[str, List[str]] = {}
+        # Maps test case name -> list of related error codes
+        self.related_dict: Dict[str, List[str]] = {}
+        # Maps test case name -> number of errors recorded before it, so merge can keep errors in case order
+        self.error_positions: Dict[str, int] = {}
 
     def add_test_case(self, test_case: dict):
         """Add a test case to statistics tracking."""
@@ -74,11 +121,54 @@ class TestStatistics:
 
         # Update name_dict: test name -> list of codes
         self.name_dict[name] = all_codes
+        self.error_positions[name] = len(self.errors)
+        self.related_dict[name] = list(test_case.get("related_errors", []) or [])
 
         # Update code_dict: error code -> list of test names
         for code in all_codes:
             self.code_dict[code].append(name)
 
+    def merge(self, other: "TestStatistics") -> "TestStatistics":
+        """
+        Add the statistics of the test cases that follow this object's cases.
+
+        Merging the statistics of consecutive partitions in order gives the same
+        counts, dictionaries, dictionary order, and error order as adding every
+        test case to one object. A name already seen in an earlier partition is
+        reported as a duplicate, at the position of its test case among the other
+        partition's errors, and keeps its first codes. An empty TestStatistics is
+        the identity.
+
+        Parameters:
+            other: Statistics of the test cases after this object's cases
+
+        Returns:
+            This object, for chaining
+        """
+        self.total_cases += other.total_cases
+        for code, count in other.error_codes.items():
+            self.error_codes[code] += count
+        for test_type, count in other.test_types.items():
+            self.test_types[test_type] += count
+        self.warnings.extend(other.warnings)
+
+        # Copy the other errors up to each name's position, so duplicates land where add_test_case puts them
+        copied = 0
+        for name, codes in other.name_dict.items():
+            position = other.error_positions.get(name, copied)
+            self.errors.extend(other.errors[copied:position])
+            copied = max(copied, position)
+            if name in self.name_dict:
+                self.add_error(f"Duplicate test case name: '{name}'")
+                continue
+            self.name_dict[name] = codes
+            self.related_dict[name] = other.related_dict.get(name, [])
+            self.error_positions[name] = len(self.errors)
+            for code in codes:
+                self.code_dict[code].append(name)
+        self.errors.extend(other.errors[copied:])
+        return self
+
     def add_warning(self, message: str):
         """Add a warning message."""
         self.warnings.append(message)
@@ -119,8 +209,165 @@ def validate_test_case(test_case: dict, filename: str) -> List[str]:
     return errors
 
 
+def load_test_cases(test_file: Path, stream: bool = False) -> Iterator[dict]:
+    """
+    Iterate over the test cases in a test file.
+
+    Parameters:
+        test_file: Path to the test file
+        stream: If True, decode one test case at a time instead of loading the whole file
+
+    Yields:
+        Test case dictionaries in file order
+
+    Raises:
+        NotAnArrayError: If the file does not contain a list
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    with open(test_file, "r", encoding="utf-8") as file:
+        if stream:
+            for _, test_case in iter_json_array(file):
+                yield test_case
+            return
+        data = json.load(file)
+
+    if not isinstance(data, list):
+        raise NotAnArrayError(f"{test_file.name} does not contain a list")
+    yield from data
+
+
+def read_test_file(test_file: Path, stats: TestStatistics, verbose: bool = False, stream: bool = False) -> Iterator[dict]:
+    """
+    Iterate over the test cases in a test file, recording problems in the statistics.
+
+    Each test case is checked with validate_test_case. Unreadable files and files
+    that do not contain a list are reported in the statistics and yield nothing
+    further.
+
+    Parameters:
+        test_file: Path to the test file
+        stats: Statistics object that receives warnings and errors
+        verbose: If True, print validation errors as they are found
+        stream: If True, decode one test case at a time
+
+    Yields:
+        Test case dictionaries in file order
+    """
+    try:
+        # Process each test case
+        for test_case in load_test_cases(test_file, stream):
+            # Validate test case
+            validation_errors = validate_test_case(test_case, test_file.name)
+            for error in validation_errors:
+                stats.add_error(error)
+                if verbose:
+                    print(f"    ERROR: {error}")
+            yield test_case
+
+    except NotAnArrayError:
+        # Validate structure
+        warning = f"    WARNING: {test_file.name} does not contain a list"
+        print(warning)
+        stats.add_warning(warning)
+    except json.JSONDecodeError as e:
+        error = f"JSON decode error in {test_file.name}: {e}"
+        print(f"  ERROR: {error}")
+        stats.add_error(error)
+    except Exception as e:
+        error = f"Error processing {test_file.name}: {e}"
+        print(f"  ERROR: {error}")
+        stats.add_error(error)
+
+
+def read_partition(test_file: Path, verbose: bool = False) -> Tuple[List[dict], TestStatistics, str, float, Optional[int]]:
+    """
+    Read one test file into its own statistics, capturing what would be printed.
+
+    This is the map step of combine_tests with workers: each file is parsed and
+    checked in a worker process and the results are merged in file order.
+
+    Parameters:
+        test_file: Path to the test file
+        verbose: If True, include the file name and validation errors in the output
+
+    Returns:
+        Tuple of (test cases in file order, statistics of the file, printed output,
+        seconds spent reading the file in the worker, file size in bytes)
+    """
+    start = time.perf_counter()
+    size = file_size(test_file)
+    stats = TestStatistics()
+    test_cases = []
+    output = StringIO()
+    with redirect_stdout(output):
+        if verbose:
+            print(f"  - {test_file.name}")
+        for test_case in read_test_file(test_file, stats, verbose=verbose):
+            test_cases.append(test_case)
+            stats.add_test_case(test_case)
+    return test_cases, stats, output.getvalue(), time.perf_counter() - start, size
+
+
+def sources_path(output_path: Path) -> Path:
+    """Return the path of the source digest file of a consolidated output."""
+    return output_path.with_name(output_path.name + SOURCES_SUFFIX)
+
+
+def source_digests(test_files: List[Path]) -> Dict[str, str]:
+    """
+    Hash the bytes of test files.
+
+    Parameters:
+        test_files: Test files a consolidated output is built from
+
+    Returns:
+        SHA-256 digest by file name
+    """
+    return {test_file.name: hashlib.sha256(test_file.read_bytes()).hexdigest() for test_file in test_files}
+
+
+def read_source_digests(output_path: Path) -> Optional[Dict[str, str]]:
+    """
+    Read the source digests recorded for a consolidated output.
+
+    Parameters:
+        output_path: Path of the consolidated output
+
+    Returns:
+        SHA-256 digest by file name, or None if none were recorded or they cannot be read
+    """
+    try:
+        with open(sources_path(output_path), "r", encoding="utf-8") as f:
+            digests = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return digests if isinstance(digests, dict) else None
+
+
+def write_source_digests(output_path: Path, digests: Optional[Dict[str, str]]):
+    """
+    Record the source digests of a consolidated output, or remove them if None.
+
+    Parameters:
+        output_path: Path of the consolidated output
+        digests: SHA-256 digest by file name of the files the output was built from
+    """
+    path = sources_path(output_path)
+    if digests is None:
+        path.unlink(missing_ok=True)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(digests, f, indent=2, sort_keys=True)
+
+
 def combine_tests(
-    test_dir: Path, output_path: Path, exclude_prefixes: List[str] = None, dry_run: bool = False, verbose: bool = False
+    test_dir: Path,
+    output_path: Path,
+    exclude_prefixes: List[str] = None,
+    dry_run: bool = False,
+    verbose: bool = False,
+    stream: bool = False,
+    workers: int = 1,
 ) -> Tuple[int, TestStatistics]:
     """
     Combine multiple JSON test files into a single consolidated file.
@@ -131,6 +378,12 @@ def combine_tests(
         exclude_prefixes: List of filename prefixes to exclude
         dry_run: If True, preview without writing files
         verbose: If True, show detailed information
+        stream: If True, parse and write test cases one at a time so memory use is
+                bounded by the largest test case. Test cases decoded before a JSON
+                syntax error in a file are kept rather than dropping the whole file.
+        workers: Number of processes that read and check files in parallel. The
+                 per-file results are merged in sorted file order, so the output
+                 is identical to a serial run. Ignored when streaming.
 
     Returns:
         Tuple of (total test cases, statistics object)
@@ -139,6 +392,7 @@ def combine_tests(
         exclude_prefixes = []
 
     combined_data = []
+    case_count = 0
     stats = TestStatistics()
 
     # Get all JSON files in the directory
@@ -148,64 +402,449 @@ def combine_tests(
     filtered_files = [f for f in test_files if not any(f.name.startswith(prefix) for prefix in exclude_prefixes)]
 
     print(f"\nProcessing {len(filtered_files)} test files from {test_dir.name}/")
+    span = start_span("consolidate", directory=test_dir.name, files=len(filtered_files)) if HOOKS else None
 
-    # Read and concatenate the JSON data
-    for test_file in filtered_files:
-        if verbose:
-            print(f"  - {test_file.name}")
-
+    # In streaming mode, cases go straight to a temporary output file
+    writer = None
+    temp_path = output_path.with_name(output_path.name + ".tmp")
+    if stream and not dry_run:
         try:
-            with open(test_file, "r", encoding="utf-8") as file:
-                data = json.load(file)
-
-            # Validate structure
-            if not isinstance(data, list):
-                warning = f"    WARNING: {test_file.name} does not contain a list"
-                print(warning)
-                stats.add_warning(warning)
-                continue
-
-            # Process each test case
-            for test_case in data:
-                # Validate test case
-                validation_errors = validate_test_case(test_case, test_file.name)
-                for error in validation_errors:
-                    stats.add_error(error)
-                    if verbose:
-                        print(f"    ERROR: {error}")
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            writer = JsonArrayWriter(open(temp_path, "w", encoding="utf-8"))
+        except Exception as e:
+            error = f"Failed to write {output_path.name}: {e}"
+            print(f"  ERROR: {error}")
+            stats.add_error(error)
+            return 0, stats
 
+    if workers > 1 and not stream:
+        # Map each file to its cases and statistics, then reduce in file order
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partitions = executor.map(read_partition, filtered_files, [verbose] * len(filtered_files))
+            for test_file, (test_cases, file_stats, output, seconds, size) in zip(filtered_files, partitions, strict=True):
+                file_span = start_span("consolidate.file", file=test_file.name, bytes=size) if HOOKS else None
+                print(output, end="")
+                combined_data.extend(test_cases)
+                case_count += len(test_cases)
+                stats.merge(file_stats)
+                if file_span:
+                    # Report the time the worker spent reading the file, not the time of the merge
+                    file_span.end(cases=len(test_cases), errors=len(file_stats.errors), seconds=seconds)
+    else:
+        # Read and concatenate the JSON data
+        for test_file in filtered_files:
+            if verbose:
+                print(f"  - {test_file.name}")
+            file_span = start_span("consolidate.file", file=test_file.name, bytes=file_size(test_file)) if HOOKS else None
+            errors_before, cases_before = len(stats.errors), case_count
+
+            for test_case in read_test_file(test_file, stats, verbose=verbose, stream=stream):
                 # Add to combined data and statistics
                 # Note: add_test_case will check for duplicate names and add errors
-                combined_data.append(test_case)
+                if writer is not None:
+                    writer.write(test_case)
+                elif not stream:
+                    combined_data.append(test_case)
+                case_count += 1
                 stats.add_test_case(test_case)
 
-        except json.JSONDecodeError as e:
-            error = f"JSON decode error in {test_file.name}: {e}"
-            print(f"  ERROR: {error}")
-            stats.add_error(error)
-            continue
-        except Exception as e:
-            error = f"Error processing {test_file.name}: {e}"
-            print(f"  ERROR: {error}")
-            stats.add_error(error)
-            continue
+            if file_span:
+                file_span.end(cases=case_count - cases_before, errors=len(stats.errors) - errors_before)
 
     # Write the combined data to output file
     if not dry_run:
         try:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, "w", encoding="utf-8") as output_file:
-                json.dump(combined_data, output_file, indent=4)
-            safe_print(f"✓ Wrote {len(combined_data)} test cases to {output_path.name}")
+            if writer is not None:
+                writer.close()
+                writer.fp.close()
+                temp_path.replace(output_path)
+            else:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(output_path, "w", encoding="utf-8") as output_file:
+                    json.dump(combined_data, output_file, indent=4)
+            safe_print(f"✓ Wrote {case_count} test cases to {output_path.name}")
+            write_source_digests(output_path, source_digests(filtered_files))
         except Exception as e:
             error = f"Failed to write {output_path.name}: {e}"
             print(f"  ERROR: {error}")
             stats.add_error(error)
-            return 0, stats
+            write_source_digests(output_path, None)
+            case_count = 0
     else:
-        print(f"[DRY RUN] Would write {len(combined_data)} test cases to {output_path.name}")
+        print(f"[DRY RUN] Would write {case_count} test cases to {output_path.name}")
+
+    if span:
+        span.end(cases=case_count, errors=len(stats.errors), warnings=len(stats.warnings))
+    return case_count, stats
 
-    return len(combined_data), stats
+
+def _case_names(test_cases: list) -> List[str]:
+    """Return the names of the test cases in a decoded test file."""
+    if not isinstance(test_cases, list):
+        return []
+    return [case["name"] for case in test_cases if isinstance(case, dict) and case.get("name")]
+
+
+def merge_changed_tests(
+    test_dir: Path,
+    output_path: Path,
+    changes: ChangeSet,
+    exclude_prefixes: List[str] = None,
+    dry_run: bool = False,
+    verbose: bool = False,
+) -> Optional[Tuple[int, TestStatistics]]:
+    """
+    Merge test files changed since a git reference into an existing consolidated file.
+
+    Only modified and added files are read and validated. The cases that modified
+    and deleted files contributed at the reference are removed from the existing
+    output, and the current cases are inserted where the file sorts, so the result
+    matches what combine_tests would write. The existing output is reused only if
+    the source digests recorded with it match the unchanged files, and the cases
+    the changed files had at the reference are all in it. Without recorded digests
+    (the .sources file is not tracked, so a fresh clone or CI has none), the output
+    must instead be the consolidated file committed at the reference, which was
+    built from the unchanged files as they still are.
+
+    Parameters:
+        test_dir: Directory containing individual test files
+        output_path: Path of the existing consolidated file, which is rewritten
+        changes: Test files changed since the reference
+        exclude_prefixes: List of filename prefixes to exclude
+        dry_run: If True, preview without writing files
+        verbose: If True, show detailed information
+
+    Returns:
+        Tuple of (total test cases, statistics object), or None if the existing
+        output cannot be reused and a full consolidation is needed
+    """
+    if exclude_prefixes is None:
+        exclude_prefixes = []
+
+    def included(path: Path) -> bool:
+        return not any(path.name.startswith(prefix) for prefix in exclude_prefixes)
+
+    changes = changes.in_directory(test_dir)
+    modified = [p for p in changes.modified if included(p)]
+    added = [p for p in changes.added if included(p)]
+    deleted = [p for p in changes.deleted if included(p)]
+
+    print(
+        f"\nMerging {len(modified) + len(added)} changed and {len(deleted)} deleted test files "
+        f"from {test_dir.name}/ since {changes.since}"
+    )
+
+    if not output_path.exists():
+        print(f"  {output_path.name} not found, running full consolidation")
+        return None
+    try:
+        output_text = output_path.read_text(encoding="utf-8")
+        existing = json.loads(output_text)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"  Cannot read {output_path.name} ({e}), running full consolidation")
+        return None
+    if not isinstance(existing, list):
+        print(f"  {output_path.name} does not contain a list, running full consolidation")
+        return None
+
+    # The existing output must have been built from the unchanged files as they are now
+    all_files = sorted(p for p in test_dir.glob("*.json") if included(p))
+    changed = set(modified + added)
+    current = source_digests(all_files)
+    recorded = read_source_digests(output_path)
+    if recorded is None:
+        stale = _stale_at_ref(output_path, output_text, changes)
+    else:
+        stale = _stale_source(recorded, current, {p.name for p in changed}, {p.name for p in modified + deleted})
+    if stale:
+        print(f"  {output_path.name} is out of date with its source files ({stale}), running full consolidation")
+        return None
+
+    # Remove the cases each modified or deleted file contributed at the reference
+    positions = {case.get("name"): index for index, case in enumerate(existing) if isinstance(case, dict)}
+    removed = set()
+    old_start = {}
+    for path in modified + deleted:
+        try:
+            old_names = _case_names(json.loads(changes.read_at_ref(path)))
+        except (GitError, json.JSONDecodeError):
+            old_names = []
+        missing = [name for name in old_names if name not in positions]
+        if missing:
+            print(f"  {output_path.name} is out of date with {changes.since} ({missing[0]}), running full consolidation")
+            return None
+        removed.update(old_names)
+        if old_names:
+            old_start[path] = min(positions[name] for name in old_names)
+
+    kept = []
+    kept_before = []
+    for case in existing:
+        kept_before.append(len(kept))
+        if not (isinstance(case, dict) and case.get("name") in removed):
+            kept.append(case)
+    kept_positions = {case.get("name"): index for index, case in enumerate(kept) if isinstance(case, dict)}
+
+    # Find where each changed file's block goes among the kept cases
+    inserts = []
+    for path in sorted(changed):
+        if path in old_start:
+            cut = kept_before[old_start[path]]
+        else:
+            cut = _insertion_point(path, all_files, changed, kept_positions)
+        inserts.append((cut, path))
+    inserts.sort()
+
+    stats = TestStatistics()
+    merged = []
+    previous = 0
+    for cut, path in inserts:
+        if verbose:
+            print(f"  - {path.name}")
+        merged.extend(kept[previous:cut])
+        merged.extend(read_test_file(path, stats, verbose=verbose))
+        previous = cut
+    merged.extend(kept[previous:])
+
+    for test_case in merged:
+        stats.add_test_case(test_case)
+
+    if dry_run:
+        print(f"[DRY RUN] Would write {len(merged)} test cases to {output_path.name}")
+        return len(merged), stats
+
+    try:
+        with open(output_path, "w", encoding="utf-8") as output_file:
+            json.dump(merged, output_file, indent=4)
+        safe_print(f"✓ Wrote {len(merged)} test cases to {output_path.name}")
+        write_source_digests(output_path, current)
+    except Exception as e:
+        error = f"Failed to write {output_path.name}: {e}"
+        print(f"  ERROR: {error}")
+        stats.add_error(error)
+        write_source_digests(output_path, None)
+        return 0, stats
+
+    return len(merged), stats
+
+
+def _stale_source(
+    recorded: Optional[Dict[str, str]], current: Dict[str, str], changed: set, previously_included: set
+) -> Optional[str]:
+    """
+    Find a source file the existing consolidated output does not reflect.
+
+    Parameters:
+        recorded: Source digests recorded with the existing output, or None
+        current: Digests of the current test files
+        changed: Names of the modified and added files
+        previously_included: Names of the modified and deleted files, which the output must include
+
+    Returns:
+        A description of the first mismatch, or None if the unchanged files match
+    """
+    if recorded is None:
+        return f"no {SOURCES_SUFFIX} file"
+    for name, digest in current.items():
+        if name not in changed and recorded.get(name) != digest:
+            return f"{name} differs"
+    for name in recorded:
+        if name not in current and name not in previously_included:
+            return f"{name} was removed"
+    for name in previously_included:
+        if name not in recorded:
+            return f"{name} is not in the output"
+    for name in changed - previously_included:
+        if name in recorded:
+            return f"{name} is already in the output"
+    return None
+
+
+def _stale_at_ref(output_path: Path, output_text: str, changes: ChangeSet) -> Optional[str]:
+    """
+    Check an output without recorded source digests against the one committed at the reference.
+
+    Parameters:
+        output_path: Path of the consolidated output
+        output_text: Current content of the output
+        changes: Test files changed since the reference
+
+    Returns:
+        A description of why the output cannot be reused, or None if it is the committed one
+    """
+    try:
+        committed = changes.read_at_ref(output_path)
+    except GitError:
+        return f"no {SOURCES_SUFFIX} file and not tracked at {changes.since}"
+    if committed != output_text:
+        return f"no {SOURCES_SUFFIX} file and changed since {changes.since}"
+    return None
+
+
+def _insertion_point(path: Path, all_files: List[Path], changed: set, kept_positions: Dict[str, int]) -> int:
+    """
+    Find where a changed file's cases belong among the unchanged cases.
+
+    The block goes right after the last case of the nearest preceding unchanged
+    file, which is read only to learn its case names.
+
+    Parameters:
+        path: The changed test file
+        all_files: All current test files in sorted order
+        changed: Modified and added test files
+        kept_positions: Positions of the unchanged cases by name
+
+    Returns:
+        Index in the unchanged case list at which to insert the block
+    """
+    preceding = [p for p in all_files if p < path and p not in changed]
+    for neighbor in reversed(preceding):
+        try:
+            names = _case_names(list(load_test_cases(neighbor)))
+        except (NotAnArrayError, json.JSONDecodeError, OSError):
+            continue
+        indices = [kept_positions[name] for name in names if name in kept_positions]
+        if indices:
+            return max(indices) + 1
+    return 0
+
+
+def consolidate_directory(
+    test_dir: Path,
+    output_path: Path,
+    exclude_prefixes: List[str],
+    changes: Optional[ChangeSet] = None,
+    dry_run: bool = False,
+    verbose: bool = False,
+    stream: bool = False,
+    workers: int = 1,
+) -> Tuple[int, TestStatistics]:
+    """
+    Consolidate one test directory, incrementally when a change set allows it.
+
+    Parameters:
+        test_dir: Directory containing individual test files
+        output_path: Path for the consolidated output file
+        exclude_prefixes: List of filename prefixes to exclude
+        changes: Test files changed since a git reference, or None for a full run
+        dry_run: If True, preview without writing files
+        verbose: If True, show detailed information
+        stream: If True, parse and write test cases one at a time in a full run
+        workers: Number of processes that read test files in a full run
+
+    Returns:
+        Tuple of (total test cases, statistics object)
+    """
+    if changes is not None and not changes.requires_full_run:
+        result = merge_changed_tests(test_dir, output_path, changes, exclude_prefixes, dry_run=dry_run, verbose=verbose)
+        if result is not None:
+            return result
+    return combine_tests(
+        test_dir, output_path, exclude_prefixes, dry_run=dry_run, verbose=verbose, stream=stream, workers=workers
+    )
+
+
+def write_dictionaries(json_test_data_dir: Path, kind: str, stats: TestStatistics):
+    """
+    Write the code and test name dictionaries and the code graph of one test kind.
+
+    Parameters:
+        json_test_data_dir: Directory holding the consolidated files
+        kind: "validation" or "schema"
+        stats: Statistics gathered while consolidating the kind
+    """
+    with open(json_test_data_dir / f"{kind}_code_dict.json", "w", encoding="utf-8") as f:
+        json.dump(dict(stats.code_dict), f, indent=4)
+    with open(json_test_data_dir / f"{kind}_testname_dict.json", "w", encoding="utf-8") as f:
+        json.dump(stats.name_dict, f, indent=4)
+    write_code_graph(json_test_data_dir / f"{kind}_tests.json", stats.name_dict, stats.related_dict)
+
+
+def _parse_seconds(path: Path, repeats: int = 3) -> float:
+    """Return the best time to parse a JSON file from its text over several runs."""
+    text = path.read_text(encoding="utf-8")
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        json.loads(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def write_lean_artifact(
+    consolidated_path: Path,
+    lean_path: Path,
+    metadata_path: Path,
+    measure_parse: bool = True,
+    test_cases: Optional[List[dict]] = None,
+) -> Dict[str, Optional[float]]:
+    """
+    Split a consolidated file into a lean executable artifact and a metadata file.
+
+    The lean file keeps only LEAN_FIELDS of each test case, in the same order. The
+    metadata file maps each test name to its remaining fields (descriptions, AI
+    metadata, references), so the two files together hold the full consolidated
+    data. The consolidated file is read one test case at a time unless its test
+    cases are passed in.
+
+    Parameters:
+        consolidated_path: Path of the consolidated test file
+        lean_path: Path for the lean executable-only file
+        metadata_path: Path for the metadata file keyed by test name
+        measure_parse: If True, time parsing of the consolidated and lean files
+        test_cases: Test cases of the consolidated file, if already in memory
+
+    Returns:
+        Dictionary with "full_bytes", "lean_bytes", "full_parse" and "lean_parse"
+        (parse times in seconds, None if not measured)
+    """
+    with (
+        open(consolidated_path, "r", encoding="utf-8") as source,
+        open(lean_path, "w", encoding="utf-8") as lean_file,
+        open(metadata_path, "w", encoding="utf-8") as metadata_file,
+    ):
+        with JsonArrayWriter(lean_file) as lean_writer, JsonObjectWriter(metadata_file) as metadata_writer:
+            cases = test_cases if test_cases is not None else (test_case for _, test_case in iter_json_array(source))
+            for test_case in cases:
+                lean_writer.write({key: test_case[key] for key in LEAN_FIELDS if key in test_case})
+                metadata = {key: value for key, value in test_case.items() if key not in LEAN_FIELDS}
+                metadata_writer.write(test_case.get("name", ""), metadata)
+
+    report = {
+        "full_bytes": consolidated_path.stat().st_size,
+        "lean_bytes": lean_path.stat().st_size,
+        "full_parse": None,
+        "lean_parse": None,
+    }
+    if measure_parse:
+        report["full_parse"] = _parse_seconds(consolidated_path)
+        report["lean_parse"] = _parse_seconds(lean_path)
+    return report
+
+
+def format_lean_report(name: str, report: Dict[str, Optional[float]]) -> str:
+    """Format the size and parse-time reduction of a lean artifact for the summary."""
+    full_bytes, lean_bytes = report["full_bytes"], report["lean_bytes"]
+    size_cut = 100 * (1 - lean_bytes / full_bytes) if full_bytes else 0.0
+    line = f"  {name}: {full_bytes / 1024:.1f} KB -> {lean_bytes / 1024:.1f} KB ({size_cut:.1f}% smaller)"
+    if report["full_parse"]:
+        parse_cut = 100 * (1 - report["lean_parse"] / report["full_parse"])
+        line += (
+            f", parse {1000 * report['full_parse']:.2f} ms -> {1000 * report['lean_parse']:.2f} ms "
+            f"({parse_cut:.1f}% faster)"
+        )
+    return line
+
+
+def format_compression_report(path: Path, outputs: Dict[str, Path]) -> str:
+    """Format the compressed sizes of an artifact for the summary."""
+    size = path.stat().st_size
+    parts = []
+    for suffix, output_path in outputs.items():
+        compressed = output_path.stat().st_size
+        ratio = size / compressed if compressed else 0.0
+        parts.append(f"{suffix} {compressed / 1024:.1f} KB ({ratio:.1f}x)")
+    return f"  {path.name}: {size / 1024:.1f} KB -> " + ", ".join(parts)
 
 
 def print_statistics(stats: TestStatistics, verbose: bool = False):
@@ -255,6 +894,25 @@ def main(arg_list: List[str] = None):
     parser = argparse.ArgumentParser(description="Consolidate HED test files for validator consumption")
     parser.add_argument("--dry-run", action="store_true", help="Preview consolidation without writing files")
     parser.add_argument("--verbose", action="store_true", help="Show detailed processing information")
+    parser.add_argument(
+        "--stream", action="store_true", help="Parse and write test cases one at a time (for very large test files)"
+    )
+    parser.add_argument(
+        "--since",
+        type=str,
+        metavar="GIT_REF",
+        help="Only process test files changed since a git reference and merge them into the existing outputs",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes that read and check test files in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "--compress", action="store_true", help="Also write gzip (.gz) and xz (.xz) copies of the consolidated artifacts"
+    )
+    parser.add_argument("--metrics", type=str, help="Append per-file and per-directory timing events to this JSON-lines file")
     args = parser.parse_args(arg_list)
 
     # Get script directory and project root
@@ -284,94 +942,152 @@ def main(arg_list: List[str] = None):
     # Exclude deprecated tests from consolidated files
     exclude_prefixes = ["VERSION_DEPRECATED"]
 
-    all_stats = TestStatistics()
-
-    # Combine validation tests
-    print("\n1. Consolidating validation tests...")
-    validation_count, val_stats = combine_tests(
-        validation_tests_dir,
-        json_test_data_dir / "validation_tests.json",
-        exclude_prefixes,
-        dry_run=args.dry_run,
-        verbose=args.verbose,
-    )
-
-    # Save validation test dictionaries
-    if not args.dry_run:
-        try:
-            with open(json_test_data_dir / "validation_code_dict.json", "w", encoding="utf-8") as f:
-                json.dump(dict(val_stats.code_dict), f, indent=4)
-            with open(json_test_data_dir / "validation_testname_dict.json", "w", encoding="utf-8") as f:
-                json.dump(val_stats.name_dict, f, indent=4)
-            if args.verbose:
-                print("  Saved code_dict and name_dict")
-        except Exception as e:
-            error = f"Failed to write dictionary files: {e}"
-            print(f"  ERROR: {error}")
-            val_stats.add_error(error)
-
-    # Merge statistics
-    all_stats.total_cases += val_stats.total_cases
-    for code, count in val_stats.error_codes.items():
-        all_stats.error_codes[code] += count
-    for test_type, count in val_stats.test_types.items():
-        all_stats.test_types[test_type] += count
-    all_stats.warnings.extend(val_stats.warnings)
-    all_stats.errors.extend(val_stats.errors)
-
-    if args.verbose:
-        print_statistics(val_stats, verbose=True)
-
-    # Combine schema tests
-    print("\n2. Consolidating schema tests...")
-    schema_count, schema_stats = combine_tests(
-        schema_tests_dir,
-        json_test_data_dir / "schema_tests.json",
-        exclude_prefixes,
-        dry_run=args.dry_run,
-        verbose=args.verbose,
-    )
-
-    # Save schema test dictionaries
-    if not args.dry_run:
+    # Determine which test files changed for an incremental run
+    changes = None
+    if args.since:
         try:
-            with open(json_test_data_dir / "schema_code_dict.json", "w", encoding="utf-8") as f:
-                json.dump(dict(schema_stats.code_dict), f, indent=4)
-            with open(json_test_data_dir / "schema_testname_dict.json", "w", encoding="utf-8") as f:
-                json.dump(schema_stats.name_dict, f, indent=4)
-            if args.verbose:
-                print("  Saved code_dict and name_dict")
-        except Exception as e:
-            error = f"Failed to write dictionary files: {e}"
-            print(f"  ERROR: {error}")
-            schema_stats.add_error(error)
-
-    # Merge statistics
-    for code, count in schema_stats.error_codes.items():
-        all_stats.error_codes[code] += count
-    for test_type, count in schema_stats.test_types.items():
-        all_stats.test_types[test_type] += count
-    all_stats.warnings.extend(schema_stats.warnings)
-    all_stats.errors.extend(schema_stats.errors)
+            changes = get_changes(project_root, args.since)
+        except GitError as e:
+            print(f"WARNING: {e}; running full consolidation")
+        else:
+            if changes.requires_full_run:
+                print(f"Schema or scripts changed since {args.since}; running full consolidation:")
+                for reason in changes.full_run_reasons:
+                    print(f"  - {reason}")
 
-    if args.verbose:
-        print_statistics(schema_stats, verbose=True)
-
-    # Print summary
-    print("\n" + "=" * 60)
-    print("Consolidation Summary")
-    print("=" * 60)
-    print(f"Validation tests: {validation_count}")
-    print(f"Schema tests: {schema_count}")
-    print(f"Total unique error codes: {len(all_stats.error_codes)}")
-    print()
-    print("Output files:")
-    print("  - validation_tests.json (all validation tests)")
-    print("  - validation_code_dict.json (error codes to test names)")
-    print("  - validation_testname_dict.json (test names to error codes)")
-    print("  - schema_tests.json (all schema tests)")
-    print("  - schema_code_dict.json (error codes to test names)")
-    print("  - schema_testname_dict.json (test names to error codes)")
+    all_stats = TestStatistics()
+    lean_reports = {}
+    metrics = open_metrics(args.metrics)
+    try:
+        # Combine validation tests
+        print("\n1. Consolidating validation tests...")
+        validation_count, val_stats = consolidate_directory(
+            validation_tests_dir,
+            json_test_data_dir / "validation_tests.json",
+            exclude_prefixes,
+            changes=changes,
+            dry_run=args.dry_run,
+            verbose=args.verbose,
+            stream=args.stream,
+            workers=args.workers,
+        )
+
+        # Save validation test dictionaries
+        if not args.dry_run:
+            try:
+                write_dictionaries(json_test_data_dir, "validation", val_stats)
+                if args.verbose:
+                    print("  Saved code_dict and name_dict")
+            except Exception as e:
+                error = f"Failed to write dictionary files: {e}"
+                print(f"  ERROR: {error}")
+                val_stats.add_error(error)
+            try:
+                lean_reports["validation_tests_lean.json"] = write_lean_artifact(
+                    json_test_data_dir / "validation_tests.json",
+                    json_test_data_dir / "validation_tests_lean.json",
+                    json_test_data_dir / "validation_tests_metadata.json",
+                    measure_parse=not args.stream,
+                )
+            except Exception as e:
+                error = f"Failed to write lean validation artifact: {e}"
+                print(f"  ERROR: {error}")
+                val_stats.add_error(error)
+
+        # Merge statistics
+        all_stats.merge(val_stats)
+
+        if args.verbose:
+            print_statistics(val_stats, verbose=True)
+
+        # Combine schema tests
+        print("\n2. Consolidating schema tests...")
+        schema_count, schema_stats = consolidate_directory(
+            schema_tests_dir,
+            json_test_data_dir / "schema_tests.json",
+            exclude_prefixes,
+            changes=changes,
+            dry_run=args.dry_run,
+            verbose=args.verbose,
+            stream=args.stream,
+            workers=args.workers,
+        )
+
+        # Save schema test dictionaries
+        if not args.dry_run:
+            try:
+                write_dictionaries(json_test_data_dir, "schema", schema_stats)
+                if args.verbose:
+                    print("  Saved code_dict and name_dict")
+            except Exception as e:
+                error = f"Failed to write dictionary files: {e}"
+                print(f"  ERROR: {error}")
+                schema_stats.add_error(error)
+            try:
+                lean_reports["schema_tests_lean.json"] = write_lean_artifact(
+                    json_test_data_dir / "schema_tests.json",
+                    json_test_data_dir / "schema_tests_lean.json",
+                    json_test_data_dir / "schema_tests_metadata.json",
+                    measure_parse=not args.stream,
+                )
+            except Exception as e:
+                error = f"Failed to write lean schema artifact: {e}"
+                print(f"  ERROR: {error}")
+                schema_stats.add_error(error)
+
+        # Merge statistics (a name used by both kinds is reported as a duplicate)
+        all_stats.merge(schema_stats)
+
+        if args.verbose:
+            print_statistics(schema_stats, verbose=True)
+
+        # Compress the artifacts after both kinds are written
+        compression_reports = []
+        if args.compress and not args.dry_run:
+            for name in COMPRESSED_ARTIFACTS:
+                try:
+                    outputs = compress_artifact(json_test_data_dir / name)
+                    compression_reports.append(format_compression_report(json_test_data_dir / name, outputs))
+                except OSError as e:
+                    error = f"Failed to compress {name}: {e}"
+                    print(f"  ERROR: {error}")
+                    all_stats.add_error(error)
+
+        # Print summary
+        print("\n" + "=" * 60)
+        print("Consolidation Summary")
+        print("=" * 60)
+        print(f"Validation tests: {validation_count}")
+        print(f"Schema tests: {schema_count}")
+        print(f"Total unique error codes: {len(all_stats.error_codes)}")
+        print()
+        print("Output files:")
+        print("  - validation_tests.json (all validation tests)")
+        print("  - validation_code_dict.json (error codes to test names)")
+        print("  - validation_testname_dict.json (test names to error codes)")
+        print("  - schema_tests.json (all schema tests)")
+        print("  - schema_code_dict.json (error codes to test names)")
+        print("  - schema_testname_dict.json (test names to error codes)")
+        print("  - validation_code_graph.json, schema_code_graph.json (error-code graph and closure)")
+        print("  - validation_tests_lean.json, schema_tests_lean.json (executable fields only)")
+        print("  - validation_tests_metadata.json, schema_tests_metadata.json (documentation metadata by test name)")
+
+        if lean_reports:
+            print()
+            print("Lean artifacts:")
+            for name, report in lean_reports.items():
+                print(format_lean_report(name, report))
+
+        if compression_reports:
+            print()
+            print("Compressed artifacts:")
+            for line in compression_reports:
+                print(line)
+    finally:
+        close_metrics(metrics)
+
+    if metrics:
+        print(f"\nMetrics appended to: {args.metrics}")
 
     # Print overall statistics
     if args.verbose:
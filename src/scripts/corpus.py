@@ -0,0 +1,255 @@
+"""
+Shared helpers for walking HED test cases and their sub-tests.
+
+A test case holds its sub-tests in ``tests``, grouped by test type
+(string_tests, sidecar_tests, event_tests, combo_tests, schema_tests) and by
+expected outcome (fails or passes). These helpers give every script the same
+view of that structure.
+
+Consolidated files can be loaded through a marshal snapshot kept next to the
+source (``validation_tests.json.snapshot``). The snapshot is keyed by the
+SHA-256 of the source bytes, the snapshot format, and the interpreter's
+marshal version, so a stale or foreign snapshot is detected and rebuilt.
+
+Consolidated artifacts may also be distributed gzip- or xz-compressed
+(``validation_tests.json.gz``, ``validation_tests.json.xz``). The readers here
+decompress and parse those one test case at a time.
+"""
+
+import gzip
+import hashlib
+import json
+import lzma
+import marshal
+import shutil
+import sys
+import zlib
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .json_stream import iter_json_array
+except ImportError:
+    from json_stream import iter_json_array
+
+# Sub-test types in the order they appear in the test schema
+TEST_TYPES = ["string_tests", "sidecar_tests", "event_tests", "combo_tests", "schema_tests"]
+
+# Expected outcomes of sub-tests
+OUTCOMES = ["fails", "passes"]
+
+# Consolidated files produced by consolidate_tests.py
+CONSOLIDATED_FILES = ["validation_tests.json", "schema_tests.json"]
+
+# Bump when the snapshot layout changes so old snapshots are rebuilt
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# Compressed artifact suffixes and the modules that read them
+COMPRESSED_FORMATS = {".gz": gzip, ".xz": lzma}
+
+# Errors from reading a corrupt or truncated compressed artifact
+DECOMPRESSION_ERRORS = (EOFError, gzip.BadGzipFile, lzma.LZMAError, zlib.error)
+
+
+def kind_name(test_type: str) -> str:
+    """
+    Return the short kind name of a test type.
+
+    Parameters:
+        test_type (str): Test type such as "string_tests"
+
+    Returns:
+        str: Kind such as "string"
+    """
+    return test_type[: -len("_tests")] if test_type.endswith("_tests") else test_type
+
+
+def iter_subtests(test_case: dict) -> Iterator[Tuple[str, str, int, Any]]:
+    """
+    Iterate over the sub-tests of a test case.
+
+    Parameters:
+        test_case (dict): Test case data
+
+    Yields:
+        Tuple[str, str, int, Any]: (test type, outcome, index within outcome, payload)
+    """
+    tests = test_case.get("tests", {})
+    if not isinstance(tests, dict):
+        return
+    for test_type, test_data in tests.items():
+        if not isinstance(test_data, dict):
+            continue
+        for outcome in OUTCOMES:
+            for index, payload in enumerate(test_data.get(outcome, [])):
+                yield test_type, outcome, index, payload
+
+
+def open_artifact(path: Path) -> IO[str]:
+    """
+    Open a consolidated artifact for reading as text, decompressing .gz and .xz files.
+
+    Parameters:
+        path (Path): Path to a plain, gzip, or xz JSON file
+
+    Returns:
+        IO[str]: Text stream that decompresses as it is read
+    """
+    module = COMPRESSED_FORMATS.get(path.suffix)
+    if module is None:
+        return open(path, "r", encoding="utf-8")
+    return module.open(path, "rt", encoding="utf-8")
+
+
+def iter_artifact(path: Path) -> Iterator[dict]:
+    """
+    Iterate over the test cases of a plain or compressed consolidated artifact.
+
+    Only one test case and one decompressed chunk are held in memory at a time.
+
+    Parameters:
+        path (Path): Path to a plain, gzip, or xz consolidated file
+
+    Yields:
+        dict: Test cases in file order
+
+    Raises:
+        NotAnArrayError: If the file does not hold a JSON array
+        ValueError: If a compressed file is corrupt or truncated
+    """
+    try:
+        with open_artifact(path) as f:
+            for _, test_case in iter_json_array(f):
+                yield test_case
+    except DECOMPRESSION_ERRORS as e:
+        raise ValueError(f"{path.name} could not be decompressed: {e}") from e
+
+
+def compress_artifact(path: Path) -> Dict[str, Path]:
+    """
+    Write gzip and xz copies of an artifact next to it.
+
+    The gzip header carries no file name or timestamp, so the same input always
+    produces the same bytes.
+
+    Parameters:
+        path (Path): Path to a plain JSON artifact
+
+    Returns:
+        Dict[str, Path]: Compressed file path by suffix (".gz", ".xz")
+    """
+    outputs = {}
+    for suffix in COMPRESSED_FORMATS:
+        output_path = path.with_name(path.name + suffix)
+        temp_path = output_path.with_name(output_path.name + ".tmp")
+        with open(path, "rb") as source, open(temp_path, "wb") as raw:
+            if suffix == ".gz":
+                with gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=9, mtime=0) as target:
+                    shutil.copyfileobj(source, target)
+            else:
+                with lzma.open(raw, "wb", preset=9) as target:
+                    shutil.copyfileobj(source, target)
+        temp_path.replace(output_path)
+        outputs[suffix] = output_path
+    return outputs
+
+
+def snapshot_path(path: Path) -> Path:
+    """Return the snapshot path of a consolidated file."""
+    return path.with_name(path.name + SNAPSHOT_SUFFIX)
+
+
+def snapshot_key(source: bytes) -> str:
+    """
+    Return the key a snapshot of the given source bytes must carry to be used.
+
+    Parameters:
+        source (bytes): Content of the consolidated JSON file
+
+    Returns:
+        str: Key combining the source hash, snapshot format, and interpreter
+    """
+    digest = hashlib.sha256(source).hexdigest()
+    return f"{SNAPSHOT_FORMAT}:{marshal.version}:{sys.version_info[0]}.{sys.version_info[1]}:{digest}"
+
+
+def read_snapshot(path: Path, key: str) -> Optional[List[dict]]:
+    """
+    Read a snapshot, returning None if it is missing, stale, or unreadable.
+
+    Parameters:
+        path (Path): Path to the snapshot file
+        key (str): Key the snapshot must carry
+
+    Returns:
+        Optional[List[dict]]: Test cases, or None if the snapshot cannot be used
+    """
+    try:
+        # marshal.load on a file object reads in tiny pieces, so read the whole file first
+        with open(path, "rb") as f:
+            stored_key, data = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return data if stored_key == key else None
+
+
+def write_snapshot(path: Path, key: str, data: List[dict]) -> bool:
+    """
+    Write a snapshot atomically, returning False if the directory is not writable.
+
+    Parameters:
+        path (Path): Path to the snapshot file
+        key (str): Key of the source the data was parsed from
+        data (List[dict]): Parsed test cases
+
+    Returns:
+        bool: Whether the snapshot was written
+    """
+    temp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(marshal.dumps((key, data)))
+        temp_path.replace(path)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def load_consolidated(path: Path, snapshot: bool = False) -> List[dict]:
+    """
+    Load a consolidated test file.
+
+    Compressed (.gz, .xz) files are decompressed transparently.
+
+    Parameters:
+        path (Path): Path to a consolidated JSON file
+        snapshot (bool): Load from, and refresh, the marshal snapshot next to the file
+
+    Returns:
+        List[dict]: Test cases in file order
+
+    Raises:
+        ValueError: If the file does not contain a list or a compressed file is corrupt or truncated
+    """
+    try:
+        if not snapshot:
+            with open_artifact(path) as f:
+                data = json.load(f)
+        else:
+            with open(path, "rb") as f:
+                source = f.read()
+            key = snapshot_key(source)
+            data = read_snapshot(snapshot_path(path), key)
+            if data is not None:
+                return data
+            module = COMPRESSED_FORMATS.get(path.suffix)
+            data = json.loads((module.decompress(source) if module else source).decode("utf-8"))
+            if isinstance(data, list):
+                write_snapshot(snapshot_path(path), key, data)
+    except DECOMPRESSION_ERRORS as e:
+        raise ValueError(f"{path.name} could not be decompressed: {e}") from e
+    if not isinstance(data, list):
+        raise ValueError(f"{path.name} does not contain a list")
+    return data
@@ -0,0 +1,158 @@
+"""
+Estimate how long validators take to run HED test cases.
+
+Costs are in abstract units roughly proportional to validation time. The
+estimate for a sub-test grows with its type's fixed setup cost, the number of
+event rows, the size of the sidecar, and the number of schema lines. Recorded
+timings, when available, replace the estimate for the tests they cover after
+being rescaled to the same units.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    from .corpus import iter_subtests
+except ImportError:
+    from corpus import iter_subtests
+
+# Fixed cost of setting up a test case (schema lookup and definitions)
+CASE_OVERHEAD = 1.0
+
+# Fixed cost of a single sub-test by test type
+SUBTEST_BASE_COST = {
+    "string_tests": 1.0,
+    "sidecar_tests": 2.0,
+    "event_tests": 2.0,
+    "combo_tests": 3.0,
+    "schema_tests": 5.0,
+}
+
+# Cost per event row (excluding the header), per serialized sidecar character,
+# per HED string character, and per schema line
+ROW_COST = 0.5
+SIDECAR_CHAR_COST = 1 / 200
+STRING_CHAR_COST = 1 / 400
+SCHEMA_LINE_COST = 0.05
+
+
+def _sidecar_size(sidecar: Any) -> int:
+    """Return the compact serialized size of a sidecar."""
+    return len(json.dumps(sidecar, separators=(",", ":")))
+
+
+def _event_rows(events: Any) -> int:
+    """Return the number of data rows in an events table whose first row is the header."""
+    return max(len(events) - 1, 0) if isinstance(events, list) else 0
+
+
+def estimate_subtest_cost(test_type: str, payload: Any) -> float:
+    """
+    Estimate the cost of a single sub-test.
+
+    Parameters:
+        test_type (str): Test type such as "combo_tests"
+        payload (Any): The sub-test input (string, sidecar, events, or schema lines)
+
+    Returns:
+        float: Estimated cost in abstract units
+    """
+    cost = SUBTEST_BASE_COST.get(test_type, 1.0)
+    if test_type == "string_tests" and isinstance(payload, str):
+        cost += len(payload) * STRING_CHAR_COST
+    elif test_type == "sidecar_tests":
+        cost += _sidecar_size(payload) * SIDECAR_CHAR_COST
+    elif test_type == "event_tests":
+        cost += _event_rows(payload) * ROW_COST
+    elif test_type == "combo_tests" and isinstance(payload, dict):
+        cost += _sidecar_size(payload.get("sidecar", {})) * SIDECAR_CHAR_COST
+        cost += _event_rows(payload.get("events", [])) * ROW_COST
+    elif test_type == "schema_tests" and isinstance(payload, list):
+        cost += len(payload) * SCHEMA_LINE_COST
+    return cost
+
+
+def estimate_case_cost(test_case: dict) -> float:
+    """
+    Estimate the cost of running every sub-test of a test case.
+
+    Parameters:
+        test_case (dict): Test case data
+
+    Returns:
+        float: Estimated cost in abstract units
+    """
+    cost = CASE_OVERHEAD
+    for test_type, _, _, payload in iter_subtests(test_case):
+        cost += estimate_subtest_cost(test_type, payload)
+    return cost
+
+
+def load_timings(path: Path) -> Dict[str, float]:
+    """
+    Load recorded timings.
+
+    The file is a JSON object mapping a test key (usually a test case name)
+    to the measured run time in seconds.
+
+    Parameters:
+        path (Path): Path to the timings file
+
+    Returns:
+        Dict[str, float]: Seconds by test key
+
+    Raises:
+        ValueError: If the file is not a JSON object of numbers
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path.name} must contain a JSON object of timings")
+    try:
+        return {str(key): float(value) for key, value in data.items()}
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{path.name} contains a non-numeric timing: {e}") from e
+
+
+def units_per_second(estimates: Dict[str, float], timings: Dict[str, float]) -> Optional[float]:
+    """
+    Return the ratio of estimated cost to recorded time over tests that have both.
+
+    Parameters:
+        estimates (Dict[str, float]): Estimated cost by test key
+        timings (Dict[str, float]): Recorded seconds by test key
+
+    Returns:
+        Optional[float]: Estimate units per second, or None if no test has a usable timing
+    """
+    timed = [key for key in estimates if timings.get(key, 0) > 0]
+    total_time = sum(timings[key] for key in timed)
+    if not timed or total_time <= 0:
+        return None
+    return sum(estimates[key] for key in timed) / total_time
+
+
+def calibrate_costs(estimates: Dict[str, float], timings: Dict[str, float]) -> Dict[str, float]:
+    """
+    Replace estimates with recorded timings, rescaled to estimate units.
+
+    The scale is the ratio of estimated cost to recorded time over the tests
+    that have both, so tests without timings remain comparable.
+
+    Parameters:
+        estimates (Dict[str, float]): Estimated cost by test key
+        timings (Dict[str, float]): Recorded seconds by test key
+
+    Returns:
+        Dict[str, float]: Calibrated cost by test key
+    """
+    scale = units_per_second(estimates, timings)
+    calibrated = dict(estimates)
+    if scale is None:
+        return calibrated
+
+    for key in estimates:
+        if timings.get(key, 0) > 0:
+            calibrated[key] = timings[key] * scale
+    return calibrated
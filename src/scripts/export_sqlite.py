@@ -0,0 +1,302 @@
+"""
+Export the HED test suite to a SQLite database for ad-hoc analysis.
+
+The database has normalized, indexed tables for test cases, alternative
+codes, schema versions, definitions, and individual sub-test payloads, so
+coverage questions become SQL queries instead of repeated JSON parsing.
+Harness results can be imported alongside the corpus to study validator
+disagreements. The tables, rows (written with executemany), and indexes
+(built after loading) are created in one transaction. A full export is built
+in <output>.tmp and replaces the output only after that transaction commits,
+so a failed export leaves the previous database as it was; --results-only
+imports into the existing database and rolls back on failure.
+
+Harness results use the same record format as schedule_tests.py:
+name, test_type, outcome, index, passed, seconds, and optionally validator.
+
+Usage:
+    python src/scripts/export_sqlite.py
+    python src/scripts/export_sqlite.py --output hed_tests.db --results results.jsonl
+    python src/scripts/export_sqlite.py --output hed_tests.db --results-only --results more_results.jsonl
+
+Example queries:
+    SELECT kind, outcome, COUNT(*) FROM subtests GROUP BY kind, outcome;
+    SELECT * FROM coverage WHERE error_code = 'TAG_INVALID';
+    SELECT * FROM disagreements WHERE validator = 'hed-python';
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, List
+
+try:
+    from .corpus import CONSOLIDATED_FILES, iter_subtests, kind_name, load_consolidated
+    from .schedule_tests import read_results
+except ImportError:
+    from corpus import CONSOLIDATED_FILES, iter_subtests, kind_name, load_consolidated
+    from schedule_tests import read_results
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS test_cases (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    error_code TEXT NOT NULL,
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    description TEXT,
+    warning INTEGER NOT NULL,
+    error_category TEXT
+);
+CREATE TABLE IF NOT EXISTS alt_codes (
+    case_id INTEGER NOT NULL REFERENCES test_cases(id),
+    code TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS schema_versions (
+    case_id INTEGER NOT NULL REFERENCES test_cases(id),
+    version TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS definitions (
+    case_id INTEGER NOT NULL REFERENCES test_cases(id),
+    position INTEGER NOT NULL,
+    definition TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS subtests (
+    id INTEGER PRIMARY KEY,
+    case_id INTEGER NOT NULL REFERENCES test_cases(id),
+    kind TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    imported REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    validator TEXT,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    seconds REAL
+);
+CREATE VIEW IF NOT EXISTS coverage AS
+    SELECT c.error_code, s.kind, s.outcome, COUNT(*) AS subtests, COUNT(DISTINCT c.id) AS test_cases
+    FROM test_cases c JOIN subtests s ON s.case_id = c.id
+    GROUP BY c.error_code, s.kind, s.outcome;
+CREATE VIEW IF NOT EXISTS disagreements AS
+    SELECT r.run_id, r.validator, c.error_code, r.name, r.kind, r.outcome, r.position
+    FROM results r JOIN test_cases c ON c.name = r.name
+    WHERE r.passed = 0;
+"""
+
+INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_test_cases_code ON test_cases(error_code);
+CREATE INDEX IF NOT EXISTS idx_test_cases_name ON test_cases(name);
+CREATE INDEX IF NOT EXISTS idx_alt_codes_code ON alt_codes(code);
+CREATE INDEX IF NOT EXISTS idx_alt_codes_case ON alt_codes(case_id);
+CREATE INDEX IF NOT EXISTS idx_schema_versions_version ON schema_versions(version);
+CREATE INDEX IF NOT EXISTS idx_schema_versions_case ON schema_versions(case_id);
+CREATE INDEX IF NOT EXISTS idx_definitions_case ON definitions(case_id);
+CREATE INDEX IF NOT EXISTS idx_subtests_kind ON subtests(kind, outcome);
+CREATE INDEX IF NOT EXISTS idx_subtests_case ON subtests(case_id);
+CREATE INDEX IF NOT EXISTS idx_results_subtest ON results(name, kind, outcome, position);
+CREATE INDEX IF NOT EXISTS idx_results_passed ON results(passed, validator);
+"""
+
+
+# Reused encoder; json.dumps builds a new one per call when separators are given
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def execute_script(connection: sqlite3.Connection, script: str):
+    """
+    Run each statement of a SQL script in the current transaction.
+
+    Unlike executescript, which first commits any open transaction, this keeps
+    the statements in the caller's transaction.
+
+    Parameters:
+        connection (sqlite3.Connection): Open database connection
+        script (str): Statements separated by semicolons
+    """
+    for statement in script.split(";"):
+        if statement.strip():
+            connection.execute(statement)
+
+
+def _schema_list(schema) -> List[str]:
+    """Return a test case's schema field as a list of versions."""
+    if isinstance(schema, list):
+        return [str(version) for version in schema]
+    return [schema] if schema else []
+
+
+def _payload_text(payload) -> str:
+    """Store HED strings as-is and structured payloads as compact JSON."""
+    return payload if isinstance(payload, str) else _COMPACT_ENCODER.encode(payload)
+
+
+def export_corpus(connection: sqlite3.Connection, corpora: Iterable[tuple]) -> int:
+    """
+    Write test cases and their parts to the database.
+
+    Parameters:
+        connection (sqlite3.Connection): Open database connection inside a transaction
+        corpora (Iterable[tuple]): (category, test cases) pairs, e.g. ("validation", [...])
+
+    Returns:
+        int: Number of test cases written
+    """
+    cases, alt_codes, versions, definitions, subtests = [], [], [], [], []
+    case_id = 0
+    subtest_id = 0
+    for category, test_cases in corpora:
+        for position, test_case in enumerate(test_cases):
+            case_id += 1
+            cases.append(
+                (
+                    case_id,
+                    test_case.get("name", ""),
+                    test_case.get("error_code", "UNKNOWN"),
+                    category,
+                    position,
+                    test_case.get("description", ""),
+                    int(bool(test_case.get("warning", False))),
+                    test_case.get("error_category"),
+                )
+            )
+            alt_codes.extend((case_id, code) for code in test_case.get("alt_codes", []) or [])
+            versions.extend((case_id, version) for version in _schema_list(test_case.get("schema", "")))
+            definitions.extend((case_id, i, d) for i, d in enumerate(test_case.get("definitions", []) or []))
+            for test_type, outcome, index, payload in iter_subtests(test_case):
+                subtest_id += 1
+                subtests.append((subtest_id, case_id, kind_name(test_type), outcome, index, _payload_text(payload)))
+
+    connection.executemany("INSERT INTO test_cases VALUES (?, ?, ?, ?, ?, ?, ?, ?)", cases)
+    connection.executemany("INSERT INTO alt_codes VALUES (?, ?)", alt_codes)
+    connection.executemany("INSERT INTO schema_versions VALUES (?, ?)", versions)
+    connection.executemany("INSERT INTO definitions VALUES (?, ?, ?)", definitions)
+    connection.executemany("INSERT INTO subtests VALUES (?, ?, ?, ?, ?, ?)", subtests)
+    return case_id
+
+
+def import_results(connection: sqlite3.Connection, results: List[dict], source: str) -> int:
+    """
+    Add one harness run to the database.
+
+    Parameters:
+        connection (sqlite3.Connection): Open database connection inside a transaction
+        results (List[dict]): Harness result records
+        source (str): Description of where the results came from (usually the file name)
+
+    Returns:
+        int: Number of results written
+    """
+    cursor = connection.execute("INSERT INTO runs (source, imported) VALUES (?, ?)", (source, time.time()))
+    run_id = cursor.lastrowid
+    rows = [
+        (
+            run_id,
+            result.get("validator"),
+            result["name"],
+            kind_name(result["test_type"]),
+            result["outcome"],
+            int(result["index"]),
+            int(bool(result.get("passed", True))),
+            result.get("seconds"),
+        )
+        for result in results
+    ]
+    connection.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function to export the corpus to SQLite.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Export the HED test suite to a SQLite database")
+    parser.add_argument("--output", type=str, default="hed_tests.db", help="Database path (default: hed_tests.db)")
+    parser.add_argument("--results", type=str, nargs="+", default=[], help="Harness result files to import")
+    parser.add_argument("--results-only", action="store_true", help="Keep the existing corpus tables and only import results")
+    args = parser.parse_args(arg_list)
+
+    # Get paths
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+    json_test_data_dir = project_root / "json_test_data"
+    output_path = project_root / args.output
+
+    start = time.perf_counter()
+    corpora = []
+    if not args.results_only:
+        for file_name in CONSOLIDATED_FILES:
+            try:
+                corpora.append((file_name.split("_")[0], load_consolidated(json_test_data_dir / file_name, snapshot=True)))
+            except (OSError, ValueError) as e:
+                print(f"ERROR: Failed to load {file_name}: {e}")
+                return 1
+    elif not output_path.exists():
+        print(f"ERROR: Database not found: {output_path}")
+        return 1
+
+    results = []
+    for results_file in args.results:
+        try:
+            results.append((Path(results_file).name, read_results(Path(results_file))))
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Failed to read results {results_file}: {e}")
+            return 1
+
+    # A full export is built next to the output and replaces it only once committed
+    build_path = output_path if args.results_only else output_path.with_name(output_path.name + ".tmp")
+    if build_path != output_path:
+        build_path.unlink(missing_ok=True)
+
+    failed = False
+    # isolation_level=None leaves the transaction to the explicit BEGIN and COMMIT
+    connection = sqlite3.connect(build_path, isolation_level=None)
+    try:
+        connection.execute("BEGIN")
+        execute_script(connection, SCHEMA_SQL)
+        if corpora:
+            count = export_corpus(connection, corpora)
+            print(f"Exported {count} test cases")
+        for source, records in results:
+            count = import_results(connection, records, source)
+            print(f"Imported {count} results from {source}")
+        execute_script(connection, INDEX_SQL)
+        connection.execute("COMMIT")
+    except (sqlite3.Error, KeyError, ValueError, TypeError) as e:
+        if connection.in_transaction:
+            connection.rollback()
+        print(f"ERROR: Export failed: {e}")
+        failed = True
+    finally:
+        connection.close()
+
+    if build_path != output_path:
+        if failed:
+            build_path.unlink(missing_ok=True)
+        else:
+            build_path.replace(output_path)
+    if failed:
+        return 1
+
+    print(f"Database written to: {output_path} ({time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
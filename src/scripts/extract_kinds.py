@@ -0,0 +1,263 @@
+"""
+Write flat per-kind extracts of the HED test suite.
+
+A validator that only implements one kind of validation should not have to
+parse nested test cases to reach its inputs. This script writes one flat file
+per sub-test kind, each readable a line at a time:
+
+    strings.tsv    One string sub-test per line
+    sidecars.jsonl One sidecar sub-test per line
+    combos.jsonl   One combo (sidecar plus events) sub-test per line
+    events.tsv     One event sub-test per line, naming its file in events/
+    events/        One real BIDS-style .tsv events file per event sub-test
+
+Every record carries the test name, schema versions, expected outcome, the
+sub-test index within that outcome, the accepted error codes, and the test
+definitions, so harness results can be reported in the format read by
+schedule_tests.py. Tab, newline, carriage return, and backslash characters
+in strings.tsv and events.tsv fields are escaped as \\t, \\n, \\r, and \\\\.
+List-valued TSV fields (schema, codes) are comma-separated and definitions
+are compact JSON.
+
+The files in events/ are real BIDS events files, which have no escapes, so
+their values are written unchanged. An event sub-test with a value containing
+a tab, newline, or carriage return cannot be written as a BIDS file; it is
+reported and left out.
+
+Usage:
+    python src/scripts/extract_kinds.py
+    python src/scripts/extract_kinds.py --output-dir extracts
+    python src/scripts/extract_kinds.py --input json_test_data/validation_tests.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+try:
+    from .corpus import iter_subtests, kind_name, load_consolidated
+except ImportError:
+    from corpus import iter_subtests, kind_name, load_consolidated
+
+STRING_COLUMNS = ["name", "schema", "outcome", "index", "codes", "definitions", "hed"]
+EVENT_COLUMNS = ["file", "name", "schema", "outcome", "index", "codes", "definitions"]
+
+_ESCAPES = {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"}
+_UNESCAPES = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r"}
+# Characters a BIDS TSV value cannot contain
+_BIDS_SEPARATORS = ("\t", "\n", "\r")
+
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def escape_field(value) -> str:
+    """Return a value as a single-line TSV field."""
+    text = value if isinstance(value, str) else str(value)
+    if any(ch in text for ch in _ESCAPES):
+        text = "".join(_ESCAPES.get(ch, ch) for ch in text)
+    return text
+
+
+def unescape_field(text: str) -> str:
+    """Reverse escape_field."""
+    if "\\" not in text:
+        return text
+    chars = []
+    i = 0
+    while i < len(text):
+        if text[i] == "\\" and i + 1 < len(text):
+            chars.append(_UNESCAPES.get(text[i + 1], text[i + 1]))
+            i += 2
+        else:
+            chars.append(text[i])
+            i += 1
+    return "".join(chars)
+
+
+def events_file_text(rows: List[list]) -> str:
+    """
+    Return the content of a BIDS events.tsv file with every value written unchanged.
+
+    Parameters:
+        rows (List[list]): Events table, header row first
+
+    Returns:
+        str: Tab-separated file content
+
+    Raises:
+        ValueError: If a value contains a tab, newline, or carriage return
+    """
+    lines = []
+    for row_number, row in enumerate(rows):
+        values = [value if isinstance(value, str) else str(value) for value in row]
+        for value in values:
+            if any(ch in value for ch in _BIDS_SEPARATORS):
+                raise ValueError(f"row {row_number} value {value!r} contains a tab or line break")
+        lines.append("\t".join(values) + "\n")
+    return "".join(lines)
+
+
+def read_tsv_records(path: Path) -> Iterator[Dict[str, str]]:
+    """
+    Read an extract TSV file one record at a time.
+
+    Parameters:
+        path (Path): Path to strings.tsv or events.tsv
+
+    Yields:
+        Dict[str, str]: Unescaped fields keyed by column name
+    """
+    with open(path, "r", encoding="utf-8", newline="\n") as f:
+        columns = f.readline().rstrip("\n").split("\t")
+        for line in f:
+            values = line.rstrip("\n").split("\t")
+            yield dict(zip(columns, (unescape_field(value) for value in values), strict=True))
+
+
+def _schema_field(schema) -> List[str]:
+    """Return a test case's schema field as a list of versions."""
+    if isinstance(schema, list):
+        return [str(version) for version in schema]
+    return [schema] if schema else []
+
+
+def _case_fields(test_case: dict) -> dict:
+    """Return the fields every record of a test case shares."""
+    return {
+        "name": test_case.get("name", ""),
+        "schema": _schema_field(test_case.get("schema", "")),
+        "codes": [test_case.get("error_code", "UNKNOWN")] + list(test_case.get("alt_codes", []) or []),
+        "definitions": list(test_case.get("definitions", []) or []),
+    }
+
+
+def _tsv_line(values: List) -> str:
+    """Join escaped values into one TSV line."""
+    return "\t".join(escape_field(value) for value in values) + "\n"
+
+
+def _shared_tsv_values(fields: dict, outcome: str, index: int) -> List:
+    """Return the name, schema, outcome, index, codes, and definitions columns."""
+    return [
+        fields["name"],
+        ",".join(fields["schema"]),
+        outcome,
+        index,
+        ",".join(fields["codes"]),
+        _COMPACT_ENCODER.encode(fields["definitions"]),
+    ]
+
+
+def event_file_name(name: str, outcome: str, index: int) -> str:
+    """Return the events/ file name of an event sub-test."""
+    return f"{name}_{outcome}_{index}_events.tsv"
+
+
+def extract_kinds(corpora: List[List[dict]], output_dir: Path) -> Dict[str, int]:
+    """
+    Write the per-kind extracts of one or more consolidated test lists.
+
+    Parameters:
+        corpora (List[List[dict]]): Test cases of each consolidated file
+        output_dir (Path): Directory to write the extracts to
+
+    Returns:
+        Dict[str, int]: Number of records written for each kind
+    """
+    events_dir = output_dir / "events"
+    events_dir.mkdir(parents=True, exist_ok=True)
+    # Event files are named after tests, so clear files left by renamed or deleted tests
+    for stale in events_dir.glob("*_events.tsv"):
+        stale.unlink()
+
+    counts = {"string": 0, "sidecar": 0, "combo": 0, "event": 0, "rejected": 0}
+    with (
+        open(output_dir / "strings.tsv", "w", encoding="utf-8", newline="\n") as strings,
+        open(output_dir / "sidecars.jsonl", "w", encoding="utf-8", newline="\n") as sidecars,
+        open(output_dir / "combos.jsonl", "w", encoding="utf-8", newline="\n") as combos,
+        open(output_dir / "events.tsv", "w", encoding="utf-8", newline="\n") as events,
+    ):
+        strings.write("\t".join(STRING_COLUMNS) + "\n")
+        events.write("\t".join(EVENT_COLUMNS) + "\n")
+        for test_cases in corpora:
+            for test_case in test_cases:
+                fields = _case_fields(test_case)
+                for test_type, outcome, index, payload in iter_subtests(test_case):
+                    kind = kind_name(test_type)
+                    if kind == "string":
+                        strings.write(_tsv_line(_shared_tsv_values(fields, outcome, index) + [payload]))
+                    elif kind in ("sidecar", "combo"):
+                        record = {**fields, "outcome": outcome, "index": index}
+                        if kind == "sidecar":
+                            record["sidecar"] = payload
+                            sidecars.write(json.dumps(record) + "\n")
+                        else:
+                            record["sidecar"] = payload.get("sidecar", {})
+                            record["events"] = payload.get("events", [])
+                            combos.write(json.dumps(record) + "\n")
+                    elif kind == "event":
+                        try:
+                            content = events_file_text(payload)
+                        except ValueError as e:
+                            print(f"WARNING: Not writing event sub-test {fields['name']} {outcome} {index}: {e}")
+                            counts["rejected"] += 1
+                            continue
+                        file_name = event_file_name(fields["name"], outcome, index)
+                        with open(events_dir / file_name, "w", encoding="utf-8", newline="\n") as f:
+                            f.write(content)
+                        events.write(_tsv_line([f"events/{file_name}"] + _shared_tsv_values(fields, outcome, index)))
+                    else:
+                        continue
+                    counts[kind] += 1
+    return counts
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function to write the per-kind extracts.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Write flat per-kind extracts of the HED test suite")
+    parser.add_argument(
+        "--input",
+        type=str,
+        nargs="+",
+        help="Consolidated test files (default: json_test_data/validation_tests.json)",
+    )
+    parser.add_argument("--output-dir", type=str, default="extracts", help="Directory for extracts (default: extracts)")
+    args = parser.parse_args(arg_list)
+
+    # Get paths
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+    if args.input:
+        input_paths = [Path(path) for path in args.input]
+    else:
+        input_paths = [project_root / "json_test_data" / "validation_tests.json"]
+    output_dir = project_root / args.output_dir
+
+    corpora = []
+    for input_path in input_paths:
+        try:
+            corpora.append(load_consolidated(input_path, snapshot=True))
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Failed to load {input_path}: {e}")
+            return 1
+
+    counts = extract_kinds(corpora, output_dir)
+    print(f"Extracts written to: {output_dir}")
+    print(f"  strings.tsv: {counts['string']} string sub-tests")
+    print(f"  sidecars.jsonl: {counts['sidecar']} sidecar sub-tests")
+    print(f"  combos.jsonl: {counts['combo']} combo sub-tests")
+    print(f"  events.tsv: {counts['event']} event sub-tests (files in events/)")
+    if counts["rejected"]:
+        print(f"  Not written: {counts['rejected']} event sub-tests with values that cannot be stored in a BIDS TSV file")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
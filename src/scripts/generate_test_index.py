@@ -3,16 +3,29 @@ Generate comprehensive index of all HED test cases.
 
 This script creates a searchable index of all test cases in the suite,
 organized by error code, with links to test files and detailed metadata.
+With --pages, the markdown index is written as one page per error code plus a
+navigation page, and only the pages whose content changed are rewritten.
 
 Usage:
     python src/scripts/generate_test_index.py
     python src/scripts/generate_test_index.py --output docs/test_index.md
     python src/scripts/generate_test_index.py --format json
+    python src/scripts/generate_test_index.py --pages docs/test_index --workers 4
 """
 
 import argparse
 import json
+from collections import Counter
+from itertools import groupby
 from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+try:
+    from .hooks import HOOKS, start_span
+    from .paged_markdown import format_page_summary, page_name, write_pages
+except ImportError:
+    from hooks import HOOKS, start_span
+    from paged_markdown import format_page_summary, page_name, write_pages
 
 
 class TestIndexGenerator:
@@ -40,7 +53,10 @@ class TestIndexGenerator:
         if schema_dir.exists():
             self._process_directory(schema_dir, "schema")
 
-        # Sort by error code then by name
+        self.sort_index()
+
+    def sort_index(self):
+        """Sort the index by error code then by name."""
         self.index_data.sort(key=lambda x: (x["error_code"], x["name"]))
 
     def _process_directory(self, directory: Path, category: str):
@@ -60,20 +76,22 @@ class TestIndexGenerator:
                     continue
 
                 for test_case in test_data:
-                    self._process_test_case(test_case, test_file, category)
+                    self.add_test_case(test_case, test_file, category)
 
             except Exception as e:
                 print(f"ERROR: Failed to process {test_file.name}: {e}")
 
-    def _process_test_case(self, test_case: dict, test_file: Path, category: str):
+    def add_test_case(self, test_case: dict, test_file: Path, category: str):
         """
-        Process a single test case.
+        Add a single test case to the index.
 
         Parameters:
             test_case (dict): Test case data
             test_file (Path): Source file
             category (str): Test category
         """
+        span = start_span("index.case", name=test_case.get("name"), error_code=test_case.get("error_code")) if HOOKS else None
+
         # Extract test counts
         tests = test_case.get("tests", {})
         test_counts = {}
@@ -99,6 +117,8 @@ class TestIndexGenerator:
         }
 
         self.index_data.append(entry)
+        if span:
+            span.end()
 
     def generate_markdown(self, output_file: Path):
         """
@@ -118,8 +138,9 @@ class TestIndexGenerator:
 
         # Create navigation links by error code
         error_codes = sorted({entry["error_code"] for entry in self.index_data})
+        counts = Counter(entry["error_code"] for entry in self.index_data)
         for error_code in error_codes:
-            count = sum(1 for e in self.index_data if e["error_code"] == error_code)
+            count = counts[error_code]
             lines.append(f"- [{error_code}](#{error_code.lower().replace('_', '-')}) ({count} tests)")
 
         lines.append("")
@@ -142,40 +163,7 @@ class TestIndexGenerator:
                     ]
                 )
 
-            # Test case entry
-            warning_badge = " ⚠️ Warning" if entry["warning"] else ""
-            ai_badge = " 🤖 AI" if entry["has_ai_metadata"] else ""
-            examples_badge = " 📝 Examples" if entry["has_correction_examples"] else ""
-
-            lines.extend(
-                [
-                    f"### {entry['name']}{warning_badge}{ai_badge}{examples_badge}",
-                    "",
-                    f"**Description**: {entry['description']}",
-                    "",
-                ]
-            )
-
-            # Schema version
-            schema = entry["schema"]
-            if isinstance(schema, list):
-                schema_str = ", ".join(schema)
-            else:
-                schema_str = schema or "any"
-            lines.append(f"**Schema**: {schema_str}")
-
-            # Error category
-            if entry["error_category"]:
-                lines.append(f"**Category**: {entry['error_category']}")
-
-            # Test counts
-            if entry["test_counts"]:
-                lines.append("")
-                lines.append("**Tests**:")
-                for test_type, counts in entry["test_counts"].items():
-                    lines.append(f"- `{test_type}`: {counts['fail']} fail, {counts['pass']} pass")
-
-            lines.append("")
+            lines.extend(entry_lines(entry))
 
         # Write to file
         output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -184,6 +172,26 @@ class TestIndexGenerator:
 
         print(f"✅ Markdown index written to: {output_file}")
 
+    def generate_pages(self, output_dir: Path, workers: int = 1) -> Dict[str, List[str]]:
+        """
+        Generate a paged markdown index with one page per error code.
+
+        Parameters:
+            output_dir (Path): Directory for index.md and the error code pages
+            workers (int): Number of processes that render and write pages
+
+        Returns:
+            Dict[str, List[str]]: Page file names that were "written", "unchanged", and "removed"
+        """
+        # index_data is sorted by error code, so each code is one run of entries
+        groups = [(code, list(entries)) for code, entries in groupby(self.index_data, key=lambda e: e["error_code"])]
+        pages = [("index.md", render_navigation_page, [(code, len(entries)) for code, entries in groups])]
+        pages.extend((page_name(code), render_code_page, (code, entries)) for code, entries in groups)
+        result = write_pages(output_dir, pages, workers=workers)
+
+        print(f"✅ Paged index: {format_page_summary(output_dir, result)}")
+        return result
+
     def generate_json(self, output_file: Path):
         """
         Generate JSON index.
@@ -198,15 +206,110 @@ class TestIndexGenerator:
         print(f"✅ JSON index written to: {output_file}")
 
 
-def main():
-    """Main function."""
+def entry_lines(entry: dict) -> List[str]:
+    """
+    Return the markdown lines of one index entry.
+
+    Parameters:
+        entry (dict): Index entry
+
+    Returns:
+        List[str]: Lines of the entry, ending with a blank line
+    """
+    warning_badge = " ⚠️ Warning" if entry["warning"] else ""
+    ai_badge = " 🤖 AI" if entry["has_ai_metadata"] else ""
+    examples_badge = " 📝 Examples" if entry["has_correction_examples"] else ""
+
+    lines = [
+        f"### {entry['name']}{warning_badge}{ai_badge}{examples_badge}",
+        "",
+        f"**Description**: {entry['description']}",
+        "",
+    ]
+
+    # Schema version
+    schema = entry["schema"]
+    if isinstance(schema, list):
+        schema_str = ", ".join(schema)
+    else:
+        schema_str = schema or "any"
+    lines.append(f"**Schema**: {schema_str}")
+
+    # Error category
+    if entry["error_category"]:
+        lines.append(f"**Category**: {entry['error_category']}")
+
+    # Test counts
+    if entry["test_counts"]:
+        lines.append("")
+        lines.append("**Tests**:")
+        for test_type, counts in entry["test_counts"].items():
+            lines.append(f"- `{test_type}`: {counts['fail']} fail, {counts['pass']} pass")
+
+    lines.append("")
+    return lines
+
+
+def render_code_page(group: Tuple[str, List[dict]]) -> Iterator[str]:
+    """
+    Render the index page of one error code.
+
+    Parameters:
+        group (Tuple[str, List[dict]]): (error code, its index entries sorted by name)
+
+    Yields:
+        str: Lines of the page
+    """
+    error_code, entries = group
+    files = sorted({f"json_test_data/{entry['category']}_tests/{entry['file']}" for entry in entries})
+    yield f"# {error_code}"
+    yield ""
+    yield f"[Test index](index.md) | {len(entries)} test cases in " + ", ".join(f"`{file}`" for file in files)
+    yield ""
+    for entry in entries:
+        yield from entry_lines(entry)
+
+
+def render_navigation_page(counts: List[Tuple[str, int]]) -> Iterator[str]:
+    """
+    Render the navigation page of a paged index.
+
+    Parameters:
+        counts (List[Tuple[str, int]]): (error code, number of test cases) sorted by error code
+
+    Yields:
+        str: Lines of the page
+    """
+    yield "# HED Test Suite Index"
+    yield ""
+    yield f"Complete index of {sum(count for _, count in counts)} test cases in the HED test suite."
+    yield ""
+    for error_code, count in counts:
+        yield f"- [{error_code}]({page_name(error_code)}) ({count} tests)"
+    yield ""
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
     parser = argparse.ArgumentParser(description="Generate HED test suite index")
     parser.add_argument(
         "--output", type=str, default="docs/test_index.md", help="Output file path (default: docs/test_index.md)"
     )
     parser.add_argument("--format", choices=["markdown", "json"], default="markdown", help="Output format (default: markdown)")
+    parser.add_argument(
+        "--pages",
+        type=str,
+        help="Write one markdown page per error code plus index.md into this directory instead of --output",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Number of processes that render and write pages (default: 1)")
 
-    args = parser.parse_args()
+    args = parser.parse_args(arg_list)
 
     # Get paths
     script_dir = Path(__file__).parent
@@ -227,7 +330,9 @@ def main():
     # Generate output
     output_path = project_root / args.output
 
-    if args.format == "markdown":
+    if args.pages:
+        generator.generate_pages(project_root / args.pages, workers=args.workers)
+    elif args.format == "markdown":
         generator.generate_markdown(output_path)
     else:
         generator.generate_json(output_path)
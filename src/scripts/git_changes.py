@@ -0,0 +1,172 @@
+"""
+List HED test files changed since a git reference.
+
+This module asks the local git repository which files under json_test_data/
+were modified, added, or deleted since a reference (branch, tag, or commit),
+including uncommitted and untracked changes in the working tree. It also
+reports whether the test schema or the scripts themselves changed, in which
+case incremental processing is not safe and callers should do a full run.
+
+Usage:
+    from git_changes import get_changes
+
+    changes = get_changes(project_root, "origin/main")
+    if changes.requires_full_run:
+        ...
+"""
+
+import copy
+import subprocess
+from pathlib import Path
+from typing import List
+
+# Source directories whose changes invalidate incremental processing
+FULL_RUN_PATHS = ["src/schemas", "src/scripts"]
+
+TEST_DATA_PATHS = ["json_test_data/validation_tests", "json_test_data/schema_tests"]
+
+
+class GitError(RuntimeError):
+    """Raised when a git command fails or git is not available."""
+
+
+def run_git(project_root: Path, args: List[str]) -> str:
+    """
+    Run a git command in the project root and return its standard output.
+
+    Parameters:
+        project_root (Path): Directory to run git in
+        args (List[str]): Arguments passed to git
+
+    Returns:
+        str: Standard output of the command
+
+    Raises:
+        GitError: If git is missing or the command fails
+    """
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=project_root, capture_output=True, text=True, encoding="utf-8", check=False
+        )
+    except OSError as e:
+        raise GitError(f"Could not run git: {e}") from e
+
+    if result.returncode != 0:
+        raise GitError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+class ChangeSet:
+    """Test files changed between a git reference and the working tree."""
+
+    def __init__(self, project_root: Path, since: str):
+        """
+        Initialize an empty change set.
+
+        Parameters:
+            project_root (Path): Root of the hed-tests repository
+            since (str): Git reference the changes are relative to
+        """
+        self.project_root = project_root
+        self.since = since
+        self.modified: List[Path] = []
+        self.added: List[Path] = []
+        self.deleted: List[Path] = []
+        # Changed schema or script files that force a full run
+        self.full_run_reasons: List[str] = []
+
+    @property
+    def changed(self) -> List[Path]:
+        """Modified and added test files, sorted by path."""
+        return sorted(self.modified + self.added)
+
+    @property
+    def requires_full_run(self) -> bool:
+        """Whether the schema or scripts changed, so every file must be processed."""
+        return bool(self.full_run_reasons)
+
+    def in_directory(self, directory: Path) -> "ChangeSet":
+        """
+        Restrict the change set to test files in one directory.
+
+        Parameters:
+            directory (Path): Directory containing test files
+
+        Returns:
+            ChangeSet: New change set with the same full-run reasons
+        """
+        directory = directory.resolve()
+        subset = copy.copy(self)
+        subset.modified = [p for p in self.modified if p.parent.resolve() == directory]
+        subset.added = [p for p in self.added if p.parent.resolve() == directory]
+        subset.deleted = [p for p in self.deleted if p.parent.resolve() == directory]
+        subset.full_run_reasons = list(self.full_run_reasons)
+        return subset
+
+    def read_at_ref(self, path: Path) -> str:
+        """
+        Read a file's content as of the reference.
+
+        Parameters:
+            path (Path): Path of the file in the working tree
+
+        Returns:
+            str: File content at the reference
+
+        Raises:
+            GitError: If the file does not exist at the reference
+        """
+        rel_path = path.relative_to(self.project_root).as_posix()
+        return run_git(self.project_root, ["show", f"{self.since}:./{rel_path}"])
+
+
+def get_changes(project_root: Path, since: str) -> ChangeSet:
+    """
+    Collect test files changed since a git reference.
+
+    Committed, staged, unstaged, and untracked changes are all included.
+    Renames are reported as a deletion plus an addition.
+
+    Parameters:
+        project_root (Path): Root of the hed-tests repository
+        since (str): Git reference such as a branch, tag, or commit
+
+    Returns:
+        ChangeSet: The changed test files
+
+    Raises:
+        GitError: If the reference is unknown or git cannot be run
+    """
+    changes = ChangeSet(project_root, since)
+    paths = TEST_DATA_PATHS + FULL_RUN_PATHS
+
+    # Verify the reference first so a typo gives a clear message
+    try:
+        run_git(project_root, ["rev-parse", "--verify", "--quiet", f"{since}^{{commit}}"])
+    except GitError as e:
+        raise GitError(f"Unknown git reference: {since}") from e
+
+    entries = []
+    diff = run_git(project_root, ["diff", "--name-status", "--no-renames", "--relative", since, "--", *paths])
+    for line in diff.splitlines():
+        status, _, rel_path = line.partition("\t")
+        entries.append((status[:1], rel_path))
+    untracked = run_git(project_root, ["ls-files", "--others", "--exclude-standard", "--", *paths])
+    entries.extend(("A", rel_path) for rel_path in untracked.splitlines())
+
+    for status, rel_path in sorted(entries, key=lambda entry: entry[1]):
+        if any(rel_path.startswith(prefix + "/") for prefix in FULL_RUN_PATHS):
+            changes.full_run_reasons.append(rel_path)
+            continue
+        if not rel_path.endswith(".json"):
+            continue
+
+        path = project_root / rel_path
+        if status == "A":
+            changes.added.append(path)
+        elif status == "D":
+            changes.deleted.append(path)
+        else:
+            changes.modified.append(path)
+
+    return changes
@@ -0,0 +1,152 @@
+"""
+Tokenize the HED strings in HED test cases.
+
+HED strings are comma-separated tags with parenthesized groups. The helpers
+here split strings into tags without building a parse tree, which is enough
+to find which tags a test exercises, and pull the HED strings out of every
+kind of sub-test payload (strings, sidecar HED values, and the HED column of
+event tables) and out of test definitions.
+
+Usage:
+    from hed_tokens import iter_case_hed, iter_tags, tag_prefixes
+
+    for source, hed_string in iter_case_hed(test_case):
+        for tag in iter_tags(hed_string):
+            ...
+"""
+
+import re
+from typing import Any, Iterator, List, Tuple
+
+try:
+    from .corpus import iter_subtests
+except ImportError:
+    from corpus import iter_subtests
+
+# Tags are separated by commas and group parentheses
+_SPLIT = re.compile(r"[,()]")
+
+# Event table cells that hold no annotation
+_EMPTY_VALUES = {"", "n/a"}
+
+# Source position used for a test case's definitions, which apply to all of its sub-tests
+DEFINITIONS = ("definitions", "", -1)
+
+# ASCII control characters, which a tag can hold only by mistake
+CONTROL_CHARACTERS = re.compile(r"[\x00-\x1f\x7f]")
+
+
+def iter_tags(hed_string: str) -> Iterator[str]:
+    """
+    Split a HED string into its tags.
+
+    Sidecar column references such as {response} are not tags and are skipped.
+
+    Parameters:
+        hed_string (str): HED string
+
+    Yields:
+        str: Each tag with surrounding whitespace removed, in string order
+    """
+    for token in _SPLIT.split(hed_string):
+        token = token.strip()
+        if token and token[0] != "{":
+            yield token
+
+
+def tag_prefixes(tag: str) -> List[str]:
+    """
+    Return the lowercase path prefixes of a tag.
+
+    Parameters:
+        tag (str): Tag such as "Definition/Acc/#"
+
+    Returns:
+        List[str]: Prefixes such as ["definition", "definition/acc", "definition/acc/#"]
+    """
+    parts = tag.lower().split("/")
+    return ["/".join(parts[: i + 1]) for i in range(len(parts))]
+
+
+def iter_sidecar_hed(sidecar: Any) -> Iterator[str]:
+    """
+    Yield the HED strings of a sidecar.
+
+    Parameters:
+        sidecar (Any): Sidecar dictionary mapping column names to column entries
+
+    Yields:
+        str: HED value of each value column and each categorical level
+    """
+    if not isinstance(sidecar, dict):
+        return
+    for column in sidecar.values():
+        if not isinstance(column, dict):
+            continue
+        hed = column.get("HED")
+        if isinstance(hed, str):
+            yield hed
+        elif isinstance(hed, dict):
+            yield from (value for value in hed.values() if isinstance(value, str))
+
+
+def iter_events_hed(rows: Any) -> Iterator[str]:
+    """
+    Yield the HED column values of an event table.
+
+    Parameters:
+        rows (Any): Event table as a header row followed by data rows
+
+    Yields:
+        str: Non-empty HED cell of each data row
+    """
+    if not isinstance(rows, list) or not rows or not isinstance(rows[0], list) or "HED" not in rows[0]:
+        return
+    column = rows[0].index("HED")
+    for row in rows[1:]:
+        if isinstance(row, list) and column < len(row):
+            value = row[column]
+            if isinstance(value, str) and value.strip() not in _EMPTY_VALUES:
+                yield value
+
+
+def iter_payload_hed(test_type: str, payload: Any) -> Iterator[str]:
+    """
+    Yield the HED strings of one sub-test payload.
+
+    Parameters:
+        test_type (str): Test type such as "combo_tests"
+        payload (Any): Sub-test payload
+
+    Yields:
+        str: HED strings in the payload (none for schema tests)
+    """
+    if test_type == "string_tests":
+        if isinstance(payload, str):
+            yield payload
+    elif test_type == "sidecar_tests":
+        yield from iter_sidecar_hed(payload)
+    elif test_type == "event_tests":
+        yield from iter_events_hed(payload)
+    elif test_type == "combo_tests" and isinstance(payload, dict):
+        yield from iter_sidecar_hed(payload.get("sidecar"))
+        yield from iter_events_hed(payload.get("events"))
+
+
+def iter_case_hed(test_case: dict) -> Iterator[Tuple[Tuple[str, str, int], str]]:
+    """
+    Yield every HED string of a test case with the sub-test it comes from.
+
+    Parameters:
+        test_case (dict): Test case data
+
+    Yields:
+        Tuple[Tuple[str, str, int], str]: ((test type, outcome, index), HED string), with
+        DEFINITIONS as the position of definition strings
+    """
+    for definition in test_case.get("definitions", []) or []:
+        if isinstance(definition, str):
+            yield DEFINITIONS, definition
+    for test_type, outcome, index, payload in iter_subtests(test_case):
+        for hed_string in iter_payload_hed(test_type, payload):
+            yield (test_type, outcome, index), hed_string
@@ -0,0 +1,178 @@
+"""
+Event hooks for feeding per-file and per-case metrics into monitoring.
+
+The scripts emit a pair of events around each unit of work, "<event>.start"
+and "<event>.end". The end payload repeats the start payload and adds
+"seconds" and the counts of the work:
+
+    consolidate            directory, files            -> cases, errors, warnings
+    consolidate.file       file, bytes                 -> cases, errors
+    validate.file          file, bytes                 -> valid, errors
+    index.case             name, error_code            -> (timing only)
+    coverage.case          name, error_code            -> (timing only)
+
+With workers, combine_tests parses files in other processes. Its
+consolidate.file events are emitted as each file is merged, with the seconds
+and bytes the worker measured while reading the file.
+
+A hook is any callable taking (event, payload). Register it for one event, or
+for "*" to receive every event. Emitting sites check the HOOKS registry
+before building any payload or reading the clock, so instrumentation costs
+one dictionary truth test when no hook is registered.
+
+Usage:
+    from scripts import hooks
+
+    sink = hooks.JsonLinesSink("metrics.jsonl")
+    hooks.register("*", sink)
+    ...
+    hooks.unregister("*", sink)
+    sink.close()
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Event name (or "*") -> hooks; empty when instrumentation is off
+HOOKS: Dict[str, List[Callable[[str, dict], None]]] = {}
+
+
+def register(event: str, hook: Callable[[str, dict], None]):
+    """
+    Register a hook for an event.
+
+    Parameters:
+        event (str): Event name such as "validate.file.end", or "*" for every event
+        hook (Callable[[str, dict], None]): Called with the event name and payload
+    """
+    HOOKS.setdefault(event, []).append(hook)
+
+
+def unregister(event: str, hook: Callable[[str, dict], None]):
+    """
+    Remove a hook registered for an event; unknown hooks are ignored.
+
+    Parameters:
+        event (str): Event name the hook was registered for
+        hook (Callable[[str, dict], None]): Hook to remove
+    """
+    hooks = HOOKS.get(event, [])
+    if hook in hooks:
+        hooks.remove(hook)
+    if not hooks:
+        HOOKS.pop(event, None)
+
+
+def emit(event: str, payload: dict):
+    """
+    Call the hooks of an event and the hooks registered for every event.
+
+    Parameters:
+        event (str): Event name
+        payload (dict): Event data
+    """
+    for hook in HOOKS.get(event, []) + HOOKS.get("*", []):
+        hook(event, payload)
+
+
+class Span:
+    """Start and end events around one unit of work."""
+
+    def __init__(self, event: str, /, **payload):
+        """
+        Emit "<event>.start" and start the clock.
+
+        Parameters:
+            event (str): Event name without the .start/.end suffix
+            **payload: Data of both events
+        """
+        self.event = event
+        self.payload = payload
+        emit(f"{event}.start", dict(payload))
+        self.start = time.perf_counter()
+
+    def end(self, **fields):
+        """
+        Emit "<event>.end" with the elapsed seconds.
+
+        Parameters:
+            **fields: Data added to the end event, such as counts; a "seconds"
+                field replaces the elapsed time for work timed elsewhere
+        """
+        seconds = time.perf_counter() - self.start
+        self.payload["seconds"] = seconds
+        self.payload.update(fields)
+        emit(f"{self.event}.end", self.payload)
+
+
+def start_span(event: str, /, **payload) -> Optional[Span]:
+    """
+    Start a span, or return None when no hook is registered.
+
+    Parameters:
+        event (str): Event name without the .start/.end suffix
+        **payload: Data of both events
+
+    Returns:
+        Optional[Span]: The started span, or None
+    """
+    return Span(event, **payload) if HOOKS else None
+
+
+def file_size(path: Path) -> Optional[int]:
+    """Return the size of a file in bytes, or None if it cannot be read."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
+
+
+class JsonLinesSink:
+    """Hook that writes each event as one JSON line."""
+
+    def __init__(self, path: Path):
+        """
+        Open the metrics file for appending.
+
+        Parameters:
+            path (Path): File to append events to
+        """
+        self.file = open(path, "a", encoding="utf-8")
+
+    def __call__(self, event: str, payload: dict):
+        self.file.write(json.dumps({"event": event, "time": time.time(), **payload}, default=str) + "\n")
+
+    def close(self):
+        """Close the metrics file."""
+        self.file.close()
+
+
+def open_metrics(path: Optional[str]) -> Optional[JsonLinesSink]:
+    """
+    Register a JSON-lines sink for every event if a path is given.
+
+    Parameters:
+        path (Optional[str]): Metrics file from a --metrics option, or None
+
+    Returns:
+        Optional[JsonLinesSink]: The registered sink, to pass to close_metrics
+    """
+    if not path:
+        return None
+    sink = JsonLinesSink(Path(path))
+    register("*", sink)
+    return sink
+
+
+def close_metrics(sink: Optional[JsonLinesSink]):
+    """
+    Unregister and close a sink from open_metrics.
+
+    Parameters:
+        sink (Optional[JsonLinesSink]): Sink to close, or None
+    """
+    if sink is not None:
+        unregister("*", sink)
+        sink.close()
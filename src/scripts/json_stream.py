@@ -0,0 +1,215 @@
+"""
+Incremental reading and writing of top-level JSON arrays.
+
+Test files and consolidated outputs are JSON arrays of test cases. The helpers
+in this module walk such an array one element at a time using only the
+standard library, so peak memory depends on the largest single test case
+rather than on the size of the file.
+
+Usage:
+    from json_stream import iter_json_array
+
+    with open(path, "r", encoding="utf-8") as f:
+        for index, test_case in iter_json_array(f):
+            ...
+"""
+
+import json
+from typing import IO, Any, Iterator, Tuple
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+# Characters that may legally follow an array element
+_ELEMENT_END = _WHITESPACE + ",]"
+
+
+class NotAnArrayError(ValueError):
+    """Raised when the top-level JSON value is not an array."""
+
+
+class _ArrayScanner:
+    """Buffered scanner over a text stream holding a single JSON array."""
+
+    def __init__(self, fp: IO[str], chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        # Characters, newlines and trailing columns already discarded from the buffer
+        self.offset = 0
+        self.lines = 0
+        self.column = 0
+
+    def fill(self, min_size: int = 0) -> bool:
+        """Append at least one chunk to the buffer, returning False at end of input."""
+        if self.eof:
+            return False
+        # Drop consumed text so the buffer only holds the current element
+        if self.pos:
+            consumed = self.buf[: self.pos]
+            newlines = consumed.count("\n")
+            self.offset += self.pos
+            self.lines += newlines
+            self.column = len(consumed) - consumed.rfind("\n") - 1 if newlines else self.column + len(consumed)
+            self.buf = self.buf[self.pos :]
+            self.pos = 0
+        chunk = self.fp.read(max(self.chunk_size, min_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def next_char(self) -> str:
+        """Skip whitespace and return the next significant character without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def error(self, msg: str, pos: int = None) -> json.JSONDecodeError:
+        """Build a JSONDecodeError whose position refers to the whole stream."""
+        pos = self.pos if pos is None else pos
+        err = json.JSONDecodeError(msg, self.buf, pos)
+        err.pos += self.offset
+        if err.lineno == 1:
+            err.colno += self.column
+        err.lineno += self.lines
+        err.args = (f"{msg}: line {err.lineno} column {err.colno} (char {err.pos})",)
+        return err
+
+    def decode_value(self) -> Any:
+        """Decode the JSON value starting at the current position, reading more input as needed."""
+        want = 0
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise self.error(e.msg, e.pos) from None
+            else:
+                # A number cut by the chunk boundary decodes as a shorter number, so only
+                # accept a value that is followed by a character that can end an element
+                if self.eof or (end < len(self.buf) and self.buf[end] in _ELEMENT_END):
+                    self.pos = end
+                    return value
+            # Grow reads geometrically so a large element is not re-scanned once per chunk
+            want = max(want * 2, len(self.buf) - self.pos)
+            self.fill(want)
+
+
+def iter_json_array(fp: IO[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[int, Any]]:
+    """
+    Iterate over the elements of a top-level JSON array.
+
+    Parameters:
+        fp: Text stream positioned at the start of a JSON document
+        chunk_size: Number of characters to read from the stream at a time
+
+    Yields:
+        Tuple[int, Any]: (array index, decoded element)
+
+    Raises:
+        NotAnArrayError: If the document does not start with '['
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    scanner = _ArrayScanner(fp, chunk_size)
+
+    first = scanner.next_char()
+    if first != "[":
+        if first == "":
+            raise scanner.error("Expecting value")
+        raise NotAnArrayError("Top-level JSON value is not an array")
+    scanner.pos += 1
+
+    index = 0
+    if scanner.next_char() == "]":
+        scanner.pos += 1
+    else:
+        while True:
+            if scanner.next_char() == "":
+                raise scanner.error("Expecting value")
+            yield index, scanner.decode_value()
+            index += 1
+
+            delimiter = scanner.next_char()
+            if delimiter == ",":
+                scanner.pos += 1
+                continue
+            if delimiter == "]":
+                scanner.pos += 1
+                break
+            raise scanner.error("Expecting ',' delimiter")
+
+    if scanner.next_char() != "":
+        raise scanner.error("Extra data")
+
+
+class JsonArrayWriter:
+    """
+    Write a JSON array one element at a time.
+
+    The output is byte-identical to ``json.dump(items, fp, indent=indent)``
+    for the same sequence of elements.
+    """
+
+    open_bracket = "["
+    close_bracket = "]"
+
+    def __init__(self, fp: IO[str], indent: int = 4):
+        """
+        Initialize the writer.
+
+        Parameters:
+            fp: Text stream to write to
+            indent: Indentation used for the container and its elements
+        """
+        self.fp = fp
+        self.indent = indent
+        self.prefix = " " * indent
+        self.count = 0
+
+    def _write_member(self, text: str):
+        """Write one already-serialized member, indenting its continuation lines."""
+        # json.dumps escapes newlines inside strings, so every newline here is structural
+        text = text.replace("\n", "\n" + self.prefix)
+        self.fp.write((self.open_bracket + "\n" if self.count == 0 else ",\n") + self.prefix + text)
+        self.count += 1
+
+    def write(self, item: Any):
+        """Append a single element to the array."""
+        self._write_member(json.dumps(item, indent=self.indent))
+
+    def close(self):
+        """Terminate the container."""
+        self.fp.write("\n" + self.close_bracket if self.count else self.open_bracket + self.close_bracket)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        return False
+
+
+class JsonObjectWriter(JsonArrayWriter):
+    """
+    Write a JSON object one member at a time.
+
+    The output is byte-identical to ``json.dump(members, fp, indent=indent)``
+    for a dictionary with the same members in the same order.
+    """
+
+    open_bracket = "{"
+    close_bracket = "}"
+
+    def write(self, key: str, value: Any):
+        """Append a single member to the object."""
+        self._write_member(json.dumps(key) + ": " + json.dumps(value, indent=self.indent))
@@ -0,0 +1,476 @@
+"""
+Rebuild only the generated artifacts whose inputs changed.
+
+The generated files form a graph: the test files lead to the consolidated
+files and dictionaries, which lead to the tag index and the compact schema
+file, and separately to docs/test_index.md and the coverage report
+build/test_coverage.md. Each target below declares its data input files (as
+glob patterns), the targets it depends on, its outputs, and the script that
+builds it. The script's own inputs are not listed by hand: the script file
+and every local module it imports, directly or through other modules, are
+found by parsing the imports in src/scripts.
+
+A target is rebuilt when the SHA-256 digest of its inputs (including the
+outputs of the targets it depends on and the script arguments) differs from
+the digest recorded at its last successful build, when one of its outputs is
+missing or was changed since, or with --force. Targets whose dependencies are
+done run concurrently in a process pool. The recorded digests live in
+.hed_build_state.json at the project root:
+
+    {"consolidate": {"inputs": "<digest>", "outputs": {"json_test_data/validation_tests.json": "<digest>", ...}}, ...}
+
+Usage:
+    python src/scripts/make_targets.py
+    python src/scripts/make_targets.py index coverage
+    python src/scripts/make_targets.py --jobs 2 --verbose
+    python src/scripts/make_targets.py --dry-run
+    python src/scripts/make_targets.py --force tag_index
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+STATE_FILE = ".hed_build_state.json"
+
+# Directory of the script modules, relative to the project root
+SCRIPTS_DIR = "src/scripts"
+
+DEFAULT_JOBS = os.cpu_count() or 1
+
+# Source test files every corpus-wide target reads
+SOURCES = ["json_test_data/validation_tests/*.json", "json_test_data/schema_tests/*.json"]
+
+
+class Target:
+    """A generated artifact, the files it is built from, and the script that builds it."""
+
+    def __init__(
+        self,
+        name: str,
+        module: str,
+        args: List[str],
+        inputs: List[str],
+        outputs: List[str],
+        deps: Optional[List[str]] = None,
+    ):
+        """
+        Declare a target.
+
+        Parameters:
+            name (str): Target name
+            module (str): Script module whose main() builds the target
+            args (List[str]): Arguments passed to main()
+            inputs (List[str]): Glob patterns of data input files, relative to the project root;
+                                the script and the modules it imports are added by script_inputs
+            outputs (List[str]): Output files, relative to the project root
+            deps (Optional[List[str]]): Targets whose outputs this target reads
+        """
+        self.name = name
+        self.module = module
+        self.args = args
+        self.inputs = inputs
+        self.outputs = outputs
+        self.deps = deps or []
+
+
+def _consolidated_outputs(kind: str) -> List[str]:
+    """Return the files consolidate_tests.py writes for one test kind."""
+    names = ["tests", "code_dict", "testname_dict", "code_graph", "tests_lean", "tests_metadata"]
+    return [f"json_test_data/{kind}_{name}.json" for name in names]
+
+
+TARGETS = [
+    Target("validate", "validate_test_structure", [], SOURCES + ["src/schemas/test_schema.json"], []),
+    Target(
+        "consolidate",
+        "consolidate_tests",
+        [],
+        SOURCES,
+        _consolidated_outputs("validation") + _consolidated_outputs("schema"),
+    ),
+    Target(
+        "tag_index",
+        "select_tests",
+        ["index"],
+        [],
+        ["json_test_data/validation_tests_tag_index.json"],
+        deps=["consolidate"],
+    ),
+    Target(
+        "compact_schemas",
+        "schema_templates",
+        [],
+        [],
+        ["json_test_data/schema_tests_compact.json"],
+        deps=["consolidate"],
+    ),
+    Target("index", "generate_test_index", [], SOURCES, ["docs/test_index.md"]),
+    # The report goes to an ignored path; docs/test_coverage.md is formatted and committed by hand
+    Target("coverage", "check_coverage", ["--markdown", "build/test_coverage.md"], SOURCES, ["build/test_coverage.md"]),
+]
+
+
+def _file_digest(path: Path) -> str:
+    """Return the SHA-256 of a file's bytes."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def imported_modules(path: Path) -> Set[str]:
+    """
+    Return the names of the modules a script may import.
+
+    Covers "import x", "from .x import y", "from x import y", and "from . import x",
+    at any level of the file, including the ImportError fallbacks.
+
+    Parameters:
+        path (Path): Path to a Python file
+
+    Returns:
+        Set[str]: Candidate module names; names that are not local modules are ignored by the caller
+    """
+    names = set()
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"), filename=str(path))):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[-1] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                names.add(node.module.split(".")[-1])
+            # "from . import x" and "from scripts import x" import modules by name
+            names.update(alias.name for alias in node.names)
+    return names
+
+
+def script_inputs(module: str, scripts_dir: Path) -> Set[Path]:
+    """
+    Return a script and every local module it imports, directly or transitively.
+
+    Parameters:
+        module (str): Script module name
+        scripts_dir (Path): Directory holding the script modules
+
+    Returns:
+        Set[Path]: Files of the script and its local imports; empty if the script is not in the directory
+    """
+    found: Set[Path] = set()
+    pending = [module]
+    while pending:
+        path = scripts_dir / f"{pending.pop()}.py"
+        if path in found or not path.is_file():
+            continue
+        found.add(path)
+        pending.extend(imported_modules(path))
+    return found
+
+
+def resolve_order(targets: Dict[str, Target], names: List[str]) -> List[str]:
+    """
+    Return the named targets and everything they depend on, dependencies first.
+
+    Parameters:
+        targets (Dict[str, Target]): Targets by name
+        names (List[str]): Requested targets
+
+    Returns:
+        List[str]: Target names in an order where each follows its dependencies
+
+    Raises:
+        ValueError: If a target is unknown or the dependencies form a cycle
+    """
+    order = []
+    visiting = set()
+
+    def visit(name: str):
+        if name in order:
+            return
+        if name not in targets:
+            raise ValueError(f"Unknown target: {name}")
+        if name in visiting:
+            raise ValueError(f"Dependency cycle at target: {name}")
+        visiting.add(name)
+        for dep in targets[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def input_digest(target: Target, targets: Dict[str, Target], project_root: Path) -> str:
+    """
+    Return the digest of everything a target is built from.
+
+    Parameters:
+        target (Target): Target to digest
+        targets (Dict[str, Target]): All targets, for the outputs of dependencies
+        project_root (Path): Root of the hed-tests repository
+
+    Returns:
+        str: SHA-256 over the script arguments and the path and content of every input file
+    """
+    paths = {path for pattern in target.inputs for path in project_root.glob(pattern) if path.is_file()}
+    paths.update(script_inputs(target.module, project_root / SCRIPTS_DIR))
+    for dep in target.deps:
+        paths.update(project_root / output for output in targets[dep].outputs if (project_root / output).is_file())
+
+    digest = hashlib.sha256(json.dumps([target.module, target.args]).encode("utf-8"))
+    for path in sorted(paths):
+        digest.update(f"{path.relative_to(project_root).as_posix()}\0{_file_digest(path)}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def output_digests(target: Target, project_root: Path) -> Dict[str, Optional[str]]:
+    """Return the digest of each output of a target, or None for a missing output."""
+    return {
+        output: _file_digest(project_root / output) if (project_root / output).is_file() else None for output in target.outputs
+    }
+
+
+def stale_reason(target: Target, project_root: Path, record: Optional[dict], digest: str) -> Optional[str]:
+    """
+    Return why a target must be rebuilt, or None if it is up to date.
+
+    Parameters:
+        target (Target): Target to check
+        project_root (Path): Root of the hed-tests repository
+        record (Optional[dict]): State recorded at the target's last successful build
+        digest (str): Current input digest of the target
+
+    Returns:
+        Optional[str]: Reason for the rebuild, or None
+    """
+    if record is None:
+        return "never built"
+    if record.get("inputs") != digest:
+        return "inputs changed"
+    recorded = record.get("outputs", {})
+    for output, current in output_digests(target, project_root).items():
+        if current is None:
+            return f"{output} missing"
+        if recorded.get(output) != current:
+            return f"{output} changed"
+    return None
+
+
+def load_state(state_path: Path) -> Dict[str, dict]:
+    """Load the recorded build state, or an empty state if there is none."""
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save_state(state_path: Path, state: Dict[str, dict]):
+    """Write the build state atomically."""
+    temp_path = state_path.with_name(state_path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=4, sort_keys=True)
+    temp_path.replace(state_path)
+
+
+def _import_script(module: str):
+    """Import a script module the same way this script was imported."""
+    return importlib.import_module(f"{__package__}.{module}" if __package__ else module)
+
+
+def run_script(project_root: str, module: str, args: List[str]) -> Tuple[int, str, float]:
+    """
+    Run a script's main() in the project root, capturing what it prints.
+
+    Runs in a worker process, so changing the working directory is safe.
+
+    Parameters:
+        project_root (str): Root of the hed-tests repository
+        module (str): Script module name
+        args (List[str]): Arguments passed to main()
+
+    Returns:
+        Tuple[int, str, float]: (exit code, captured output, seconds)
+    """
+    os.chdir(project_root)
+    output = StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(output):
+        try:
+            code = _import_script(module).main(args)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            print(f"ERROR: {module} failed: {e}")
+            code = 1
+    return code or 0, output.getvalue(), time.perf_counter() - start
+
+
+def make(
+    targets: List[Target],
+    names: List[str],
+    project_root: Path,
+    state_path: Path,
+    jobs: int = DEFAULT_JOBS,
+    force: bool = False,
+    dry_run: bool = False,
+    runner: Callable[[str, str, List[str]], Tuple[int, str, float]] = run_script,
+) -> List[dict]:
+    """
+    Rebuild the stale targets among the named targets and their dependencies.
+
+    A target is checked once all of its dependencies have finished, since their
+    outputs are among its inputs. Targets that are ready at the same time run
+    concurrently. A target whose dependency failed is not run.
+
+    Parameters:
+        targets (List[Target]): All declared targets
+        names (List[str]): Requested targets
+        project_root (Path): Root of the hed-tests repository
+        state_path (Path): File holding the recorded digests
+        jobs (int): Number of worker processes
+        force (bool): Rebuild every requested target
+        dry_run (bool): Report what would be rebuilt without running anything
+        runner (Callable): Function run in the worker processes to build a target
+
+    Returns:
+        List[dict]: For each target in build order, its "name", "status" (rebuilt,
+        skipped, stale, failed, or blocked), "reason", "seconds", and "output"
+    """
+    by_name = {target.name: target for target in targets}
+    order = resolve_order(by_name, names)
+    state = load_state(state_path)
+    results: Dict[str, dict] = {}
+    pending = list(order)
+    running = {}
+
+    with ProcessPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        while pending or running:
+            # Check every target whose dependencies are finished
+            for name in list(pending):
+                target = by_name[name]
+                if any(dep not in results or results[dep]["status"] == "running" for dep in target.deps):
+                    continue
+                pending.remove(name)
+                result = {"name": name, "status": "skipped", "reason": "up to date", "seconds": 0.0, "output": ""}
+                results[name] = result
+
+                blocked = [dep for dep in target.deps if results[dep]["status"] in ("failed", "blocked")]
+                stale_deps = [dep for dep in target.deps if results[dep]["status"] == "stale"]
+                if blocked:
+                    result.update(status="blocked", reason=f"{blocked[0]} failed")
+                    continue
+                if stale_deps:
+                    # Only reached in a dry run, where the dependency was not rebuilt
+                    result.update(status="stale", reason=f"{stale_deps[0]} is stale")
+                    continue
+
+                digest = input_digest(target, by_name, project_root)
+                reason = "forced" if force else stale_reason(target, project_root, state.get(name), digest)
+                if reason is None:
+                    continue
+                result.update(status="stale", reason=reason)
+                if not dry_run:
+                    result["status"] = "running"
+                    running[executor.submit(runner, str(project_root), target.module, target.args)] = (name, digest)
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, digest = running.pop(future)
+                result = results[name]
+                try:
+                    code, output, seconds = future.result()
+                except Exception as e:
+                    code, output, seconds = 1, f"ERROR: {e}\n", 0.0
+                result.update(output=output, seconds=seconds)
+                if code == 0:
+                    result["status"] = "rebuilt"
+                    state[name] = {"inputs": digest, "outputs": output_digests(by_name[name], project_root)}
+                else:
+                    result.update(status="failed", reason=f"{result['reason']}; exit code {code}")
+                    state.pop(name, None)
+
+    if not dry_run:
+        save_state(state_path, state)
+    return [results[name] for name in order]
+
+
+def print_summary(results: List[dict], elapsed: float):
+    """
+    Print the status and time of each target.
+
+    Parameters:
+        results (List[dict]): Results from make
+        elapsed (float): Wall-clock seconds for the whole run
+    """
+    print("\n" + "=" * 70)
+    print("Build Targets")
+    print("=" * 70)
+    print(f"{'Target':<18} {'Status':<9} {'Time':>10}  Reason")
+    print("-" * 70)
+    for result in results:
+        time_str = f"{1000 * result['seconds']:.1f} ms" if result["status"] in ("rebuilt", "failed") else "-"
+        print(f"{result['name']:<18} {result['status']:<9} {time_str:>10}  {result['reason']}")
+    print("-" * 70)
+    rebuilt = sum(1 for result in results if result["status"] == "rebuilt")
+    skipped = sum(1 for result in results if result["status"] == "skipped")
+    print(f"Rebuilt: {rebuilt} | Skipped: {skipped} | Wall time: {1000 * elapsed:.1f} ms")
+    print("=" * 70)
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function to rebuild the stale generated artifacts.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    names = [target.name for target in TARGETS]
+    parser = argparse.ArgumentParser(description="Rebuild only the generated artifacts whose inputs changed")
+    parser.add_argument("targets", nargs="*", metavar="TARGET", help=f"Targets to build (default: all of {', '.join(names)})")
+    parser.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS, help="Number of worker processes")
+    parser.add_argument("--force", action="store_true", help="Rebuild the requested targets even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="Report stale targets without rebuilding them")
+    parser.add_argument("--verbose", action="store_true", help="Print the output of every rebuilt target")
+    args = parser.parse_args(arg_list)
+
+    # Get paths
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+
+    start = time.perf_counter()
+    try:
+        results = make(
+            TARGETS,
+            args.targets or names,
+            project_root,
+            project_root / STATE_FILE,
+            jobs=args.jobs,
+            force=args.force,
+            dry_run=args.dry_run,
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    for result in results:
+        if result["output"] and (args.verbose or result["status"] == "failed"):
+            print(f"\n--- {result['name']} ---")
+            print(result["output"], end="")
+    print_summary(results, time.perf_counter() - start)
+    return 1 if any(result["status"] == "failed" for result in results) else 0
+
+
+if __name__ == "__main__":
+    exit(main())
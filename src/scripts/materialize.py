@@ -0,0 +1,346 @@
+"""
+Materialize HED test inputs as files for file-based validators.
+
+Schema validators read schema files, not JSON line arrays, and file-based
+validators read events.tsv files with events.json sidecars. This script
+writes test inputs to a content-addressed directory (each file name is the
+SHA-256 of its content), so identical inputs share one file, and writes a
+manifest mapping each sub-test to its files.
+
+The schemas command writes every schema sub-test as a .mediawiki file:
+
+    {"name": "...", "error_code": "...", "outcome": "fails", "index": 0, "path": "<hash>.mediawiki"}
+
+The events command writes each event, sidecar, and combo sub-test to a
+directory named by the SHA-256 of its inputs, holding
+sub-01_task-test_events.tsv and, next to it, the matching
+sub-01_task-test_events.json sidecar, so BIDS tools pair them by name:
+
+    {"name": "...", "error_code": "...", "test_type": "combo_tests", "outcome": "passes", "index": 0,
+     "schema": "8.4.0", "definitions": ["(Definition/Acc, (Red))"], "warning": false,
+     "path": "<hash>", "events": "<hash>/sub-01_task-test_events.tsv",
+     "sidecar": "<hash>/sub-01_task-test_events.json"}
+
+Event sub-tests have no "sidecar" and sidecar sub-tests have no "events".
+The schema versions, definitions, and warning flag are those of the test
+case, which a validator needs to run the sub-test.
+Events file values are written unchanged, as BIDS TSV files have no escapes;
+a sub-test with a value containing a tab or line break is reported and left
+out.
+
+Files are written in parallel by a thread pool. A file whose name is already
+in the directory is not rewritten, and the manifest is only rewritten when it
+changes, so a repeated run over an unchanged corpus writes nothing.
+
+Usage:
+    python src/scripts/materialize.py schemas
+    python src/scripts/materialize.py schemas --output-dir materialized/schemas --workers 8 --prune
+    python src/scripts/materialize.py events
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+try:
+    from .corpus import iter_subtests, load_consolidated
+    from .extract_kinds import events_file_text
+except ImportError:
+    from corpus import iter_subtests, load_consolidated
+    from extract_kinds import events_file_text
+
+MANIFEST_NAME = "manifest.json"
+
+# BIDS file name stem shared by the events file and its sidecar
+EVENTS_STEM = "sub-01_task-test_events"
+
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def content_name(content: str, suffix: str) -> str:
+    """
+    Return the content-addressed file name of some text.
+
+    Parameters:
+        content (str): File content
+        suffix (str): File suffix such as ".mediawiki"
+
+    Returns:
+        str: SHA-256 of the UTF-8 content followed by the suffix
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest() + suffix
+
+
+def schema_text(lines: List[str]) -> str:
+    """Return the .mediawiki file content of a schema sub-test."""
+    return "\n".join(lines) + "\n"
+
+
+def sidecar_text(sidecar: dict) -> str:
+    """Return the events.json file content of a sidecar."""
+    return json.dumps(sidecar, indent=4) + "\n"
+
+
+def _write_file(path: Path, content: str):
+    """Write one file atomically so an interrupted run never leaves a partial file under its final name."""
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(content)
+    temp_path.replace(path)
+
+
+def _existing_files(output_dir: Path, names) -> set:
+    """Return the names (relative paths) in a directory, listing only the subdirectories the names use."""
+    with os.scandir(output_dir) as entries:
+        existing = {entry.name for entry in entries}
+    for subdir in {name.split("/")[0] for name in names if "/" in name} & existing:
+        with os.scandir(output_dir / subdir) as entries:
+            existing.update(f"{subdir}/{entry.name}" for entry in entries)
+    return existing
+
+
+def write_content_files(output_dir: Path, files: Dict[str, str], workers: int = DEFAULT_WORKERS) -> int:
+    """
+    Write content-addressed files that are not already in a directory.
+
+    Existing files are found with one listing of the directory and of each
+    subdirectory the names use, not one check per file.
+
+    Parameters:
+        output_dir (Path): Directory to write to
+        files (Dict[str, str]): Content by file name, which may be "<subdirectory>/<name>"
+        workers (int): Number of writer threads
+
+    Returns:
+        int: Number of files written
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    existing = _existing_files(output_dir, files)
+    missing = [(output_dir / name, content) for name, content in files.items() if name not in existing]
+    for parent in {path.parent for path, _ in missing}:
+        parent.mkdir(exist_ok=True)
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            # list() surfaces the first write error
+            list(executor.map(lambda item: _write_file(*item), missing))
+    return len(missing)
+
+
+def write_manifest(output_dir: Path, entries: List[dict]) -> bool:
+    """
+    Write the manifest if its content changed.
+
+    Parameters:
+        output_dir (Path): Directory holding the manifest
+        entries (List[dict]): Manifest entries
+
+    Returns:
+        bool: Whether the manifest was written
+    """
+    path = output_dir / MANIFEST_NAME
+    content = json.dumps(entries, indent=4)
+    try:
+        if path.read_text(encoding="utf-8") == content:
+            return False
+    except OSError:
+        pass
+    _write_file(path, content)
+    return True
+
+
+def prune_files(output_dir: Path, keep: set) -> int:
+    """
+    Remove content files and directories that no manifest entry refers to.
+
+    Parameters:
+        output_dir (Path): Directory to prune
+        keep (set): File names to keep besides the manifest; a "<subdirectory>/<name>" keeps its subdirectory
+
+    Returns:
+        int: Number of files and directories removed
+    """
+    keep = {name.split("/")[0] for name in keep}
+    removed = 0
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            if entry.name == MANIFEST_NAME or entry.name in keep:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+            removed += 1
+    return removed
+
+
+def collect_schema_files(test_cases: List[dict]) -> Tuple[Dict[str, str], List[dict]]:
+    """
+    Map every schema sub-test to a content-addressed .mediawiki file.
+
+    Parameters:
+        test_cases (List[dict]): Consolidated schema test cases
+
+    Returns:
+        Tuple[Dict[str, str], List[dict]]: (content by file name, manifest entries in corpus order)
+    """
+    files: Dict[str, str] = {}
+    entries = []
+    for test_case in test_cases:
+        for test_type, outcome, index, payload in iter_subtests(test_case):
+            if test_type != "schema_tests":
+                continue
+            content = schema_text(payload)
+            name = content_name(content, ".mediawiki")
+            files[name] = content
+            entries.append(
+                {
+                    "name": test_case.get("name", ""),
+                    "error_code": test_case.get("error_code", "UNKNOWN"),
+                    "outcome": outcome,
+                    "index": index,
+                    "path": name,
+                }
+            )
+    return files, entries
+
+
+def collect_event_files(test_cases: List[dict]) -> Tuple[Dict[str, str], List[dict]]:
+    """
+    Map every event, sidecar, and combo sub-test to a content-addressed directory of BIDS events files.
+
+    Parameters:
+        test_cases (List[dict]): Consolidated validation test cases
+
+    Returns:
+        Tuple[Dict[str, str], List[dict]]: (content by file name, manifest entries in corpus order)
+    """
+    files: Dict[str, str] = {}
+    entries = []
+    for test_case in test_cases:
+        for test_type, outcome, index, payload in iter_subtests(test_case):
+            try:
+                if test_type == "event_tests":
+                    parts = {"events": events_file_text(payload)}
+                elif test_type == "sidecar_tests":
+                    parts = {"sidecar": sidecar_text(payload)}
+                elif test_type == "combo_tests":
+                    parts = {
+                        "events": events_file_text(payload.get("events", [])),
+                        "sidecar": sidecar_text(payload.get("sidecar", {})),
+                    }
+                else:
+                    continue
+            except ValueError as e:
+                print(f"WARNING: Not writing {test_type} {test_case.get('name', '')} {outcome} {index}: {e}")
+                continue
+            directory = content_name(json.dumps(parts, sort_keys=True), "")
+            entry = {
+                "name": test_case.get("name", ""),
+                "error_code": test_case.get("error_code", "UNKNOWN"),
+                "test_type": test_type,
+                "outcome": outcome,
+                "index": index,
+                "schema": test_case.get("schema", ""),
+                "definitions": list(test_case.get("definitions", []) or []),
+                "warning": bool(test_case.get("warning", False)),
+                "path": directory,
+            }
+            for role, content in parts.items():
+                name = f"{directory}/{EVENTS_STEM}{'.tsv' if role == 'events' else '.json'}"
+                files[name] = content
+                entry[role] = name
+            entries.append(entry)
+    return files, entries
+
+
+def materialize(
+    output_dir: Path, files: Dict[str, str], entries: List[dict], workers: int = DEFAULT_WORKERS, prune: bool = False
+) -> dict:
+    """
+    Write content files and the manifest, skipping anything already up to date.
+
+    Parameters:
+        output_dir (Path): Directory to write to
+        files (Dict[str, str]): Content by file name
+        entries (List[dict]): Manifest entries
+        workers (int): Number of writer threads
+        prune (bool): Remove files the manifest no longer refers to
+
+    Returns:
+        dict: Counts of "files", "written", "pruned", and whether the "manifest" was written
+    """
+    written = write_content_files(output_dir, files, workers)
+    manifest_written = write_manifest(output_dir, entries)
+    pruned = prune_files(output_dir, set(files)) if prune else 0
+    return {"files": len(files), "written": written, "pruned": pruned, "manifest": manifest_written}
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function to materialize test inputs as files.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Materialize HED test inputs as content-addressed files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    schema_parser = subparsers.add_parser("schemas", help="Write schema sub-tests as .mediawiki files")
+    schema_parser.add_argument(
+        "--input", type=str, default="json_test_data/schema_tests.json", help="Consolidated schema test file"
+    )
+    schema_parser.add_argument(
+        "--output-dir", type=str, default="materialized/schemas", help="Output directory (default: materialized/schemas)"
+    )
+
+    events_parser = subparsers.add_parser("events", help="Write event, sidecar, and combo sub-tests as events files")
+    events_parser.add_argument(
+        "--input", type=str, default="json_test_data/validation_tests.json", help="Consolidated validation test file"
+    )
+    events_parser.add_argument(
+        "--output-dir", type=str, default="materialized/events", help="Output directory (default: materialized/events)"
+    )
+
+    for subparser in [schema_parser, events_parser]:
+        subparser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Number of writer threads")
+        subparser.add_argument("--prune", action="store_true", help="Remove files the manifest no longer refers to")
+    args = parser.parse_args(arg_list)
+
+    # Get paths
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+    input_path = project_root / args.input
+    output_dir = project_root / args.output_dir
+
+    try:
+        test_cases = load_consolidated(input_path, snapshot=True)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: Failed to load {input_path}: {e}")
+        return 1
+
+    if args.command == "schemas":
+        files, entries = collect_schema_files(test_cases)
+    else:
+        files, entries = collect_event_files(test_cases)
+    try:
+        result = materialize(output_dir, files, entries, args.workers, args.prune)
+    except OSError as e:
+        print(f"ERROR: Failed to write files: {e}")
+        return 1
+
+    print(f"Sub-tests: {len(entries)}, distinct files: {result['files']}")
+    print(f"Written: {result['written']}, already present: {result['files'] - result['written']}")
+    if args.prune:
+        print(f"Pruned: {result['pruned']}")
+    print(f"Manifest {'written' if result['manifest'] else 'unchanged'}: {output_dir / MANIFEST_NAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
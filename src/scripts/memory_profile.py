@@ -0,0 +1,146 @@
+"""
+Memory profiling of the build stages with tracemalloc.
+
+MemoryProfile measures each call into a stage: the highest traced memory
+while the call ran (peak) and how much more memory was allocated after it
+than before (retained). Summed over a run, retained shows what a stage keeps,
+such as the consolidated case list or the index entries, and peak shows the
+transient high-water mark. At the end of a run, the largest allocation sites
+still alive are listed by source line.
+
+tracemalloc slows allocation-heavy code several times over, so timings taken
+while profiling are not comparable to normal runs.
+"""
+
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+def format_bytes(size: float) -> str:
+    """Return a byte count as a short human-readable string."""
+    if abs(size) < 1024:
+        return f"{int(size)} B"
+    for unit in ["KiB", "MiB", "GiB"]:
+        size /= 1024
+        if abs(size) < 1024 or unit == "GiB":
+            return f"{size:.1f} {unit}"
+
+
+class MemoryProfile:
+    """Per-stage peak and retained memory of a run."""
+
+    def __init__(self, frames: int = 1):
+        """
+        Initialize the profile.
+
+        Parameters:
+            frames (int): Stack frames stored per allocation (1 attributes it to the allocating line)
+        """
+        self.frames = frames
+        # Stage name -> {"peak": highest traced bytes during a call, "retained": net bytes over all calls}
+        self.stages: Dict[str, Dict[str, int]] = {}
+        self.peak = 0
+        self.cases = 0
+        self.started_tracing = False
+
+    def start(self):
+        """Start tracing allocations, unless tracing is already on."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+
+    def stop(self):
+        """Stop tracing if start() started it."""
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    @contextmanager
+    def measure(self, name: str):
+        """
+        Measure one call into a stage.
+
+        Parameters:
+            name (str): Stage name
+        """
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            after, peak = tracemalloc.get_traced_memory()
+            stage = self.stages.setdefault(name, {"peak": 0, "retained": 0})
+            stage["peak"] = max(stage["peak"], peak)
+            stage["retained"] += after - before
+            self.peak = max(self.peak, peak)
+
+    def bytes_per_case(self) -> float:
+        """Return the overall peak divided by the number of test cases."""
+        return self.peak / self.cases if self.cases else 0.0
+
+    def top_sites(self, limit: int = 10) -> List[Tuple[str, int, int]]:
+        """
+        Return the allocation sites holding the most memory now.
+
+        Parameters:
+            limit (int): Number of sites
+
+        Returns:
+            List[Tuple[str, int, int]]: (file:line, bytes, number of blocks), largest first
+        """
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            ]
+        )
+        sites = []
+        for statistic in snapshot.statistics("lineno")[:limit]:
+            frame = statistic.traceback[0]
+            sites.append((f"{frame.filename}:{frame.lineno}", statistic.size, statistic.count))
+        return sites
+
+
+def exceeds_threshold(profile: MemoryProfile, max_bytes_per_case: Optional[float]) -> bool:
+    """
+    Return whether the peak memory per test case is above a threshold.
+
+    Parameters:
+        profile (MemoryProfile): Profile of a finished run
+        max_bytes_per_case (Optional[float]): Allowed peak bytes per test case, or None for no limit
+
+    Returns:
+        bool: True if a threshold is set and the run exceeded it
+    """
+    return max_bytes_per_case is not None and profile.bytes_per_case() > max_bytes_per_case
+
+
+def print_memory_profile(profile: MemoryProfile, sites: List[Tuple[str, int, int]], max_bytes_per_case: Optional[float]):
+    """
+    Print the per-stage memory, the top allocation sites, and the threshold check.
+
+    Parameters:
+        profile (MemoryProfile): Profile of a finished run
+        sites (List[Tuple[str, int, int]]): Allocation sites from top_sites
+        max_bytes_per_case (Optional[float]): Allowed peak bytes per test case, or None
+    """
+    print("\n" + "=" * 60)
+    print("Memory Profile (tracemalloc)")
+    print("=" * 60)
+    print(f"  {'stage':<14} {'peak':>12} {'retained':>12}")
+    for name, stage in profile.stages.items():
+        print(f"  {name:<14} {format_bytes(stage['peak']):>12} {format_bytes(stage['retained']):>12}")
+    print(
+        f"\n  Overall peak: {format_bytes(profile.peak)} for {profile.cases} test cases "
+        f"({profile.bytes_per_case():.0f} bytes per case)"
+    )
+    if max_bytes_per_case is not None:
+        status = "FAILED" if exceeds_threshold(profile, max_bytes_per_case) else "ok"
+        print(f"  Threshold: {max_bytes_per_case:.0f} bytes per case  {status}")
+
+    if sites:
+        print("\n  Top allocation sites still held at the end of the run:")
+        for site, size, count in sites:
+            print(f"  {format_bytes(size):>12} {count:>8} blocks  {site}")
@@ -0,0 +1,99 @@
+"""
+Write a markdown report as a directory of pages.
+
+A paged report has one page per error code plus an index.md navigation page.
+Pages are rendered in a pool of worker processes, and each worker writes its
+page as soon as it is rendered, so the whole report is never held in memory.
+A .pages.json manifest in the directory records the digest of every page, so
+a page is rewritten only when its content changes, and pages of error codes
+that no longer exist are removed.
+"""
+
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+MANIFEST_NAME = ".pages.json"
+
+# (page file name, render function returning the lines of the page, argument of the render function)
+Page = Tuple[str, Callable[[object], Iterable[str]], object]
+
+
+def page_name(error_code: str) -> str:
+    """Return the file name of the page of an error code."""
+    return f"{error_code}.md"
+
+
+def write_page(output_dir: Path, page: Page, previous_digest: Optional[str]) -> Tuple[str, str, bool]:
+    """
+    Render one page and write it unless it is unchanged.
+
+    Parameters:
+        output_dir (Path): Directory of the pages
+        page (Page): Page to render
+        previous_digest (Optional[str]): Digest of the page when it was last written
+
+    Returns:
+        Tuple[str, str, bool]: (page file name, digest, whether the file was written)
+    """
+    name, render, argument = page
+    text = "\n".join(render(argument))
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    path = output_dir / name
+    if digest == previous_digest and path.exists():
+        return name, digest, False
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return name, digest, True
+
+
+def write_pages(output_dir: Path, pages: List[Page], workers: int = 1) -> Dict[str, List[str]]:
+    """
+    Write the pages of a report and remove the pages it no longer has.
+
+    Parameters:
+        output_dir (Path): Directory of the pages
+        pages (List[Page]): Pages of the report
+        workers (int): Number of processes that render and write pages
+
+    Returns:
+        Dict[str, List[str]]: Page file names that were "written", "unchanged", and "removed"
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+
+    directories = [output_dir] * len(pages)
+    digests = [previous.get(page[0]) for page in pages]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(write_page, directories, pages, digests, chunksize=16))
+    else:
+        results = list(map(write_page, directories, pages, digests))
+
+    result = {"written": [], "unchanged": [], "removed": []}
+    manifest = {}
+    for name, digest, written in results:
+        manifest[name] = digest
+        result["written" if written else "unchanged"].append(name)
+    for name in sorted(set(previous) - set(manifest)):
+        (output_dir / name).unlink(missing_ok=True)
+        result["removed"].append(name)
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return result
+
+
+def format_page_summary(output_dir: Path, result: Dict[str, List[str]]) -> str:
+    """Return a one-line summary of a write_pages result."""
+    return (
+        f"{len(result['written'])} pages written, {len(result['unchanged'])} unchanged, "
+        f"{len(result['removed'])} removed in {output_dir}"
+    )
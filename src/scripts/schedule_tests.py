@@ -0,0 +1,318 @@
+"""
+Order HED sub-tests for time-budgeted, failure-prioritized validator runs.
+
+A validator CI job with a few minutes to spare should spend them on the tests
+most likely to fail. This script keeps a compact local history of harness
+results and orders sub-tests by recent failure probability divided by
+estimated run time. The plan stops when the time budget is reached and
+reports the error codes it did not reach.
+
+Harness results are JSON (a list) or JSON lines, one object per sub-test run:
+
+    {"name": "tag-invalid-in-schema", "test_type": "string_tests", "outcome": "fails",
+     "index": 0, "passed": false, "seconds": 0.012}
+
+``passed`` is whether the validator produced the expected result.
+
+Usage:
+    python src/scripts/schedule_tests.py plan --budget 300
+    python src/scripts/schedule_tests.py plan --budget 300 --output schedule.jsonl --subset schedule_tests.json
+    python src/scripts/schedule_tests.py record results.jsonl
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .corpus import CONSOLIDATED_FILES, iter_subtests, load_consolidated
+    from .cost_model import estimate_subtest_cost, units_per_second
+    from .smoke_subset import build_subset
+except ImportError:
+    from corpus import CONSOLIDATED_FILES, iter_subtests, load_consolidated
+    from cost_model import estimate_subtest_cost, units_per_second
+    from smoke_subset import build_subset
+
+# Weight kept by older runs each time a sub-test runs again
+DECAY = 0.8
+
+# Beta prior on the failure probability, so sub-tests with no history rank high
+PRIOR_FAILURES = 1.0
+PRIOR_PASSES = 1.0
+
+# Seconds per estimate unit when the history has no timings to calibrate against
+DEFAULT_SECONDS_PER_UNIT = 0.005
+
+HISTORY_VERSION = 1
+
+
+def subtest_key(name: str, test_type: str, outcome: str, index: int) -> str:
+    """Return the history key of a sub-test."""
+    return f"{name}:{test_type}:{outcome}:{index}"
+
+
+class RunHistory:
+    """Decayed pass/fail counts and timings of sub-tests across harness runs."""
+
+    def __init__(self):
+        self.runs = 0
+        # Maps sub-test key -> [decayed runs, decayed failures, smoothed seconds]
+        self.tests: Dict[str, List[float]] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> "RunHistory":
+        """
+        Load a history file, returning an empty history if it does not exist.
+
+        Parameters:
+            path (Path): Path to the history file
+
+        Returns:
+            RunHistory: The loaded history
+
+        Raises:
+            ValueError: If the file is not a history file of a supported version
+        """
+        history = cls()
+        if not path.exists():
+            return history
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get("version") != HISTORY_VERSION:
+            raise ValueError(f"{path.name} is not a version {HISTORY_VERSION} history file")
+        history.runs = data.get("runs", 0)
+        history.tests = data.get("tests", {})
+        return history
+
+    def save(self, path: Path):
+        """
+        Write the history compactly, replacing the file atomically.
+
+        Parameters:
+            path (Path): Path to the history file
+        """
+        tests = {key: [round(value, 4) for value in values] for key, values in sorted(self.tests.items())}
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": HISTORY_VERSION, "runs": self.runs, "tests": tests}, f, separators=(",", ":"))
+        temp_path.replace(path)
+
+    def record(self, results: List[dict]) -> int:
+        """
+        Add one harness run to the history.
+
+        Parameters:
+            results (List[dict]): Harness result records
+
+        Returns:
+            int: Number of records added
+        """
+        count = 0
+        for result in results:
+            key = subtest_key(result["name"], result["test_type"], result["outcome"], int(result["index"]))
+            runs, failures, seconds = self.tests.get(key, [0.0, 0.0, 0.0])
+            failed = 0.0 if result.get("passed", True) else 1.0
+            new_seconds = float(result.get("seconds", 0.0) or 0.0)
+            if runs > 0 and seconds > 0:
+                new_seconds = DECAY * seconds + (1 - DECAY) * new_seconds
+            self.tests[key] = [runs * DECAY + 1, failures * DECAY + failed, new_seconds]
+            count += 1
+        self.runs += 1
+        return count
+
+    def failure_probability(self, key: str) -> float:
+        """Return the smoothed recent failure probability of a sub-test."""
+        runs, failures, _ = self.tests.get(key, [0.0, 0.0, 0.0])
+        return (failures + PRIOR_FAILURES) / (runs + PRIOR_FAILURES + PRIOR_PASSES)
+
+    def timings(self) -> Dict[str, float]:
+        """Return the recorded seconds of every sub-test that has a timing."""
+        return {key: values[2] for key, values in self.tests.items() if values[2] > 0}
+
+
+def read_results(path: Path) -> List[dict]:
+    """
+    Read harness results from a JSON list or a JSON lines file.
+
+    Parameters:
+        path (Path): Path to the results file
+
+    Returns:
+        List[dict]: Result records
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def iter_plan_candidates(corpora: List[List[dict]]) -> Iterator[Tuple[int, int, dict, str, str, int, object]]:
+    """Yield (file position, case position, test case, test type, outcome, index, payload) for every sub-test."""
+    for file_position, test_cases in enumerate(corpora):
+        for case_position, test_case in enumerate(test_cases):
+            for test_type, outcome, index, payload in iter_subtests(test_case):
+                yield file_position, case_position, test_case, test_type, outcome, index, payload
+
+
+def plan_schedule(corpora: List[List[dict]], history: RunHistory, budget: Optional[float] = None) -> Tuple[List[dict], set]:
+    """
+    Order sub-tests by failure probability per second and cut the order at the budget.
+
+    Parameters:
+        corpora (List[List[dict]]): Test cases of each consolidated file
+        history (RunHistory): Past harness results
+        budget (Optional[float]): Time budget in seconds, or None for no limit
+
+    Returns:
+        Tuple[List[dict], set]: (scheduled sub-tests in run order, error codes not reached)
+    """
+    entries = []
+    estimates = {}
+    for file_position, case_position, test_case, test_type, outcome, index, payload in iter_plan_candidates(corpora):
+        key = subtest_key(test_case.get("name", ""), test_type, outcome, index)
+        estimates[key] = estimate_subtest_cost(test_type, payload)
+        entries.append(
+            {
+                "name": test_case.get("name", ""),
+                "error_code": test_case.get("error_code", "UNKNOWN"),
+                "test_type": test_type,
+                "outcome": outcome,
+                "index": index,
+                "file": file_position,
+                "case": case_position,
+                "key": key,
+            }
+        )
+
+    # Recorded timings where available, otherwise the estimate converted to seconds
+    timings = history.timings()
+    scale = units_per_second(estimates, timings) or 1 / DEFAULT_SECONDS_PER_UNIT
+    for entry in entries:
+        key = entry["key"]
+        entry["seconds"] = timings.get(key, estimates[key] / scale)
+        entry["failure_probability"] = history.failure_probability(key)
+
+    # Highest failure probability per second first; ties keep corpus order
+    order = sorted(
+        range(len(entries)), key=lambda i: (-entries[i]["failure_probability"] / max(entries[i]["seconds"], 1e-9), i)
+    )
+
+    scheduled = []
+    elapsed = 0.0
+    for i in order:
+        entry = entries[i]
+        if budget is not None and elapsed + entry["seconds"] > budget:
+            break
+        elapsed += entry["seconds"]
+        scheduled.append(entry)
+
+    reached = {entry["error_code"] for entry in scheduled}
+    missed = {entry["error_code"] for entry in entries} - reached
+    return scheduled, missed
+
+
+def run_plan(args) -> int:
+    """Write a budgeted schedule of sub-tests."""
+    try:
+        corpora = [load_consolidated(path, snapshot=True) for path in args.input]
+        history = RunHistory.load(args.history)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    scheduled, missed = plan_schedule(corpora, history, args.budget)
+    total = sum(1 for _ in iter_plan_candidates(corpora))
+    elapsed = sum(entry["seconds"] for entry in scheduled)
+
+    print(f"History: {history.runs} runs, {len(history.tests)} sub-tests")
+    budget_str = f"{args.budget:.1f}s" if args.budget is not None else "unlimited"
+    print(f"Scheduled {len(scheduled)} of {total} sub-tests, estimated {elapsed:.1f}s of {budget_str} budget")
+    if missed:
+        print(f"Error codes not reached ({len(missed)}):")
+        for code in sorted(missed):
+            print(f"  {code}")
+    else:
+        print("All error codes reached")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for entry in scheduled:
+                record = {k: entry[k] for k in ["name", "error_code", "test_type", "outcome", "index"]}
+                record["estimated_seconds"] = round(entry["seconds"], 6)
+                f.write(json.dumps(record) + "\n")
+        print(f"Schedule written to: {args.output}")
+
+    if args.subset:
+        selected = {
+            (entry["file"], entry["case"], entry["test_type"], entry["outcome"], entry["index"]) for entry in scheduled
+        }
+        subset = []
+        for file_position, test_cases in enumerate(corpora):
+            keep = {key[1:] for key in selected if key[0] == file_position}
+            subset.extend(build_subset(test_cases, keep))
+        with open(args.subset, "w", encoding="utf-8") as f:
+            json.dump(subset, f, indent=4)
+        print(f"Subset of {len(subset)} test cases written to: {args.subset}")
+    return 0
+
+
+def run_record(args) -> int:
+    """Add harness results to the history."""
+    try:
+        history = RunHistory.load(args.history)
+        count = history.record(read_results(args.results))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Failed to record results: {e}")
+        return 1
+
+    history.save(args.history)
+    print(f"Recorded {count} results; history now has {history.runs} runs and {len(history.tests)} sub-tests")
+    return 0
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function to plan or record validator runs.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Failure-prioritized, time-budgeted ordering of HED sub-tests")
+    parser.add_argument(
+        "--history", type=str, default=".hed_test_history.json", help="History file (default: .hed_test_history.json)"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser = subparsers.add_parser("plan", help="Order sub-tests and cut at the time budget")
+    plan_parser.add_argument("--budget", type=float, help="Time budget in seconds (default: no limit)")
+    plan_parser.add_argument("--input", type=str, nargs="+", help="Consolidated test files (default: both)")
+    plan_parser.add_argument("--output", type=str, help="Write the schedule as JSON lines to this path")
+    plan_parser.add_argument("--subset", type=str, help="Write the scheduled sub-tests as a consolidated file")
+
+    record_parser = subparsers.add_parser("record", help="Add harness results to the history")
+    record_parser.add_argument("results", type=str, help="Harness results file (JSON list or JSON lines)")
+
+    args = parser.parse_args(arg_list)
+
+    # Get paths (relative paths are resolved against the project root, as in the other scripts)
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+    args.history = project_root / args.history
+
+    if args.command == "plan":
+        if args.input:
+            args.input = [project_root / path for path in args.input]
+        else:
+            args.input = [project_root / "json_test_data" / name for name in CONSOLIDATED_FILES]
+        args.output = project_root / args.output if args.output else None
+        args.subset = project_root / args.subset if args.subset else None
+        return run_plan(args)
+    args.results = project_root / args.results
+    return run_record(args)
+
+
+if __name__ == "__main__":
+    exit(main())
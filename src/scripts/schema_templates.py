@@ -0,0 +1,227 @@
+"""
+Store schema-test inputs as shared skeletons plus per-case deltas.
+
+Every schema sub-test is a full list of mediawiki lines, and most of those
+lines (the HED header, section markers, and the end markers) repeat across
+cases. The compact form stores each distinct skeleton once, keyed by a hash
+of its content, and each sub-test as the skeleton key plus the lines it
+replaces or inserts. Expansion restores the original line lists exactly.
+
+A line belongs to a sub-test's skeleton if it appears in at least
+MIN_LINE_SHARE of all schema sub-tests. The compact file has the form:
+
+    {
+        "format": 1,
+        "skeletons": {"<key>": ["HED version=\\"1.0.0\\"", "'''Prologue'''", ...]},
+        "tests": [<test case whose schema_tests payloads are deltas>, ...]
+    }
+
+where each delta is {"skeleton": "<key>", "ops": [[start, end, [lines]], ...]},
+meaning skeleton lines start..end are replaced by the given lines.
+
+Usage:
+    python src/scripts/schema_templates.py
+    python src/scripts/schema_templates.py --input json_test_data/schema_tests.json --output schema_tests_compact.json
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+try:
+    from .corpus import OUTCOMES, load_consolidated
+except ImportError:
+    from corpus import OUTCOMES, load_consolidated
+
+COMPACT_FORMAT = 1
+
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# Share of schema sub-tests a line must appear in to become part of a skeleton
+MIN_LINE_SHARE = 0.1
+
+
+def skeleton_key(lines: List[str]) -> str:
+    """Return the content key of a skeleton."""
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()[:16]
+
+
+def make_delta(skeleton: List[str], lines: List[str]) -> List[list]:
+    """
+    Return the operations that turn a skeleton into a line list.
+
+    Parameters:
+        skeleton (List[str]): Skeleton lines
+        lines (List[str]): Full sub-test lines
+
+    Returns:
+        List[list]: [start, end, replacement lines] for each changed skeleton range
+    """
+    matcher = difflib.SequenceMatcher(None, skeleton, lines, autojunk=False)
+    return [[i1, i2, lines[j1:j2]] for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+
+def apply_delta(skeleton: List[str], ops: List[list]) -> List[str]:
+    """
+    Rebuild a line list from its skeleton and delta.
+
+    Parameters:
+        skeleton (List[str]): Skeleton lines
+        ops (List[list]): Operations from make_delta
+
+    Returns:
+        List[str]: The original sub-test lines
+    """
+    lines = []
+    position = 0
+    for start, end, replacement in ops:
+        lines.extend(skeleton[position:start])
+        lines.extend(replacement)
+        position = end
+    lines.extend(skeleton[position:])
+    return lines
+
+
+def _schema_payloads(test_case: dict) -> Dict[str, list]:
+    """Return the schema_tests outcomes of a test case, or an empty dict."""
+    schema_tests = test_case.get("tests", {}).get("schema_tests", {})
+    return {outcome: schema_tests[outcome] for outcome in OUTCOMES if outcome in schema_tests}
+
+
+def compact_schema_tests(test_cases: List[dict], min_line_share: float = MIN_LINE_SHARE) -> dict:
+    """
+    Convert schema test cases to the compact skeleton-plus-delta form.
+
+    Parameters:
+        test_cases (List[dict]): Consolidated schema test cases
+        min_line_share (float): Share of sub-tests a line must appear in to be a skeleton line
+
+    Returns:
+        dict: Compact document with "format", "skeletons", and "tests"
+    """
+    payloads = [lines for test_case in test_cases for values in _schema_payloads(test_case).values() for lines in values]
+    line_counts = Counter(line for lines in payloads for line in set(lines))
+    threshold = max(1, min_line_share * len(payloads))
+
+    skeletons: Dict[str, List[str]] = {}
+    compact_cases = []
+    for test_case in test_cases:
+        outcomes = _schema_payloads(test_case)
+        if not outcomes:
+            compact_cases.append(test_case)
+            continue
+        schema_tests = dict(test_case["tests"]["schema_tests"])
+        for outcome, values in outcomes.items():
+            deltas = []
+            for lines in values:
+                skeleton = [line for line in lines if line_counts[line] >= threshold]
+                key = skeleton_key(skeleton)
+                skeletons.setdefault(key, skeleton)
+                deltas.append({"skeleton": key, "ops": make_delta(skeleton, lines)})
+            schema_tests[outcome] = deltas
+        compact_cases.append({**test_case, "tests": {**test_case["tests"], "schema_tests": schema_tests}})
+
+    return {"format": COMPACT_FORMAT, "skeletons": dict(sorted(skeletons.items())), "tests": compact_cases}
+
+
+def expand_schema_tests(compact: dict) -> List[dict]:
+    """
+    Restore schema test cases from the compact form.
+
+    Parameters:
+        compact (dict): Document produced by compact_schema_tests
+
+    Returns:
+        List[dict]: Test cases with full mediawiki line lists
+
+    Raises:
+        ValueError: If the document is not a supported compact file
+    """
+    if not isinstance(compact, dict) or compact.get("format") != COMPACT_FORMAT:
+        raise ValueError(f"Not a format {COMPACT_FORMAT} compact schema test file")
+    skeletons = compact["skeletons"]
+    test_cases = []
+    for test_case in compact["tests"]:
+        outcomes = _schema_payloads(test_case)
+        if not outcomes:
+            test_cases.append(test_case)
+            continue
+        schema_tests = dict(test_case["tests"]["schema_tests"])
+        for outcome, deltas in outcomes.items():
+            schema_tests[outcome] = [apply_delta(skeletons[delta["skeleton"]], delta["ops"]) for delta in deltas]
+        test_cases.append({**test_case, "tests": {**test_case["tests"], "schema_tests": schema_tests}})
+    return test_cases
+
+
+def load_compact(path: Path) -> List[dict]:
+    """
+    Load a compact schema test file and expand it.
+
+    Parameters:
+        path (Path): Path to a compact file
+
+    Returns:
+        List[dict]: Test cases with full mediawiki line lists
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return expand_schema_tests(json.load(f))
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function to write the compact schema test file.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Store schema tests as shared skeletons plus per-case deltas")
+    parser.add_argument("--input", type=str, default="json_test_data/schema_tests.json", help="Consolidated schema test file")
+    parser.add_argument("--output", type=str, default="json_test_data/schema_tests_compact.json", help="Compact output file")
+    args = parser.parse_args(arg_list)
+
+    # Get paths
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+    input_path = project_root / args.input
+    output_path = project_root / args.output
+
+    try:
+        test_cases = load_consolidated(input_path, snapshot=True)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: Failed to load {input_path}: {e}")
+        return 1
+
+    compact = compact_schema_tests(test_cases)
+    if expand_schema_tests(compact) != test_cases:
+        print("ERROR: Compact form does not expand to the original test cases")
+        return 1
+
+    # The compact file is a machine artifact, so skip the indentation that would undo the savings
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(_COMPACT_ENCODER.encode(compact))
+
+    lines = sum(len(lines) for test_case in test_cases for values in _schema_payloads(test_case).values() for lines in values)
+    skeleton_lines = sum(len(skeleton) for skeleton in compact["skeletons"].values())
+    delta_lines = sum(
+        len(op[2])
+        for test_case in compact["tests"]
+        for deltas in _schema_payloads(test_case).values()
+        for delta in deltas
+        for op in delta["ops"]
+    )
+    full_bytes = len(_COMPACT_ENCODER.encode(test_cases))
+    output_bytes = output_path.stat().st_size
+    print(f"Schema sub-test lines: {lines}")
+    print(f"Stored lines: {skeleton_lines} in {len(compact['skeletons'])} skeletons + {delta_lines} in deltas")
+    print(f"Size without indentation: {full_bytes / 1024:.1f} KB -> {output_bytes / 1024:.1f} KB")
+    print(f"Compact file written to: {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
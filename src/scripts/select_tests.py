@@ -0,0 +1,299 @@
+"""
+Select the HED tests affected by a validator change.
+
+A validator developer changing how Def/ or placeholder handling works wants
+to run only the tests that use such tags. The index command tokenizes every
+HED string in a consolidated file (string tests, sidecar HED values, the HED
+column of event tables, and definitions) and stores an inverted index from
+lowercase tag path prefixes to sub-test positions next to the file:
+
+    json_test_data/validation_tests.json -> json_test_data/validation_tests_tag_index.json
+
+The select command looks tags up in the index and writes a consolidated
+subset holding only the matching sub-tests. A tag in a test's definitions
+selects every sub-test of that test, and the key "#" selects every use of a
+placeholder. The index records the SHA-256 of the file it was built from and
+is rebuilt automatically when stale.
+
+Select can also pick whole test cases by error code: --code X --depth N
+selects the tests whose expected codes are within N steps of X in the
+error-code graph (see code_graph.py).
+
+Tags holding ASCII control characters (such as a stray backspace) are found
+while indexing and reported, since such a tag cannot be typed on the command
+line; select also names them when a requested tag matches one with the
+control characters removed.
+
+Usage:
+    python src/scripts/select_tests.py index
+    python src/scripts/select_tests.py select --tag Def --tag Onset
+    python src/scripts/select_tests.py select --tag Definition/Acc/# --output selected.json
+    python src/scripts/select_tests.py select --tag Duration --names
+    python src/scripts/select_tests.py select --code TAG_INVALID --depth 1 --names
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from .code_graph import load_code_graph, select_by_code
+    from .corpus import iter_subtests, load_consolidated
+    from .hed_tokens import CONTROL_CHARACTERS, DEFINITIONS, iter_case_hed, iter_tags, tag_prefixes
+    from .smoke_subset import build_subset
+except ImportError:
+    from code_graph import load_code_graph, select_by_code
+    from corpus import iter_subtests, load_consolidated
+    from hed_tokens import CONTROL_CHARACTERS, DEFINITIONS, iter_case_hed, iter_tags, tag_prefixes
+    from smoke_subset import build_subset
+
+INDEX_FORMAT = 2
+
+# A posting is (case position, test type, outcome, index); definitions use DEFINITIONS
+Posting = Tuple[int, str, str, int]
+
+
+def tag_index_path(path: Path) -> Path:
+    """Return the tag index path of a consolidated file."""
+    return path.with_name(f"{path.stem}_tag_index.json")
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 of a file's bytes."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def build_tag_index(test_cases: List[dict], control_tags: Optional[Dict[str, Set[str]]] = None) -> Dict[str, List[list]]:
+    """
+    Build the inverted index from tag prefixes to sub-test positions.
+
+    Parameters:
+        test_cases (List[dict]): Consolidated test cases
+        control_tags (Optional[Dict[str, Set[str]]]): Filled with the tags holding control characters
+                                                      and the names of the test cases that use them
+
+    Returns:
+        Dict[str, List[list]]: Sorted postings [case position, test type, outcome, index] by prefix
+    """
+    index: Dict[str, Set[Posting]] = defaultdict(set)
+    for case_position, test_case in enumerate(test_cases):
+        for source, hed_string in iter_case_hed(test_case):
+            posting = (case_position, *source)
+            for tag in iter_tags(hed_string):
+                for prefix in tag_prefixes(tag):
+                    index[prefix].add(posting)
+                if "#" in tag:
+                    index["#"].add(posting)
+                if control_tags is not None and CONTROL_CHARACTERS.search(tag):
+                    control_tags.setdefault(tag, set()).add(test_case.get("name", ""))
+    return {prefix: [list(posting) for posting in sorted(postings)] for prefix, postings in sorted(index.items())}
+
+
+def write_tag_index(path: Path, test_cases: Optional[List[dict]] = None) -> dict:
+    """
+    Build and write the tag index of a consolidated file.
+
+    Parameters:
+        path (Path): Path to a consolidated file
+        test_cases (Optional[List[dict]]): Already loaded test cases of the file
+
+    Returns:
+        dict: The index document
+    """
+    if test_cases is None:
+        test_cases = load_consolidated(path, snapshot=True)
+    control_tags: Dict[str, Set[str]] = {}
+    document = {"format": INDEX_FORMAT, "source": file_digest(path), "tags": build_tag_index(test_cases, control_tags)}
+    document["control_tags"] = {tag: sorted(names) for tag, names in sorted(control_tags.items())}
+    with open(tag_index_path(path), "w", encoding="utf-8") as f:
+        json.dump(document, f, separators=(",", ":"))
+    return document
+
+
+def load_tag_index(path: Path, test_cases: Optional[List[dict]] = None) -> dict:
+    """
+    Load the tag index of a consolidated file, rebuilding it if missing or stale.
+
+    Parameters:
+        path (Path): Path to a consolidated file
+        test_cases (Optional[List[dict]]): Already loaded test cases of the file
+
+    Returns:
+        dict: The index document
+    """
+    try:
+        with open(tag_index_path(path), "r", encoding="utf-8") as f:
+            document = json.load(f)
+        if document.get("format") == INDEX_FORMAT and document.get("source") == file_digest(path):
+            return document
+    except (OSError, ValueError, AttributeError):
+        pass
+    return write_tag_index(path, test_cases)
+
+
+def select_by_tags(tag_index: Dict[str, List[list]], test_cases: List[dict], tags: Iterable[str]) -> Set[Posting]:
+    """
+    Return the sub-tests that use any of the given tags or tag prefixes.
+
+    Parameters:
+        tag_index (Dict[str, List[list]]): Index from build_tag_index
+        test_cases (List[dict]): Test cases the index was built from
+        tags (Iterable[str]): Tags or tag path prefixes, matched without regard to case
+
+    Returns:
+        Set[Posting]: Selected (case position, test type, outcome, index)
+    """
+    selected: Set[Posting] = set()
+    for tag in tags:
+        for case_position, test_type, outcome, index in tag_index.get(tag.strip().lower().rstrip("/"), []):
+            if (test_type, outcome, index) == DEFINITIONS:
+                # Definitions apply to every sub-test of the case
+                selected.update((case_position, *subtest[:3]) for subtest in iter_subtests(test_cases[case_position]))
+            else:
+                selected.add((case_position, test_type, outcome, index))
+    return selected
+
+
+def select_by_names(test_cases: List[dict], names: Iterable[str]) -> Set[Posting]:
+    """
+    Return every sub-test of the named test cases.
+
+    Parameters:
+        test_cases (List[dict]): Consolidated test cases
+        names (Iterable[str]): Test case names
+
+    Returns:
+        Set[Posting]: Selected (case position, test type, outcome, index)
+    """
+    wanted = set(names)
+    return {
+        (case_position, test_type, outcome, index)
+        for case_position, test_case in enumerate(test_cases)
+        if test_case.get("name") in wanted
+        for test_type, outcome, index, _ in iter_subtests(test_case)
+    }
+
+
+def control_tag_matches(control_tags: Dict[str, List[str]], tag: str) -> List[str]:
+    """
+    Return the tags with control characters that match a requested tag once the control characters are removed.
+
+    Parameters:
+        control_tags (Dict[str, List[str]]): Tags with control characters from the index document
+        tag (str): Requested tag or tag path prefix
+
+    Returns:
+        List[str]: Matching tags with control characters
+    """
+    key = tag.strip().lower().rstrip("/")
+    return [
+        control_tag
+        for control_tag in control_tags
+        if key in tag_prefixes(CONTROL_CHARACTERS.sub("", control_tag)) and key not in tag_prefixes(control_tag)
+    ]
+
+
+def print_control_tags(control_tags: Dict[str, List[str]], file=None):
+    """Print the tags holding control characters and the test cases that use them."""
+    for tag, names in control_tags.items():
+        print(f"  {tag!r} in {', '.join(names)}", file=file)
+
+
+def run_index(args, input_path: Path) -> int:
+    """Build the tag index of the input file."""
+    try:
+        document = write_tag_index(input_path)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: Failed to index {input_path}: {e}")
+        return 1
+    postings = sum(len(p) for p in document["tags"].values())
+    print(f"Indexed {len(document['tags'])} tag prefixes ({postings} postings)")
+    if document["control_tags"]:
+        print(f"WARNING: Tags with control characters: {len(document['control_tags'])}")
+        print_control_tags(document["control_tags"])
+    print(f"Index written to: {tag_index_path(input_path)}")
+    return 0
+
+
+def run_select(args, input_path: Path) -> int:
+    """Write the subset of tests that match the selection."""
+    if not args.tag and not args.code:
+        print("ERROR: Give at least one --tag or --code")
+        return 1
+    try:
+        test_cases = load_consolidated(input_path, snapshot=True)
+        selected = set()
+        if args.tag:
+            document = load_tag_index(input_path, test_cases)
+            selected |= select_by_tags(document["tags"], test_cases, args.tag)
+            for tag in args.tag:
+                matches = control_tag_matches(document["control_tags"], tag)
+                if matches:
+                    # stderr keeps the --names output clean
+                    print(f"WARNING: {tag} matches tags only after removing their control characters:", file=sys.stderr)
+                    print_control_tags({match: document["control_tags"][match] for match in matches}, file=sys.stderr)
+        if args.code:
+            graph = load_code_graph(input_path, test_cases)
+            names = [name for code in args.code for name in select_by_code(graph, code, args.depth)]
+            selected |= select_by_names(test_cases, names)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: Failed to load {input_path}: {e}")
+        return 1
+
+    subset = build_subset(test_cases, selected)
+
+    if args.names:
+        for test_case in subset:
+            print(test_case.get("name", ""))
+        return 0
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(subset, f, indent=4)
+    print(f"Selected {len(selected)} sub-tests in {len(subset)} of {len(test_cases)} test cases")
+    print(f"Subset written to: {args.output}")
+    return 0
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function to index and select tests.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Select the HED tests affected by a validator change")
+    parser.add_argument("--input", type=str, default="json_test_data/validation_tests.json", help="Consolidated test file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("index", help="Build the tag index of the input file")
+
+    select_parser = subparsers.add_parser("select", help="Write the tests that use the given tags or error codes")
+    select_parser.add_argument("--tag", type=str, action="append", help="Tag or tag path prefix (repeatable)")
+    select_parser.add_argument("--code", type=str, action="append", help="Error code (repeatable)")
+    select_parser.add_argument(
+        "--depth", type=int, default=0, help="Include tests whose codes are within this many graph steps (default: 0)"
+    )
+    select_parser.add_argument(
+        "--output", type=str, default="selected_tests.json", help="Subset file (default: selected_tests.json)"
+    )
+    select_parser.add_argument("--names", action="store_true", help="Print the selected test names instead")
+
+    args = parser.parse_args(arg_list)
+
+    # Get paths
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+    input_path = project_root / args.input
+
+    if args.command == "index":
+        return run_index(args, input_path)
+    return run_select(args, input_path)
+
+
+if __name__ == "__main__":
+    exit(main())
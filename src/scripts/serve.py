@@ -0,0 +1,395 @@
+"""
+Serve the HED test suite over HTTP on localhost.
+
+Tools that look up test cases by name, error code, or schema version would
+otherwise each re-parse the consolidated files. This server loads them once,
+keeps an index of each, and answers JSON queries:
+
+    GET /                          Endpoints and the number of test cases of each file
+    GET /cases/<name>              One test case by name
+    GET /codes/<error code>        Test cases with the code as error_code or in alt_codes
+    GET /schemas/<version>         Test cases that list the schema version
+    GET /kinds/<kind>              Test cases with sub-tests of a kind (string, sidecar, event, combo, schema)
+    GET /dictionaries/<name>       A lookup dictionary such as validation_code_dict
+    GET /coverage                  Number of test cases, test types, and files of each error code
+
+Responses carry a strong ETag computed from the response body, so a client
+that sends If-None-Match gets 304 Not Modified while the data is unchanged,
+and are gzip-compressed for clients that accept it (per the q-values of
+Accept-Encoding). The compressed body is cached with the plain one and has its
+own ETag, the plain ETag with a "-gzip" suffix. Before answering, the
+server checks (at most once per --reload-interval) whether any source file
+changed, and reloads and re-indexes only the files that did.
+
+Usage:
+    python src/scripts/serve.py
+    python src/scripts/serve.py --port 8080
+    python src/scripts/serve.py --reload-interval 5 --verbose
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+try:
+    from .check_coverage import CoverageAnalyzer
+    from .corpus import CONSOLIDATED_FILES, kind_name, load_consolidated
+except ImportError:
+    from check_coverage import CoverageAnalyzer
+    from corpus import CONSOLIDATED_FILES, kind_name, load_consolidated
+
+DICTIONARY_NAMES = ["validation_code_dict", "validation_testname_dict", "schema_code_dict", "schema_testname_dict"]
+
+# Responses smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+# Most encoded responses kept; the oldest is dropped first
+MAX_CACHED_RESPONSES = 1024
+
+
+class CaseIndex:
+    """Test cases of one consolidated file and their lookup tables."""
+
+    def __init__(self, test_cases: List[dict]):
+        """
+        Index the test cases of one consolidated file.
+
+        Parameters:
+            test_cases (List[dict]): Test cases in file order
+        """
+        self.test_cases = test_cases
+        self.names: Dict[str, dict] = {}
+        self.codes: Dict[str, List[dict]] = defaultdict(list)
+        self.schemas: Dict[str, List[dict]] = defaultdict(list)
+        self.kinds: Dict[str, List[dict]] = defaultdict(list)
+        for test_case in test_cases:
+            self.names.setdefault(test_case.get("name", ""), test_case)
+            error_code = test_case.get("error_code", "UNKNOWN")
+            for code in [error_code] + [code for code in test_case.get("alt_codes", []) or [] if code != error_code]:
+                self.codes[code].append(test_case)
+            schema = test_case.get("schema", "")
+            for version in schema if isinstance(schema, list) else [schema] if schema else []:
+                self.schemas[version].append(test_case)
+            tests = test_case.get("tests", {})
+            for test_type, test_data in tests.items() if isinstance(tests, dict) else []:
+                if test_data:
+                    self.kinds[kind_name(test_type)].append(test_case)
+
+
+class CorpusService:
+    """In-memory test suite that answers queries and reloads changed files."""
+
+    def __init__(self, json_test_data_dir: Path, reload_interval: float = 1.0):
+        """
+        Initialize the service; call refresh() to load the files.
+
+        Parameters:
+            json_test_data_dir (Path): Path to the json_test_data directory
+            reload_interval (float): Minimum seconds between checks for changed files
+        """
+        self.json_test_data_dir = json_test_data_dir
+        self.reload_interval = reload_interval
+        self.corpora: Dict[str, CaseIndex] = {}
+        self.dictionaries: Dict[str, object] = {}
+        # Source file name -> (mtime_ns, size) when it was loaded
+        self.signatures: Dict[str, Tuple[int, int]] = {}
+        self.last_check = float("-inf")
+        self.coverage: Optional[dict] = None
+        # URL path without the query string -> (status, body, ETag, gzip body or None) of a 200 response;
+        # cleared when any file is reloaded
+        self.responses: Dict[str, Tuple[int, bytes, str, Optional[bytes]]] = {}
+        # Guards the loaded data and the cache; reentrant because response() queries while holding it
+        self.lock = threading.RLock()
+
+    def _sources(self) -> Dict[str, Path]:
+        """Return every source file by name."""
+        sources = {name: self.json_test_data_dir / name for name in CONSOLIDATED_FILES}
+        sources.update({f"{name}.json": self.json_test_data_dir / f"{name}.json" for name in DICTIONARY_NAMES})
+        return sources
+
+    def refresh(self, force: bool = False) -> List[str]:
+        """
+        Reload the source files that changed since they were loaded.
+
+        Parameters:
+            force (bool): Check the files even if the reload interval has not passed
+
+        Returns:
+            List[str]: Names of the files that were reloaded or dropped
+        """
+        with self.lock:
+            now = time.monotonic()
+            if not force and now - self.last_check < self.reload_interval:
+                return []
+            self.last_check = now
+
+            changed = []
+            for name, path in self._sources().items():
+                try:
+                    stat = path.stat()
+                    signature = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    signature = None
+                if signature == self.signatures.get(name):
+                    continue
+                self._load(name, path if signature else None)
+                if signature:
+                    self.signatures[name] = signature
+                else:
+                    self.signatures.pop(name, None)
+                changed.append(name)
+
+            if changed:
+                self.coverage = None
+                self.responses.clear()
+            return changed
+
+    def _load(self, name: str, path: Optional[Path]):
+        """Load and index one source file, or drop it if it is missing (path is None) or unreadable."""
+        key = name[: -len(".json")]
+        if path is None:
+            self.dictionaries.pop(key, None)
+            self.corpora.pop(name, None)
+            return
+        try:
+            if key in DICTIONARY_NAMES:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.dictionaries[key] = json.load(f)
+            else:
+                self.corpora[name] = CaseIndex(load_consolidated(path, snapshot=True))
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Could not load {name}: {e}")
+            self.dictionaries.pop(key, None)
+            self.corpora.pop(name, None)
+
+    def _find(self, table: str, key: str) -> List[dict]:
+        """Return the test cases listed under a key of one lookup table of every corpus."""
+        return [test_case for corpus in self.corpora.values() for test_case in getattr(corpus, table).get(key, [])]
+
+    def _coverage(self) -> dict:
+        """Return the coverage summary of the loaded test cases, computed once per reload."""
+        if self.coverage is None:
+            analyzer = CoverageAnalyzer(self.json_test_data_dir)
+            for name, corpus in self.corpora.items():
+                for test_case in corpus.test_cases:
+                    analyzer.add_test_case(test_case.get("error_code", "UNKNOWN"), test_case, Path(name), name)
+            codes = {
+                code: {
+                    "test_cases": data["test_cases"],
+                    "error_count": data["error_count"],
+                    "warning_count": data["warning_count"],
+                    "test_types": sorted(data["test_types"]),
+                    "schema_versions": sorted(data["schema_versions"]),
+                    "files": data["files"],
+                }
+                for code, data in sorted(analyzer.coverage_data.items())
+            }
+            self.coverage = {"summary": analyzer.get_summary(), "codes": codes}
+        return self.coverage
+
+    def query(self, path: str) -> Tuple[int, object]:
+        """
+        Answer a query.
+
+        Parameters:
+            path (str): Request path such as "/codes/TAG_INVALID"
+
+        Returns:
+            Tuple[int, object]: HTTP status and JSON-serializable result
+        """
+        with self.lock:
+            return self._query(urlsplit(path).path)
+
+    def _query(self, path: str) -> Tuple[int, object]:
+        """Answer a query for a URL path; the caller holds the lock."""
+        parts = [unquote(part) for part in path.split("/") if part]
+        if not parts:
+            return 200, {
+                "endpoints": ["/cases/<name>", "/codes/<code>", "/schemas/<version>", "/kinds/<kind>"]
+                + [f"/dictionaries/{name}" for name in DICTIONARY_NAMES]
+                + ["/coverage"],
+                "files": {name: len(corpus.test_cases) for name, corpus in self.corpora.items()},
+            }
+        if parts == ["coverage"]:
+            return 200, self._coverage()
+        if len(parts) != 2:
+            return 404, {"error": f"Unknown path: {path}"}
+
+        endpoint, key = parts
+        if endpoint == "cases":
+            for corpus in self.corpora.values():
+                if key in corpus.names:
+                    return 200, corpus.names[key]
+            return 404, {"error": f"No test case named {key}"}
+        if endpoint in ("codes", "schemas", "kinds"):
+            test_cases = self._find(endpoint, key)
+            return 200, {"count": len(test_cases), "test_cases": test_cases}
+        if endpoint == "dictionaries" and key in self.dictionaries:
+            return 200, self.dictionaries[key]
+        return 404, {"error": f"Unknown path: {path}"}
+
+    def response(self, path: str, accept_gzip: bool = False) -> Tuple[int, bytes, str, Optional[str]]:
+        """
+        Return the encoded response to a query, from the cache while no file changed.
+
+        The query and the cache update run under the lock, so a reload cannot
+        interleave with them and leave a stale body or ETag in the cache. Only
+        200 responses are cached, keyed by the URL path without the query string.
+        Bodies of at least GZIP_MIN_BYTES are compressed once, when they are cached.
+
+        Parameters:
+            path (str): Request path
+            accept_gzip (bool): Return the gzip-compressed body if there is one
+
+        Returns:
+            Tuple[int, bytes, str, Optional[str]]: HTTP status, body, quoted ETag of that body,
+                                                   and content encoding ("gzip" or None)
+        """
+        self.refresh()
+        key = urlsplit(path).path
+        with self.lock:
+            cached = self.responses.get(key)
+            if cached is None:
+                status, result = self._query(key)
+                body = json.dumps(result, ensure_ascii=False).encode("utf-8")
+                compressed = gzip.compress(body, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+                cached = (status, body, f'"{hashlib.sha256(body).hexdigest()[:32]}"', compressed)
+                if status == 200:
+                    if len(self.responses) >= MAX_CACHED_RESPONSES:
+                        del self.responses[next(iter(self.responses))]
+                    self.responses[key] = cached
+        status, body, etag, compressed = cached
+        if accept_gzip and compressed is not None:
+            # A strong validator must differ between content encodings
+            return status, compressed, f'{etag[:-1]}-gzip"', "gzip"
+        return status, body, etag, None
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Return whether an Accept-Encoding header allows gzip.
+
+    Parameters:
+        accept_encoding (str): Header value such as "gzip, br;q=0.5" or "gzip;q=0"
+
+    Returns:
+        bool: True if gzip, or "*" when gzip is not listed, has a q-value above 0
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def make_handler(service: CorpusService, verbose: bool = False) -> type:
+    """
+    Return a request handler class that answers from a service.
+
+    Parameters:
+        service (CorpusService): Service that answers the queries
+        verbose (bool): Log every request
+
+    Returns:
+        type: BaseHTTPRequestHandler subclass
+    """
+
+    class CorpusRequestHandler(BaseHTTPRequestHandler):
+        """Answer GET requests with JSON from the service."""
+
+        def do_GET(self):
+            accept_gzip = accepts_gzip(self.headers.get("Accept-Encoding", ""))
+            status, body, etag, encoding = service.response(self.path, accept_gzip=accept_gzip)
+            if status == 200 and etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Vary", "Accept-Encoding")
+                self.end_headers()
+                return
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return CorpusRequestHandler
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function to serve the test suite.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Serve HED test cases and indexes over HTTP on localhost")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=1.0,
+        help="Minimum seconds between checks for changed source files (default: 1.0)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(arg_list)
+
+    # Get paths
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+    json_test_data_dir = project_root / "json_test_data"
+
+    if not json_test_data_dir.exists():
+        print(f"ERROR: Test data directory not found: {json_test_data_dir}")
+        return 1
+
+    service = CorpusService(json_test_data_dir, reload_interval=args.reload_interval)
+    service.refresh(force=True)
+    case_count = sum(len(corpus.test_cases) for corpus in service.corpora.values())
+    print(f"Loaded {case_count} test cases from {len(service.corpora)} files")
+
+    try:
+        server = ThreadingHTTPServer((args.host, args.port), make_handler(service, verbose=args.verbose))
+    except OSError as e:
+        print(f"ERROR: Could not listen on {args.host}:{args.port}: {e}")
+        return 1
+    print(f"Serving on http://{args.host}:{server.server_address[1]}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,147 @@
+"""
+Split HED test cases into cost-balanced shards for parallel validator runs.
+
+Splitting by file is badly unbalanced because a few files hold most of the
+expensive event and combo tests. This script estimates the cost of every test
+case from its sub-test counts, event rows, and sidecar sizes, optionally
+refines the estimate with recorded timings, and assigns cases to shards with
+the longest-processing-time (LPT) greedy algorithm. The assignment depends
+only on the input, so the same input always produces the same shards.
+
+Usage:
+    python src/scripts/shard_tests.py --shards 4
+    python src/scripts/shard_tests.py --shards 4 --index 2
+    python src/scripts/shard_tests.py --shards 4 --format names --timings timings.json
+    python src/scripts/shard_tests.py --shards 3 --input json_test_data/schema_tests.json
+"""
+
+import argparse
+import heapq
+import json
+from pathlib import Path
+from typing import List
+
+try:
+    from .corpus import load_consolidated
+    from .cost_model import calibrate_costs, estimate_case_cost, load_timings
+except ImportError:
+    from corpus import load_consolidated
+    from cost_model import calibrate_costs, estimate_case_cost, load_timings
+
+
+def partition_lpt(costs: List[float], num_shards: int) -> List[List[int]]:
+    """
+    Partition items into shards with the longest-processing-time greedy algorithm.
+
+    Items are taken in decreasing order of cost, ties broken by position, and each
+    goes to the currently lightest shard, ties broken by shard number. The result
+    is within 4/3 of the optimal maximum shard cost.
+
+    Parameters:
+        costs (List[float]): Cost of each item
+        num_shards (int): Number of shards
+
+    Returns:
+        List[List[int]]: Item positions in each shard, in ascending order
+    """
+    if num_shards < 1:
+        raise ValueError("Number of shards must be at least 1")
+
+    shards = [[] for _ in range(num_shards)]
+    heap = [(0.0, shard) for shard in range(num_shards)]
+    for position in sorted(range(len(costs)), key=lambda i: (-costs[i], i)):
+        load, shard = heapq.heappop(heap)
+        shards[shard].append(position)
+        heapq.heappush(heap, (load + costs[position], shard))
+
+    return [sorted(positions) for positions in shards]
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function to shard a consolidated test file.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Split HED test cases into cost-balanced shards")
+    parser.add_argument("--shards", type=int, required=True, help="Number of shards")
+    parser.add_argument("--index", type=int, help="Only write this shard (1-based)")
+    parser.add_argument(
+        "--input",
+        type=str,
+        default="json_test_data/validation_tests.json",
+        help="Consolidated test file to shard (default: json_test_data/validation_tests.json)",
+    )
+    parser.add_argument("--output-dir", type=str, default="shards", help="Directory for shard files (default: shards)")
+    parser.add_argument(
+        "--format",
+        choices=["cases", "names"],
+        default="cases",
+        help="Write consolidated test files or lists of test names (default: cases)",
+    )
+    parser.add_argument("--timings", type=str, help="JSON file of recorded seconds by test case name")
+    args = parser.parse_args(arg_list)
+
+    if args.shards < 1:
+        print("ERROR: --shards must be at least 1")
+        return 1
+    if args.index is not None and not 1 <= args.index <= args.shards:
+        print(f"ERROR: --index must be between 1 and {args.shards}")
+        return 1
+
+    # Get paths (relative paths are resolved against the project root, as in the other scripts)
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+    input_path = project_root / args.input
+    output_dir = project_root / args.output_dir
+
+    try:
+        test_cases = load_consolidated(input_path, snapshot=True)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: Failed to load {input_path}: {e}")
+        return 1
+
+    # Estimate costs, refined by recorded timings keyed by test name
+    costs = [estimate_case_cost(test_case) for test_case in test_cases]
+    if args.timings:
+        try:
+            timings = load_timings(project_root / args.timings)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Failed to load timings: {e}")
+            return 1
+        estimates = {test_case.get("name", ""): cost for test_case, cost in zip(test_cases, costs, strict=True)}
+        calibrated = calibrate_costs(estimates, timings)
+        costs = [calibrated[test_case.get("name", "")] for test_case in test_cases]
+
+    shards = partition_lpt(costs, args.shards)
+
+    # Write shard files
+    output_dir.mkdir(parents=True, exist_ok=True)
+    width = len(str(args.shards))
+    suffix = ".json" if args.format == "cases" else ".txt"
+    print(f"Sharding {len(test_cases)} test cases from {input_path.name} into {args.shards} shards")
+    for shard_number, positions in enumerate(shards, start=1):
+        load = sum(costs[i] for i in positions)
+        print(f"  Shard {shard_number:>{width}}: {len(positions):>5} cases, cost {load:10.1f}")
+        if args.index is not None and shard_number != args.index:
+            continue
+
+        shard_path = output_dir / f"{input_path.stem}_shard_{shard_number:0{width}d}_of_{args.shards}{suffix}"
+        with open(shard_path, "w", encoding="utf-8") as f:
+            if args.format == "cases":
+                json.dump([test_cases[i] for i in positions], f, indent=4)
+            else:
+                f.write("".join(f"{test_cases[i].get('name', '')}\n" for i in positions))
+
+    loads = [sum(costs[i] for i in positions) for positions in shards]
+    mean_load = sum(loads) / len(loads)
+    if mean_load > 0:
+        print(f"Imbalance (max / mean shard cost): {max(loads) / mean_load:.3f}")
+    print(f"Shard files written to: {output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
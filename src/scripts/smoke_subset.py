@@ -0,0 +1,215 @@
+"""
+Generate a minimal smoke-test subset of the HED test suite.
+
+The subset exercises every error code, every alternative code, and every
+sub-test kind (string, sidecar, event, combo, schema) with at least one
+passing and one failing sub-test, wherever the full suite has one. Sub-tests
+are chosen with a weighted greedy set cover that repeatedly picks the sub-test
+covering the most uncovered elements per unit of estimated cost.
+
+Usage:
+    python src/scripts/smoke_subset.py
+    python src/scripts/smoke_subset.py --output-dir smoke
+    python src/scripts/smoke_subset.py --input json_test_data/validation_tests.json
+"""
+
+import argparse
+import heapq
+import json
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+try:
+    from .corpus import CONSOLIDATED_FILES, OUTCOMES, iter_subtests, kind_name, load_consolidated
+    from .cost_model import CASE_OVERHEAD, estimate_case_cost, estimate_subtest_cost
+except ImportError:
+    from corpus import CONSOLIDATED_FILES, OUTCOMES, iter_subtests, kind_name, load_consolidated
+    from cost_model import CASE_OVERHEAD, estimate_case_cost, estimate_subtest_cost
+
+# A sub-test is identified by (file position, case position, test type, outcome, index)
+SubtestKey = Tuple[int, int, str, str, int]
+
+
+def coverage_elements(test_case: dict, test_type: str, outcome: str) -> Set[Tuple[str, str, str]]:
+    """
+    Return the coverage elements a sub-test exercises.
+
+    Parameters:
+        test_case (dict): Test case the sub-test belongs to
+        test_type (str): Test type such as "string_tests"
+        outcome (str): "fails" or "passes"
+
+    Returns:
+        Set[Tuple[str, str, str]]: Elements of the form (role, value, outcome) where
+        role is "error_code", "alt_code", or "kind"
+    """
+    elements = {("error_code", test_case.get("error_code", "UNKNOWN"), outcome), ("kind", kind_name(test_type), outcome)}
+    for alt_code in test_case.get("alt_codes", []) or []:
+        elements.add(("alt_code", alt_code, outcome))
+    return elements
+
+
+def greedy_set_cover(candidates: List[Tuple[float, Set]]) -> List[int]:
+    """
+    Choose candidates that cover every element with a weighted greedy set cover.
+
+    Each round picks the candidate with the most uncovered elements per unit of
+    cost, ties broken by position. Lazy evaluation keeps stale ratios in a heap and
+    only rescores the top candidate, which is valid because ratios never increase.
+
+    Parameters:
+        candidates (List[Tuple[float, Set]]): (cost, covered elements) of each candidate
+
+    Returns:
+        List[int]: Positions of the chosen candidates in the order they were picked
+    """
+    uncovered = set().union(*(elements for _, elements in candidates)) if candidates else set()
+    heap = [(-len(elements) / max(cost, 1e-9), i) for i, (cost, elements) in enumerate(candidates) if elements]
+    heapq.heapify(heap)
+
+    chosen = []
+    while uncovered and heap:
+        neg_ratio, i = heapq.heappop(heap)
+        cost, elements = candidates[i]
+        gain = len(elements & uncovered)
+        if gain == 0:
+            continue
+        ratio = gain / max(cost, 1e-9)
+        if heap and -ratio > heap[0][0]:
+            # Stale score: push back with the current ratio and try the next best
+            heapq.heappush(heap, (-ratio, i))
+            continue
+        chosen.append(i)
+        uncovered -= elements
+    return chosen
+
+
+def build_subset(test_cases: List[dict], selected: Set[Tuple[int, str, str, int]]) -> List[dict]:
+    """
+    Build test cases that keep only the selected sub-tests.
+
+    Parameters:
+        test_cases (List[dict]): Test cases in file order
+        selected (Set[Tuple[int, str, str, int]]): (case position, test type, outcome, index) to keep
+
+    Returns:
+        List[dict]: Trimmed copies of the test cases that have a selected sub-test, in file order
+    """
+    subset = []
+    for position, test_case in enumerate(test_cases):
+        tests = {}
+        for test_type, test_data in test_case.get("tests", {}).items():
+            kept = {}
+            for outcome in OUTCOMES:
+                payloads = [
+                    payload
+                    for index, payload in enumerate(test_data.get(outcome, []))
+                    if (position, test_type, outcome, index) in selected
+                ]
+                if payloads:
+                    kept[outcome] = payloads
+            if kept:
+                tests[test_type] = kept
+        if tests:
+            subset.append({**test_case, "tests": tests})
+    return subset
+
+
+def select_smoke_subset(corpora: List[List[dict]]) -> Tuple[List[List[dict]], int, int]:
+    """
+    Select a smoke subset from one or more consolidated test lists.
+
+    Parameters:
+        corpora (List[List[dict]]): Test cases of each consolidated file
+
+    Returns:
+        Tuple[List[List[dict]], int, int]: (subset of each file, elements covered, sub-tests chosen)
+    """
+    keys: List[SubtestKey] = []
+    candidates = []
+    for file_position, test_cases in enumerate(corpora):
+        for case_position, test_case in enumerate(test_cases):
+            for test_type, outcome, index, payload in iter_subtests(test_case):
+                keys.append((file_position, case_position, test_type, outcome, index))
+                cost = estimate_subtest_cost(test_type, payload) + CASE_OVERHEAD
+                candidates.append((cost, coverage_elements(test_case, test_type, outcome)))
+
+    chosen = greedy_set_cover(candidates)
+    covered = set().union(*(candidates[i][1] for i in chosen)) if chosen else set()
+
+    selected: Dict[int, Set[Tuple[int, str, str, int]]] = {i: set() for i in range(len(corpora))}
+    for i in chosen:
+        file_position, *rest = keys[i]
+        selected[file_position].add(tuple(rest))
+
+    subsets = [build_subset(test_cases, selected[i]) for i, test_cases in enumerate(corpora)]
+    return subsets, len(covered), len(chosen)
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function to generate the smoke subset.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Generate a minimal smoke-test subset covering every code and kind")
+    parser.add_argument(
+        "--input",
+        type=str,
+        nargs="+",
+        help="Consolidated test files (default: json_test_data/validation_tests.json and schema_tests.json)",
+    )
+    parser.add_argument("--output-dir", type=str, default="smoke", help="Directory for subset files (default: smoke)")
+    parser.add_argument("--dry-run", action="store_true", help="Report the subset without writing files")
+    args = parser.parse_args(arg_list)
+
+    # Get paths (relative paths are resolved against the project root, as in the other scripts)
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+    if args.input:
+        input_paths = [project_root / path for path in args.input]
+    else:
+        input_paths = [project_root / "json_test_data" / name for name in CONSOLIDATED_FILES]
+    output_dir = project_root / args.output_dir
+
+    corpora = []
+    for input_path in input_paths:
+        try:
+            corpora.append(load_consolidated(input_path, snapshot=True))
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Failed to load {input_path}: {e}")
+            return 1
+
+    subsets, covered, chosen = select_smoke_subset(corpora)
+
+    total_subtests = sum(1 for test_cases in corpora for test_case in test_cases for _ in iter_subtests(test_case))
+    full_cost = sum(estimate_case_cost(test_case) for test_cases in corpora for test_case in test_cases)
+    subset_cost = sum(estimate_case_cost(test_case) for subset in subsets for test_case in subset)
+
+    print("Smoke subset")
+    print(f"  Coverage elements: {covered} (error codes, alt codes, and kinds x pass/fail)")
+    print(f"  Sub-tests: {chosen} of {total_subtests}")
+    print(f"  Test cases: {sum(len(s) for s in subsets)} of {sum(len(c) for c in corpora)}")
+    if full_cost > 0:
+        print(
+            f"  Estimated cost: {subset_cost:.1f} of {full_cost:.1f} "
+            f"({100 * (1 - subset_cost / full_cost):.1f}% reduction)"
+        )
+
+    if args.dry_run:
+        print("[DRY RUN] No files written")
+        return 0
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for input_path, subset in zip(input_paths, subsets, strict=True):
+        output_path = output_dir / f"{input_path.stem}_smoke.json"
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(subset, f, indent=4)
+        print(f"  Wrote {len(subset)} test cases to {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -13,35 +13,47 @@ Usage:
     python src/scripts/validate_test_structure.py json_test_data/validation_tests
     python src/scripts/validate_test_structure.py --file <path>
     python src/scripts/validate_test_structure.py --verbose
+    python src/scripts/validate_test_structure.py --stream
+    python src/scripts/validate_test_structure.py --since origin/main
+    python src/scripts/validate_test_structure.py --metrics metrics.jsonl
 """
 
 import argparse
 import json
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 try:
-    from jsonschema import Draft7Validator
+    from .git_changes import GitError, get_changes
+    from .hooks import HOOKS, close_metrics, file_size, open_metrics, start_span
+    from .json_stream import NotAnArrayError, iter_json_array
 except ImportError:
-    print("ERROR: jsonschema package not installed")
-    print("Install with: pip install jsonschema")
-    sys.exit(1)
+    from git_changes import GitError, get_changes
+    from hooks import HOOKS, close_metrics, file_size, open_metrics, start_span
+    from json_stream import NotAnArrayError, iter_json_array
 
 
 class TestValidator:
     """Validator for HED test files."""
 
-    def __init__(self, schema_path: Path):
+    def __init__(self, schema_path: Path, stream: bool = False):
         """
         Initialize the validator with the JSON schema.
 
         Parameters:
             schema_path (Path): Path to the test schema JSON file
+            stream (bool): Whether to parse and validate files one test case at a time
         """
+        # jsonschema is slow to import, so only load it when a validator is needed
+        from jsonschema import Draft7Validator
+
         self.schema_path = schema_path
         self.schema = self._load_schema()
         self.validator = Draft7Validator(self.schema)
+        self.stream = stream
+        # Validator for a single test case, used when streaming through a file
+        self.item_validator = Draft7Validator(self.schema.get("items", {}))
 
     def _load_schema(self) -> dict:
         """Load the JSON schema from file."""
@@ -61,12 +73,25 @@ class TestValidator:
         Returns:
             Tuple[bool, List[str]]: (is_valid, list_of_errors)
         """
-        errors = []
-
+        span = start_span("validate.file", file=str(test_file), bytes=file_size(test_file)) if HOOKS else None
+        is_valid, errors = self._validate_file(test_file)
+        if span:
+            span.end(valid=is_valid, errors=len(errors))
+        return is_valid, errors
+
+    def _validate_file(self, test_file: Path) -> Tuple[bool, List[str]]:
+        """Validate a single test file without emitting events."""
         # Check file exists
         if not test_file.exists():
             return False, [f"File not found: {test_file}"]
 
+        if self.stream:
+            try:
+                return self._validate_file_streaming(test_file)
+            except NotAnArrayError:
+                # Not a test case array, so let the whole-document schema report it
+                pass
+
         # Load and parse JSON
         try:
             with open(test_file, "r", encoding="utf-8") as f:
@@ -76,6 +101,20 @@ class TestValidator:
         except Exception as e:
             return False, [f"Error reading file: {e}"]
 
+        return self.validate_data(data)
+
+    def validate_data(self, data) -> Tuple[bool, List[str]]:
+        """
+        Validate the already parsed contents of a test file.
+
+        Parameters:
+            data: Decoded JSON document of the test file
+
+        Returns:
+            Tuple[bool, List[str]]: (is_valid, list_of_errors)
+        """
+        errors = []
+
         # Validate against schema
         validation_errors = list(self.validator.iter_errors(data))
 
@@ -87,6 +126,43 @@ class TestValidator:
 
         return len(errors) == 0, errors
 
+    def _validate_file_streaming(self, test_file: Path) -> Tuple[bool, List[str]]:
+        """
+        Validate a test file one test case at a time.
+
+        Each test case is checked against the schema's ``items`` subschema and then
+        released, so memory use is bounded by the largest test case in the file.
+        Error paths are reported relative to the array index, matching validate_file.
+
+        Parameters:
+            test_file (Path): Path to the test file
+
+        Returns:
+            Tuple[bool, List[str]]: (is_valid, list_of_errors)
+        """
+        errors = []
+        count = 0
+        try:
+            with open(test_file, "r", encoding="utf-8") as f:
+                for index, test_case in iter_json_array(f):
+                    count += 1
+                    for error in self.item_validator.iter_errors(test_case):
+                        path = " -> ".join(str(p) for p in [index, *error.path])
+                        errors.append(f"  [{path}] {error.message}")
+        except json.JSONDecodeError as e:
+            return False, [f"JSON syntax error: {e}"]
+        except NotAnArrayError:
+            raise
+        except Exception as e:
+            return False, [f"Error reading file: {e}"]
+
+        # Array-level constraints such as minItems only matter for an empty file
+        if count == 0:
+            for error in self.validator.iter_errors([]):
+                errors.append(f"  [root] {error.message}")
+
+        return len(errors) == 0, errors
+
     def validate_directory(self, directory: Path, recursive: bool = False) -> Dict[str, Tuple[bool, List[str]]]:
         """
         Validate all JSON files in a directory.
@@ -114,6 +190,15 @@ class TestValidator:
                 "validation_testname_dict.json",
                 "schema_code_dict.json",
                 "schema_testname_dict.json",
+                "validation_tests_lean.json",
+                "validation_tests_metadata.json",
+                "schema_tests_lean.json",
+                "schema_tests_metadata.json",
+                "schema_tests_compact.json",
+                "validation_tests_tag_index.json",
+                "schema_tests_tag_index.json",
+                "validation_code_graph.json",
+                "schema_code_graph.json",
             ]:
                 continue
 
@@ -122,6 +207,22 @@ class TestValidator:
 
         return results
 
+    def validate_files(self, test_files: List[Path], root: Path) -> Dict[str, Tuple[bool, List[str]]]:
+        """
+        Validate a list of test files.
+
+        Parameters:
+            test_files (List[Path]): Test files to validate
+            root (Path): Directory that result keys are made relative to
+
+        Returns:
+            Dict[str, Tuple[bool, List[str]]]: Results by filename
+        """
+        results = {}
+        for test_file in sorted(test_files):
+            results[str(test_file.relative_to(root))] = self.validate_file(test_file)
+        return results
+
 
 def print_results(results: Dict[str, Tuple[bool, List[str]]], verbose: bool = False):
     """
@@ -164,8 +265,51 @@ def print_results(results: Dict[str, Tuple[bool, List[str]]], verbose: bool = Fa
     print("=" * 70)
 
 
-def main():
-    """Main function."""
+def validate_changed_files(
+    validator: TestValidator, project_root: Path, since: str, directory: Optional[str] = None
+) -> Optional[Dict[str, Tuple[bool, List[str]]]]:
+    """
+    Validate the test files changed since a git reference.
+
+    Parameters:
+        validator (TestValidator): Validator to use
+        project_root (Path): Root of the hed-tests repository
+        since (str): Git reference to compare the working tree against
+        directory (Optional[str]): Restrict validation to this test directory
+
+    Returns:
+        Optional[Dict[str, Tuple[bool, List[str]]]]: Results by filename, or None if
+        every file must be validated because git failed or the schema or scripts changed
+    """
+    try:
+        changes = get_changes(project_root, since)
+    except GitError as e:
+        print(f"WARNING: {e}; validating all files")
+        return None
+
+    if changes.requires_full_run:
+        print(f"Schema or scripts changed since {since}; validating all files:")
+        for reason in changes.full_run_reasons:
+            print(f"  - {reason}")
+        return None
+
+    if directory:
+        changes = changes.in_directory(Path(directory))
+
+    print(f"Validating {len(changes.changed)} file(s) changed since {since}")
+    for deleted in changes.deleted:
+        print(f"  Deleted: {deleted.relative_to(project_root)}")
+    return validator.validate_files(changes.changed, project_root)
+
+
+def main(arg_list: List[str] = None):
+    """
+    Main function.
+
+    Parameters:
+        arg_list: Optional list of command-line arguments to parse.
+                  If None, uses sys.argv.
+    """
     parser = argparse.ArgumentParser(description="Validate HED test files against JSON schema")
     parser.add_argument(
         "directory", type=str, nargs="?", help="Directory to validate (default: validate all test directories)"
@@ -173,8 +317,13 @@ def main():
     parser.add_argument("--file", type=str, help="Validate a specific file")
     parser.add_argument("--verbose", "-v", action="store_true", help="Show details for passing files")
     parser.add_argument("--schema", type=str, help="Path to schema file (default: src/schemas/test_schema.json)")
+    parser.add_argument(
+        "--stream", action="store_true", help="Parse files incrementally, one test case at a time (for very large files)"
+    )
+    parser.add_argument("--since", type=str, metavar="GIT_REF", help="Only validate test files changed since a git reference")
+    parser.add_argument("--metrics", type=str, help="Append per-file validation timing events to this JSON-lines file")
 
-    args = parser.parse_args()
+    args = parser.parse_args(arg_list)
 
     # Get project root and paths
     script_dir = Path(__file__).parent
@@ -191,60 +340,77 @@ def main():
 
     # Create validator
     try:
-        validator = TestValidator(schema_path)
+        validator = TestValidator(schema_path, stream=args.stream)
+    except ImportError:
+        print("ERROR: jsonschema package not installed")
+        print("Install with: pip install jsonschema")
+        return 1
     except Exception as e:
         print(f"ERROR: Failed to load schema: {e}")
         return 1
 
-    # Validate
-    if args.file:
-        # Validate single file
-        test_file = Path(args.file)
-        is_valid, errors = validator.validate_file(test_file)
+    metrics = open_metrics(args.metrics)
+    try:
+        # Validate only changed files unless the schema or scripts changed
+        if args.since and not args.file:
+            results = validate_changed_files(validator, project_root, args.since, args.directory)
+            if results is not None:
+                print_results(results, verbose=args.verbose)
+                failed_count = sum(1 for is_valid, _ in results.values() if not is_valid)
+                return 1 if failed_count > 0 else 0
+
+        # Validate
+        if args.file:
+            # Validate single file
+            test_file = Path(args.file)
+            is_valid, errors = validator.validate_file(test_file)
 
-        if is_valid:
-            print(f"[PASS] {test_file} is valid")
-            return 0
+            if is_valid:
+                print(f"[PASS] {test_file} is valid")
+                return 0
+            else:
+                print(f"[FAIL] {test_file} is invalid:")
+                for error in errors:
+                    print(f"   {error}")
+                return 1
+        elif args.directory:
+            # Validate specified directory
+            target_dir = Path(args.directory)
+            if not target_dir.exists():
+                print(f"ERROR: Directory not found: {target_dir}")
+                return 1
+
+            results = validator.validate_directory(target_dir)
+
+            # Print results
+            print_results(results, verbose=args.verbose)
+
+            # Exit with error if any failures
+            failed_count = sum(1 for is_valid, _ in results.values() if not is_valid)
+            return 1 if failed_count > 0 else 0
         else:
-            print(f"[FAIL] {test_file} is invalid:")
-            for error in errors:
-                print(f"   {error}")
-            return 1
-    elif args.directory:
-        # Validate specified directory
-        target_dir = Path(args.directory)
-        if not target_dir.exists():
-            print(f"ERROR: Directory not found: {target_dir}")
-            return 1
-
-        results = validator.validate_directory(target_dir)
-
-        # Print results
-        print_results(results, verbose=args.verbose)
-
-        # Exit with error if any failures
-        failed_count = sum(1 for is_valid, _ in results.values() if not is_valid)
-        return 1 if failed_count > 0 else 0
-    else:
-        # Validate all files
-        results = {}
+            # Validate all files
+            results = {}
+
+            # Validate validation_tests
+            validation_tests_dir = json_test_data_dir / "validation_tests"
+            if validation_tests_dir.exists():
+                results.update(validator.validate_directory(validation_tests_dir))
 
-        # Validate validation_tests
-        validation_tests_dir = json_test_data_dir / "validation_tests"
-        if validation_tests_dir.exists():
-            results.update(validator.validate_directory(validation_tests_dir))
+            # Validate schema_tests
+            schema_tests_dir = json_test_data_dir / "schema_tests"
+            if schema_tests_dir.exists():
+                results.update(validator.validate_directory(schema_tests_dir))
 
-        # Validate schema_tests
-        schema_tests_dir = json_test_data_dir / "schema_tests"
-        if schema_tests_dir.exists():
-            results.update(validator.validate_directory(schema_tests_dir))
+            # Print results
+            print_results(results, verbose=args.verbose)
 
-        # Print results
-        print_results(results, verbose=args.verbose)
+            # Exit with error if any failures
+            failed_count = sum(1 for is_valid, _ in results.values() if not is_valid)
+            return 1 if failed_count > 0 else 0
 
-        # Exit with error if any failures
-        failed_count = sum(1 for is_valid, _ in results.values() if not is_valid)
-        return 1 if failed_count > 0 else 0
+    finally:
+        close_metrics(metrics)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+"""
+Unit tests for the build.py script.
+
+Tests that the single-pass stages parse each test file once and produce the
+same outputs as the standalone scripts.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from src.scripts import generate_test_index, validate_test_structure
+from src.scripts.build import (
+    EXCLUDE_PREFIXES,
+    ConsolidateStage,
+    CoverageStage,
+    DictionariesStage,
+    IndexStage,
+    ValidateStage,
+    finish_stages,
+    run_stages,
+)
+from src.scripts.check_coverage import CoverageAnalyzer
+from src.scripts.consolidate_tests import combine_tests
+from src.scripts.memory_profile import MemoryProfile, exceeds_threshold
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SOURCE_DATA = PROJECT_ROOT / "json_test_data"
+SCHEMA_PATH = PROJECT_ROOT / "src" / "schemas" / "test_schema.json"
+
+
+class TestBuild(unittest.TestCase):
+    """Test the single-pass build against the standalone scripts."""
+
+    def setUp(self):
+        """Copy a few test files into a temporary json_test_data directory."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.data_dir = self.temp_dir / "json_test_data"
+        for category, names in [
+            ("validation_tests", ["CHARACTER_INVALID.json", "COMMA_MISSING.json"]),
+            ("schema_tests", ["SCHEMA_ATTRIBUTE_INVALID.json"]),
+        ]:
+            (self.data_dir / category).mkdir(parents=True)
+            for name in names:
+                shutil.copy(SOURCE_DATA / category / name, self.data_dir / category / name)
+        shutil.copy(
+            SOURCE_DATA / "validation_tests" / "COMMA_MISSING.json",
+            self.data_dir / "validation_tests" / "VERSION_DEPRECATED_COMMA.json",
+        )
+        (self.data_dir / "validation_tests" / "BROKEN.json").write_text("[{", encoding="utf-8")
+        self.validator = validate_test_structure.TestValidator(SCHEMA_PATH)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def _build(self, profile=None):
+        """Run every stage over the temporary directory."""
+        consolidate = ConsolidateStage(self.data_dir, EXCLUDE_PREFIXES)
+        stages = [
+            ValidateStage(self.validator, self.temp_dir),
+            consolidate,
+            DictionariesStage(consolidate),
+            IndexStage(self.data_dir, self.temp_dir / "test_index.md"),
+            CoverageStage(self.data_dir),
+        ]
+        with redirect_stdout(StringIO()):
+            timings = run_stages(self.data_dir, stages, profile)
+            failed = finish_stages(stages, timings, profile)
+        return stages, failed
+
+    def test_each_file_parsed_once(self):
+        """Test that the walk decodes every test file exactly once."""
+        with patch("src.scripts.build.json.load", wraps=json.load) as load:
+            self._build()
+        self.assertEqual(load.call_count, 5)
+
+    def test_outputs_match_scripts(self):
+        """Test that each stage produces what its standalone script produces."""
+        stages, failed = self._build()
+        validate, consolidate, _, index, coverage = stages
+        self.assertEqual(failed, ["validate", "consolidate"])
+
+        expected_dir = self.temp_dir / "expected"
+        expected_results = {}
+        with redirect_stdout(StringIO()):
+            for category in ["validation", "schema"]:
+                expected_results.update(self.validator.validate_directory(self.data_dir / f"{category}_tests"))
+                _, stats = combine_tests(
+                    self.data_dir / f"{category}_tests", expected_dir / f"{category}_tests.json", EXCLUDE_PREFIXES
+                )
+                self.assertEqual(
+                    (expected_dir / f"{category}_tests.json").read_text(encoding="utf-8"),
+                    (self.data_dir / f"{category}_tests.json").read_text(encoding="utf-8"),
+                )
+                self.assertEqual(stats.errors, consolidate.stats[category].errors)
+                with open(self.data_dir / f"{category}_testname_dict.json", "r", encoding="utf-8") as f:
+                    self.assertEqual(json.load(f), stats.name_dict)
+
+            generator = generate_test_index.TestIndexGenerator(self.data_dir)
+            generator.generate()
+            analyzer = CoverageAnalyzer(self.data_dir)
+            analyzer.analyze()
+
+        self.assertEqual(validate.results, expected_results)
+        self.assertEqual(index.generator.index_data, generator.index_data)
+        self.assertEqual(dict(coverage.analyzer.coverage_data), dict(analyzer.coverage_data))
+        self.assertTrue((self.data_dir / "validation_tests_lean.json").exists())
+        self.assertTrue((self.data_dir / "schema_code_graph.json").exists())
+
+    def test_duplicate_across_categories(self):
+        """Test that a test name used in both categories is reported as a duplicate, as consolidate does."""
+        with open(self.data_dir / "validation_tests" / "COMMA_MISSING.json", "r", encoding="utf-8") as f:
+            case = json.load(f)[0]
+        (self.data_dir / "schema_tests" / "SHARED_NAME.json").write_text(json.dumps([case]), encoding="utf-8")
+        consolidate = ConsolidateStage(self.data_dir, EXCLUDE_PREFIXES)
+        output = StringIO()
+        with redirect_stdout(output):
+            run_stages(self.data_dir, [consolidate])
+            self.assertFalse(consolidate.finish())
+        self.assertIn(f"Duplicate test case name: '{case['name']}'", output.getvalue())
+
+    def test_memory_profile(self):
+        """Test that a memory profile covers every stage and checks the bytes-per-case threshold."""
+        profile = MemoryProfile()
+        profile.start()
+        try:
+            stages, _ = self._build(profile)
+            sites = profile.top_sites(5)
+        finally:
+            profile.stop()
+
+        self.assertEqual(list(profile.stages), ["parse"] + [stage.name for stage in stages])
+        self.assertGreater(profile.stages["consolidate"]["retained"], 0)
+        self.assertEqual(profile.cases, len(stages[3].generator.index_data))
+        self.assertEqual(profile.peak, max(stage["peak"] for stage in profile.stages.values()))
+        self.assertTrue(0 < len(sites) <= 5)
+
+        self.assertFalse(exceeds_threshold(profile, None))
+        self.assertFalse(exceeds_threshold(profile, profile.bytes_per_case()))
+        self.assertTrue(exceeds_threshold(profile, profile.bytes_per_case() - 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Unit tests for the check_consistency.py script.
+
+Tests the global index, each cross-file rule, and the baseline of known violations.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.scripts.check_consistency import build_index, check_index, compare_baseline
+
+
+class TestCheckConsistency(unittest.TestCase):
+    """Test the cross-file consistency rules."""
+
+    def setUp(self):
+        """Create a temporary json_test_data directory with one violation of each rule."""
+        self.data_dir = Path(tempfile.mkdtemp())
+        validation_dir = self.data_dir / "validation_tests"
+        schema_dir = self.data_dir / "schema_tests"
+        validation_dir.mkdir()
+        schema_dir.mkdir()
+        self._write(
+            validation_dir / "TAG_INVALID.json",
+            [
+                {"name": "tag-a", "error_code": "TAG_INVALID", "alt_codes": ["UNITS_INVALID"]},
+                {"name": "tag-b", "error_code": "TAG_INVALID", "related_errors": ["NO_SUCH_CODE"]},
+            ],
+        )
+        self._write(
+            validation_dir / "UNITS_INVALID_EXTRA.json",
+            [
+                {"name": "units-a", "error_code": "UNITS_INVALID", "alt_codes": ["MISSING_CODE"]},
+                {"name": "units-b", "error_code": "TAG_INVALID"},
+            ],
+        )
+        self._write(schema_dir / "SCHEMA_LOAD_FAILED.json", [{"name": "tag-a", "error_code": "SCHEMA_LOAD_FAILED"}])
+        (schema_dir / "BROKEN.json").write_text("{", encoding="utf-8")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.data_dir)
+
+    @staticmethod
+    def _write(path: Path, test_cases: list):
+        """Write a test file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(test_cases, f)
+
+    def test_index(self):
+        """Test that the index records names, codes, and files across both directories."""
+        index = build_index(self.data_dir)
+        self.assertEqual((index.file_count, index.case_count), (3, 5))
+        self.assertEqual(
+            index.names["tag-a"], [("validation_tests/TAG_INVALID.json", 0), ("schema_tests/SCHEMA_LOAD_FAILED.json", 0)]
+        )
+        self.assertEqual(len(index.codes["TAG_INVALID"]), 3)
+        self.assertIn("schema_tests/BROKEN.json", index.unreadable)
+
+    def test_rules(self):
+        """Test that each rule reports its violation with the file and case position."""
+        violations = check_index(build_index(self.data_dir))
+        found = {(v["rule"], v["file"], v["position"]) for v in violations}
+        self.assertEqual(
+            found,
+            {
+                ("unreadable-file", "schema_tests/BROKEN.json", -1),
+                ("duplicate-name", "schema_tests/SCHEMA_LOAD_FAILED.json", 0),
+                ("unknown-related-code", "validation_tests/TAG_INVALID.json", 1),
+                ("unknown-alt-code", "validation_tests/UNITS_INVALID_EXTRA.json", 0),
+                ("file-code-mismatch", "validation_tests/UNITS_INVALID_EXTRA.json", 1),
+            },
+        )
+        self.assertEqual(violations, sorted(violations, key=lambda v: (v["file"], v["position"], v["rule"])))
+
+    def test_ignore(self):
+        """Test that ignored rules are not reported."""
+        violations = check_index(build_index(self.data_dir), ignore=["duplicate-name", "unreadable-file"])
+        self.assertEqual({v["rule"] for v in violations}, {"unknown-related-code", "unknown-alt-code", "file-code-mismatch"})
+
+    def test_string_codes(self):
+        """Test that a code written as a string is one reference, not one per character."""
+        self._write(
+            self.data_dir / "validation_tests" / "TAG_INVALID.json",
+            [{"name": "tag-a", "error_code": "TAG_INVALID", "alt_codes": "UNITS_INVALID", "related_errors": "NO_SUCH_CODE"}],
+        )
+        index = build_index(self.data_dir)
+        references = [(field, code) for field, code, location in index.references if location[0].endswith("TAG_INVALID.json")]
+        self.assertEqual(references, [("alt_codes", "UNITS_INVALID"), ("related_errors", "NO_SUCH_CODE")])
+
+    def test_baseline(self):
+        """Test that baseline violations are known, others are new, and unmatched entries are reported."""
+        violations = check_index(build_index(self.data_dir))
+        known = [{"rule": v["rule"], "file": v["file"], "message": v["message"]} for v in violations[1:]]
+        stale = {"rule": "duplicate-name", "file": "gone.json", "message": "fixed"}
+        new, fixed = compare_baseline(violations, known + [stale])
+        self.assertEqual(new, violations[:1])
+        self.assertEqual(fixed, [stale])
+        self.assertEqual(compare_baseline(violations, known + known[:1]), (violations[:1], known[:1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
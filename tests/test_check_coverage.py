@@ -0,0 +1,155 @@
+"""
+Unit tests for the schema tag coverage mode of check_coverage.py.
+
+Tests loading schema terms and counting the tags, units, and value classes
+the corpus uses.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.scripts.check_coverage import TagCoverageAnalyzer, load_schema_terms
+
+MEDIAWIKI_SCHEMA = """HED version="8.4.0"
+'''Prologue'''
+!# start schema
+'''Event''' {suggestedTag=Task-property} [Something that happens.]
+* Sensory-event [A sensory event.]
+'''Property''' {extensionAllowed}
+* Informational-property
+** Label {requireChild}
+*** # {takesValue, valueClass=nameClass}
+** Def {requireChild}
+*** # {takesValue, valueClass=nameClass}
+'''Attribute'''
+** Acceleration {requireChild}
+*** # {takesValue, unitClass=accelerationUnits}
+** Red
+!# end schema
+'''Unit classes'''
+* accelerationUnits {defaultUnits=m-per-s^2}
+** m-per-s^2 {SIUnit, unitSymbol}
+** g-force
+'''Unit modifiers'''
+* deca {SIUnitModifier}
+'''Value classes'''
+* nameClass {allowedCharacter=letters}
+* numericClass {allowedCharacter=digits}
+* textClass {allowedCharacter=text}
+'''Epilogue'''
+!# end hed
+"""
+
+XML_SCHEMA = """<?xml version="1.0" ?>
+<HED version="8.4.0">
+<schema>
+<node><name>Event</name><node><name>Sensory-event</name></node></node>
+<node><name>Property</name><node><name>Label</name><node><name>#</name>
+<attribute><name>valueClass</name><value>nameClass</value></attribute></node></node></node>
+</schema>
+<unitClassDefinitions>
+<unitClassDefinition><name>timeUnits</name><unit><name>s</name></unit><unit><name>minute</name></unit></unitClassDefinition>
+</unitClassDefinitions>
+<valueClassDefinitions>
+<valueClassDefinition><name>nameClass</name></valueClassDefinition>
+<valueClassDefinition><name>textClass</name></valueClassDefinition>
+</valueClassDefinitions>
+</HED>
+"""
+
+TEST_CASES = [
+    {
+        "name": "a",
+        "definitions": ["(Definition/Acc/#, (Acceleration/# m-per-s^2, Red))"],
+        "tests": {
+            "string_tests": {"fails": ["Red, Label/Temp, Bogus/Tag"], "passes": ["Red, Acceleration/4.5 m-per-s^2"]},
+            "event_tests": {"passes": [[["onset", "HED"], [1, "Sensory-event, Def/Acc/5"]]]},
+        },
+    }
+]
+
+
+class TestLoadSchemaTerms(unittest.TestCase):
+    """Test reading tag and unit names from schema files."""
+
+    def setUp(self):
+        """Create a temporary directory for schema files."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_mediawiki(self):
+        """Test a mediawiki schema."""
+        path = self.temp_dir / "HED8.4.0.mediawiki"
+        path.write_text(MEDIAWIKI_SCHEMA, encoding="utf-8")
+        tags, units, value_classes = load_schema_terms(path)
+        self.assertEqual(
+            tags,
+            {
+                "event",
+                "sensory-event",
+                "property",
+                "informational-property",
+                "label",
+                "def",
+                "attribute",
+                "acceleration",
+                "red",
+            },
+        )
+        self.assertEqual(units, {"m-per-s^2", "g-force"})
+        self.assertEqual(value_classes, {"nameClass": {"label", "def"}, "numericClass": set(), "textClass": set()})
+
+    def test_xml(self):
+        """Test an XML schema."""
+        path = self.temp_dir / "HED8.4.0.xml"
+        path.write_text(XML_SCHEMA, encoding="utf-8")
+        tags, units, value_classes = load_schema_terms(path)
+        self.assertEqual(tags, {"event", "sensory-event", "property", "label"})
+        self.assertEqual(units, {"s", "minute"})
+        self.assertEqual(value_classes, {"nameClass": {"label"}, "textClass": set()})
+
+    def test_unsupported(self):
+        """Test that other file types are rejected."""
+        with self.assertRaises(ValueError):
+            load_schema_terms(self.temp_dir / "schema.json")
+
+
+class TestTagCoverageAnalyzer(unittest.TestCase):
+    """Test counting tag and unit usage."""
+
+    def setUp(self):
+        """Analyze the sample corpus against the sample schema."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            path = temp_dir / "HED8.4.0.mediawiki"
+            path.write_text(MEDIAWIKI_SCHEMA, encoding="utf-8")
+            tags, units, value_classes = load_schema_terms(path)
+        finally:
+            shutil.rmtree(temp_dir)
+        self.analyzer = TagCoverageAnalyzer(tags, units, value_classes)
+        self.analyzer.analyze(TEST_CASES * 3)
+
+    def test_counts(self):
+        """Test that tags, units, and value classes are counted across repeated strings."""
+        self.assertEqual(self.analyzer.hed_strings, 12)
+        self.assertEqual(self.analyzer.tag_counts["red"], 9)
+        self.assertEqual(self.analyzer.tag_counts["def"], 3)
+        self.assertEqual(self.analyzer.unit_counts["m-per-s^2"], 6)
+        self.assertEqual(self.analyzer.unknown_tags["Bogus/Tag"], 3)
+        # Label/Temp takes nameClass; in Def/Acc/5 the value of Def is not the last segment
+        self.assertEqual(self.analyzer.value_class_counts, {"nameClass": 3})
+
+    def test_unexercised(self):
+        """Test the schema nodes and units the corpus never uses."""
+        self.assertEqual(self.analyzer.unexercised_tags(), ["attribute", "event", "informational-property", "property"])
+        self.assertEqual(self.analyzer.unexercised_units(), ["g-force"])
+        self.assertEqual(self.analyzer.unexercised_value_classes(), ["numericClass", "textClass"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
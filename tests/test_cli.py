@@ -0,0 +1,70 @@
+"""
+Unit tests for the cli.py script.
+
+Tests subcommand dispatch and that listing the commands imports no script modules.
+"""
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from src.scripts.cli import COMMANDS, load_command, main
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+class TestCli(unittest.TestCase):
+    """Test the hed-tests command."""
+
+    def test_every_command_has_main(self):
+        """Test that every subcommand resolves to a script with a main function."""
+        for command in COMMANDS:
+            with self.subTest(command=command):
+                self.assertTrue(callable(load_command(command).main))
+
+    def test_dispatch(self):
+        """Test that a subcommand runs its script's main with the remaining arguments."""
+        with patch("src.scripts.generate_test_index.main", return_value=0) as index_main:
+            self.assertEqual(main(["index", "--format", "json"]), 0)
+        index_main.assert_called_once_with(["--format", "json"])
+
+    def test_requires_checkout(self):
+        """Test that the command refuses to run scripts outside a checkout with test data."""
+        with tempfile.TemporaryDirectory() as temp_dir, patch("src.scripts.cli.PROJECT_ROOT", temp_dir):
+            output = StringIO()
+            with redirect_stdout(output), patch("src.scripts.generate_test_index.main") as index_main:
+                self.assertEqual(main(["index"]), 1)
+        index_main.assert_not_called()
+        self.assertIn("pip install -e .", output.getvalue())
+
+    def test_command_help(self):
+        """Test that a subcommand's help names the subcommand."""
+        output = StringIO()
+        with redirect_stdout(output), self.assertRaises(SystemExit) as context:
+            main(["index", "--help"])
+        self.assertEqual(context.exception.code, 0)
+        self.assertIn("usage: hed-tests index", output.getvalue())
+
+    def test_help_is_lazy(self):
+        """Test that --help imports neither the scripts nor jsonschema."""
+        code = (
+            "import sys\n"
+            "from src.scripts import cli\n"
+            "try:\n"
+            "    cli.main(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "loaded = [name for name in sys.modules if name == 'jsonschema' or name.startswith('src.scripts.')]\n"
+            "print('LOADED', sorted(loaded))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+        self.assertIn("LOADED ['src.scripts.cli']", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Unit tests for the code_graph.py module.
+
+Tests the error-code graph, its closure, and selection by code and depth.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.scripts.code_graph import (
+    build_closure,
+    build_edges,
+    code_graph_path,
+    load_code_graph,
+    select_by_code,
+    write_code_graph,
+)
+
+# A -alt- B -related- C, and D on its own
+NAME_DICT = {
+    "test-a": ["A", "B"],
+    "test-b": ["B"],
+    "test-c": ["C"],
+    "test-d": ["D"],
+}
+RELATED_DICT = {"test-b": ["C"]}
+
+
+class TestCodeGraph(unittest.TestCase):
+    """Test the graph and its closure."""
+
+    def test_edges(self):
+        """Test that alternative and related codes are connected both ways."""
+        edges = build_edges(NAME_DICT, RELATED_DICT)
+        self.assertEqual(edges, {"A": {"B"}, "B": {"A", "C"}, "C": {"B"}, "D": set()})
+
+    def test_closure_levels(self):
+        """Test that tests are grouped by their nearest code's distance."""
+        graph = build_closure(NAME_DICT, RELATED_DICT)
+        self.assertEqual(graph["tests_by_depth"]["A"], [["test-a"], ["test-b"], ["test-c"]])
+        self.assertEqual(graph["tests_by_depth"]["C"], [["test-c"], ["test-a", "test-b"]])
+        self.assertEqual(graph["tests_by_depth"]["D"], [["test-d"]])
+
+    def test_select(self):
+        """Test selection by depth."""
+        graph = build_closure(NAME_DICT, RELATED_DICT)
+        self.assertEqual(select_by_code(graph, "A"), ["test-a"])
+        self.assertEqual(select_by_code(graph, "A", depth=1), ["test-a", "test-b"])
+        self.assertEqual(select_by_code(graph, "A", depth=5), ["test-a", "test-b", "test-c"])
+        self.assertEqual(select_by_code(graph, "UNKNOWN", depth=2), [])
+
+    def test_stored_graph(self):
+        """Test that the stored graph is used while current and rebuilt when stale."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            path = temp_dir / "validation_tests.json"
+            path.write_text(json.dumps([{"name": "test-a", "error_code": "A", "alt_codes": ["B"]}]), encoding="utf-8")
+            write_code_graph(path, NAME_DICT, RELATED_DICT)
+            self.assertEqual(code_graph_path(path).name, "validation_code_graph.json")
+            self.assertIn("test-c", select_by_code(load_code_graph(path), "A", depth=2))
+
+            path.write_text(json.dumps([{"name": "test-x", "error_code": "A"}]), encoding="utf-8")
+            self.assertEqual(select_by_code(load_code_graph(path), "A", depth=2), ["test-x"])
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -6,8 +6,11 @@ validation, and error handling.
 """
 
 import json
+import shutil
 import tempfile
 import unittest
+from contextlib import redirect_stdout
+from io import StringIO
 from pathlib import Path
 from unittest.mock import patch
 
@@ -15,8 +18,14 @@ from src.scripts.consolidate_tests import (
     TestStatistics,
     combine_tests,
     main,
+    merge_changed_tests,
+    read_source_digests,
+    source_digests,
+    sources_path,
     validate_test_case,
+    write_lean_artifact,
 )
+from src.scripts.git_changes import ChangeSet, GitError
 
 
 class TestTestStatistics(unittest.TestCase):
@@ -149,6 +158,64 @@ class TestTestStatistics(unittest.TestCase):
         self.assertEqual(len(self.stats.errors), 1)
         self.assertEqual(self.stats.errors[0], "Test error")
 
+    def test_merge_matches_serial(self):
+        """Test that merging partitions in order matches adding every case to one object."""
+        cases = [
+            {"name": "a", "error_code": "B_CODE", "alt_codes": ["A_CODE"], "tests": {"string_tests": {"fails": ["x"]}}},
+            {"name": "b", "error_code": "A_CODE", "related_errors": ["C_CODE"], "tests": {}},
+            {"name": "a", "error_code": "C_CODE", "tests": {"event_tests": {"passes": [[]]}}},
+            {"name": "c", "error_code": "C_CODE", "tests": {}},
+        ]
+        for case in cases:
+            self.stats.add_test_case(case)
+
+        first, second = TestStatistics(), TestStatistics()
+        for case in cases[:2]:
+            first.add_test_case(case)
+        for case in cases[2:]:
+            second.add_test_case(case)
+        merged = TestStatistics().merge(first).merge(second)
+
+        self.assertEqual(merged.total_cases, self.stats.total_cases)
+        self.assertEqual(merged.error_codes, self.stats.error_codes)
+        self.assertEqual(merged.test_types, self.stats.test_types)
+        self.assertEqual(merged.errors, ["Duplicate test case name: 'a'"])
+        self.assertEqual(merged.errors, self.stats.errors)
+        self.assertEqual(list(merged.name_dict.items()), list(self.stats.name_dict.items()))
+        self.assertEqual(list(merged.code_dict.items()), list(self.stats.code_dict.items()))
+        self.assertEqual(merged.related_dict, self.stats.related_dict)
+
+    def test_merge_keeps_error_order(self):
+        """Test that a duplicate found by merge is reported before the later errors of its partition."""
+        first, second = TestStatistics(), TestStatistics()
+        first.add_test_case({"name": "a", "error_code": "A_CODE"})
+        second.add_error("before a")
+        second.add_test_case({"name": "a", "error_code": "A_CODE"})
+        second.add_error("after a")
+        second.add_test_case({"name": "b", "error_code": "B_CODE"})
+        second.add_error("after b")
+
+        merged = TestStatistics().merge(first).merge(second)
+        self.assertEqual(merged.errors, ["before a", "Duplicate test case name: 'a'", "after a", "after b"])
+        self.assertEqual(merged.error_positions, {"a": 0, "b": 3})
+
+    def test_combine_workers_error_order(self):
+        """Test that consolidating with workers reports errors in the same order as a serial run."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            case = {"name": "a", "error_code": "A_CODE", "description": "d", "tests": {"string_tests": {"passes": ["x"]}}}
+            (temp_dir / "A.json").write_text(json.dumps([case]), encoding="utf-8")
+            (temp_dir / "B.json").write_text(json.dumps([case, {"name": "b", "error_code": "bad"}]), encoding="utf-8")
+            errors = []
+            for workers in [1, 2]:
+                with redirect_stdout(StringIO()):
+                    _, stats = combine_tests(temp_dir, temp_dir / "out.json", dry_run=True, workers=workers)
+                errors.append(stats.errors)
+            self.assertEqual(errors[0][0], "Duplicate test case name: 'a'")
+            self.assertEqual(errors[0], errors[1])
+        finally:
+            shutil.rmtree(temp_dir)
+
 
 class TestValidateTestCase(unittest.TestCase):
     """Test the validate_test_case function."""
@@ -338,6 +405,70 @@ class TestCombineTests(unittest.TestCase):
         self.assertGreater(len(stats.errors), 0)
         self.assertTrue(any("JSON decode error" in err for err in stats.errors))
 
+    def test_stream_mode_matches_default(self):
+        """Test that streaming consolidation writes the same output as the default mode."""
+        self.create_test_file(
+            "test1.json",
+            [
+                {
+                    "error_code": "TAG_INVALID",
+                    "name": "test-1",
+                    "description": "Test 1",
+                    "tests": {"string_tests": {"fails": ["a"]}},
+                }
+            ],
+        )
+        self.create_test_file(
+            "test2.json",
+            [{"error_code": "VALUE_INVALID", "name": "test-2", "description": "Test 2", "tests": {"string_tests": {}}}],
+        )
+
+        default_path = self.output_dir / "default.json"
+        stream_path = self.output_dir / "stream.json"
+        default_count, default_stats = combine_tests(self.test_dir, default_path)
+        stream_count, stream_stats = combine_tests(self.test_dir, stream_path, stream=True)
+
+        self.assertEqual(stream_count, default_count)
+        self.assertEqual(stream_stats.name_dict, default_stats.name_dict)
+        self.assertEqual(stream_path.read_text(encoding="utf-8"), default_path.read_text(encoding="utf-8"))
+        self.assertFalse((self.output_dir / "stream.json.tmp").exists())
+
+    def test_workers_match_serial(self):
+        """Test that parallel consolidation writes the same output and statistics as a serial run."""
+        for index in range(4):
+            self.create_test_file(
+                f"test{index}.json",
+                [
+                    {
+                        "error_code": f"CODE_{index % 2}",
+                        "name": f"test-{index}-{position}",
+                        "description": "Test",
+                        "tests": {"string_tests": {"fails": [str(position)]}},
+                    }
+                    for position in range(3)
+                ],
+            )
+        self.create_test_file("test9.json", [{"error_code": "CODE_0", "name": "test-0-0", "description": "Duplicate"}])
+
+        serial_path = self.output_dir / "serial.json"
+        parallel_path = self.output_dir / "parallel.json"
+        serial_count, serial_stats = combine_tests(self.test_dir, serial_path)
+        parallel_count, parallel_stats = combine_tests(self.test_dir, parallel_path, workers=2)
+
+        self.assertEqual(parallel_count, serial_count)
+        self.assertEqual(parallel_path.read_text(encoding="utf-8"), serial_path.read_text(encoding="utf-8"))
+        self.assertEqual(list(parallel_stats.code_dict.items()), list(serial_stats.code_dict.items()))
+        self.assertEqual(sorted(parallel_stats.errors), sorted(serial_stats.errors))
+
+    def test_stream_mode_non_list_json_handling(self):
+        """Test that streaming mode also warns about non-list JSON files."""
+        self.create_test_file("invalid_structure.json", {"not": "a list"})
+
+        count, stats = combine_tests(self.test_dir, self.output_dir / "combined.json", stream=True)
+
+        self.assertEqual(count, 0)
+        self.assertTrue(any("does not contain a list" in warn for warn in stats.warnings))
+
     def test_non_list_json_handling(self):
         """Test that non-list JSON files generate warnings."""
         test_data = {"not": "a list"}  # Should be a list
@@ -351,6 +482,162 @@ class TestCombineTests(unittest.TestCase):
         self.assertTrue(any("does not contain a list" in warn for warn in stats.warnings))
 
 
+class TestWriteLeanArtifact(unittest.TestCase):
+    """Test the write_lean_artifact function."""
+
+    def test_split_is_lossless(self):
+        """Test that lean cases plus metadata rebuild the consolidated cases."""
+        test_cases = [
+            {
+                "error_code": "TAG_INVALID",
+                "alt_codes": ["VALUE_INVALID"],
+                "name": "test-1",
+                "description": "Test description",
+                "schema": "8.4.0",
+                "common_causes": ["cause"],
+                "explanation": "Why it fails",
+                "definitions": [],
+                "tests": {"string_tests": {"fails": ["x"]}},
+            },
+            {"error_code": "UNITS_INVALID", "name": "test-2", "schema": "8.4.0", "tests": {"string_tests": {"passes": ["y"]}}},
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            with open(root / "combined.json", "w", encoding="utf-8") as f:
+                json.dump(test_cases, f, indent=4)
+            report = write_lean_artifact(root / "combined.json", root / "lean.json", root / "metadata.json")
+            with open(root / "lean.json", "r", encoding="utf-8") as f:
+                lean = json.load(f)
+            with open(root / "metadata.json", "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+
+        self.assertNotIn("common_causes", lean[0])
+        self.assertNotIn("description", lean[0])
+        self.assertEqual(lean[0]["alt_codes"], ["VALUE_INVALID"])
+        self.assertEqual(metadata["test-1"]["explanation"], "Why it fails")
+        self.assertEqual(metadata["test-2"], {})
+        self.assertEqual([{**case, **metadata[case["name"]]} for case in lean], test_cases)
+        self.assertLess(report["lean_bytes"], report["full_bytes"])
+        self.assertIsNotNone(report["lean_parse"])
+
+
+class FakeChangeSet(ChangeSet):
+    """Change set whose reference contents are supplied in memory instead of by git."""
+
+    def __init__(self, project_root, old_contents):
+        super().__init__(project_root, "HEAD")
+        self.old_contents = old_contents
+
+    def read_at_ref(self, path):
+        if path.name not in self.old_contents:
+            raise GitError(f"{path.name} not found at reference")
+        content = self.old_contents[path.name]
+        return content if isinstance(content, str) else json.dumps(content)
+
+
+class TestMergeChangedTests(unittest.TestCase):
+    """Test the merge_changed_tests function."""
+
+    def setUp(self):
+        """Create a test directory with a consolidated output from its current files."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = Path(self.temp_dir)
+        self.test_dir = self.root / "test_files"
+        self.test_dir.mkdir()
+        self.output_path = self.root / "combined.json"
+        self.old_contents = {}
+        for stem in ["B_CODE", "D_CODE", "F_CODE"]:
+            cases = [self.make_case(stem, f"{stem.lower()}-{i}") for i in range(2)]
+            self.write_file(stem, cases)
+            self.old_contents[f"{stem}.json"] = cases
+        combine_tests(self.test_dir, self.output_path)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        import shutil
+
+        shutil.rmtree(self.temp_dir)
+
+    @staticmethod
+    def make_case(code, name):
+        """Helper to build a minimal valid test case."""
+        return {"error_code": code, "name": name, "description": "Test", "tests": {"string_tests": {"fails": ["a"]}}}
+
+    def write_file(self, stem, cases):
+        """Helper to write a test file."""
+        path = self.test_dir / f"{stem}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cases, f, indent=4)
+        return path
+
+    def test_merge_matches_full_consolidation(self):
+        """Test that merging modified, added and deleted files matches a full run."""
+        changes = FakeChangeSet(self.root, self.old_contents)
+        changes.modified.append(self.write_file("D_CODE", [self.make_case("D_CODE", "d-code-new")]))
+        changes.added.append(self.write_file("A_CODE", [self.make_case("A_CODE", "a-code-0")]))
+        changes.added.append(self.write_file("E_CODE", [self.make_case("E_CODE", "e-code-0")]))
+        (self.test_dir / "F_CODE.json").unlink()
+        changes.deleted.append(self.test_dir / "F_CODE.json")
+
+        count, stats = merge_changed_tests(self.test_dir, self.output_path, changes)
+        expected_path = self.root / "expected.json"
+        expected_count, expected_stats = combine_tests(self.test_dir, expected_path)
+
+        self.assertEqual(count, expected_count)
+        self.assertEqual(stats.name_dict, expected_stats.name_dict)
+        self.assertEqual(self.output_path.read_text(encoding="utf-8"), expected_path.read_text(encoding="utf-8"))
+
+    def test_stale_output_requires_full_run(self):
+        """Test that an output not consolidated from the reference is not reused."""
+        self.old_contents["D_CODE.json"] = [self.make_case("D_CODE", "not-in-output")]
+        changes = FakeChangeSet(self.root, self.old_contents)
+        changes.modified.append(self.test_dir / "D_CODE.json")
+
+        self.assertIsNone(merge_changed_tests(self.test_dir, self.output_path, changes))
+
+    def test_changed_unchanged_file_requires_full_run(self):
+        """Test that an output whose unchanged source files were edited since it was written is not reused."""
+        self.write_file("B_CODE", [self.make_case("B_CODE", "b-code-edited")])
+        changes = FakeChangeSet(self.root, self.old_contents)
+        changes.modified.append(self.test_dir / "D_CODE.json")
+
+        self.assertIsNone(merge_changed_tests(self.test_dir, self.output_path, changes))
+
+    def test_missing_source_digests_requires_full_run(self):
+        """Test that an output without recorded source digests and not tracked at the reference is not reused."""
+        sources_path(self.output_path).unlink()
+        changes = FakeChangeSet(self.root, self.old_contents)
+        changes.modified.append(self.test_dir / "D_CODE.json")
+
+        self.assertIsNone(merge_changed_tests(self.test_dir, self.output_path, changes))
+
+    def test_missing_source_digests_uses_committed_output(self):
+        """Test that without source digests the output is reused only if it is the one committed at the reference."""
+        sources_path(self.output_path).unlink()
+        self.old_contents[self.output_path.name] = self.output_path.read_text(encoding="utf-8")
+        changes = FakeChangeSet(self.root, self.old_contents)
+        changes.modified.append(self.write_file("D_CODE", [self.make_case("D_CODE", "d-code-new")]))
+        self.assertIsNotNone(merge_changed_tests(self.test_dir, self.output_path, changes, dry_run=True))
+
+        self.old_contents[self.output_path.name] = "[]"
+        self.assertIsNone(merge_changed_tests(self.test_dir, self.output_path, changes, dry_run=True))
+
+    def test_merge_records_source_digests(self):
+        """Test that a merge records digests a later merge can check against."""
+        changes = FakeChangeSet(self.root, self.old_contents)
+        changes.modified.append(self.write_file("D_CODE", [self.make_case("D_CODE", "d-code-new")]))
+        merge_changed_tests(self.test_dir, self.output_path, changes)
+
+        self.assertEqual(read_source_digests(self.output_path), source_digests(sorted(self.test_dir.glob("*.json"))))
+
+    def test_missing_output_requires_full_run(self):
+        """Test that a missing consolidated file is not merged into."""
+        self.output_path.unlink()
+        changes = FakeChangeSet(self.root, self.old_contents)
+
+        self.assertIsNone(merge_changed_tests(self.test_dir, self.output_path, changes))
+
+
 class TestMainFunction(unittest.TestCase):
     """Test the main function."""
 
@@ -0,0 +1,120 @@
+"""
+Unit tests for the corpus.py helpers.
+
+Tests the marshal snapshot used when loading consolidated files and the
+compressed artifact readers.
+"""
+
+import json
+import marshal
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.scripts.corpus import compress_artifact, iter_artifact, load_consolidated, snapshot_key, snapshot_path
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test loading consolidated files through a snapshot."""
+
+    def setUp(self):
+        """Create a consolidated file in a temporary directory."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.path = self.temp_dir / "validation_tests.json"
+        self.write_source([{"name": "first", "tests": {}}])
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def write_source(self, data):
+        """Helper to write the consolidated file."""
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+
+    def test_without_snapshot(self):
+        """Test that the default load writes no snapshot."""
+        self.assertEqual(load_consolidated(self.path), [{"name": "first", "tests": {}}])
+        self.assertFalse(snapshot_path(self.path).exists())
+
+    def test_warm_load(self):
+        """Test that the snapshot is written on the first load and used on the next."""
+        data = load_consolidated(self.path, snapshot=True)
+        self.assertTrue(snapshot_path(self.path).exists())
+
+        # Replace the snapshot data without changing its key to prove it is read
+        key = snapshot_key(self.path.read_bytes())
+        snapshot_path(self.path).write_bytes(marshal.dumps((key, [{"name": "from-snapshot"}])))
+        self.assertEqual(data, [{"name": "first", "tests": {}}])
+        self.assertEqual(load_consolidated(self.path, snapshot=True), [{"name": "from-snapshot"}])
+
+    def test_stale_snapshot(self):
+        """Test that a changed source rebuilds the snapshot."""
+        load_consolidated(self.path, snapshot=True)
+        self.write_source([{"name": "second", "tests": {}}])
+        self.assertEqual(load_consolidated(self.path, snapshot=True), [{"name": "second", "tests": {}}])
+        self.assertEqual(load_consolidated(self.path, snapshot=True), [{"name": "second", "tests": {}}])
+
+    def test_corrupt_snapshot(self):
+        """Test that an unreadable snapshot is ignored and replaced."""
+        snapshot_path(self.path).write_bytes(b"not a snapshot")
+        self.assertEqual(load_consolidated(self.path, snapshot=True), [{"name": "first", "tests": {}}])
+        key, _ = marshal.loads(snapshot_path(self.path).read_bytes())
+        self.assertEqual(key, snapshot_key(self.path.read_bytes()))
+
+    def test_not_a_list(self):
+        """Test that a non-list file is rejected and not snapshotted."""
+        self.write_source({"name": "first"})
+        with self.assertRaises(ValueError):
+            load_consolidated(self.path, snapshot=True)
+        self.assertFalse(snapshot_path(self.path).exists())
+
+
+class TestCompressedArtifacts(unittest.TestCase):
+    """Test writing and reading gzip and xz artifacts."""
+
+    TEST_CASES = [{"name": f"case-{i}", "tests": {"string_tests": {"passes": ["Red"] * i}}} for i in range(50)]
+
+    def setUp(self):
+        """Create a consolidated file in a temporary directory."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.path = self.temp_dir / "validation_tests.json"
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.TEST_CASES, f, indent=4)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_round_trip(self):
+        """Test that every format streams back the same test cases."""
+        outputs = compress_artifact(self.path)
+        self.assertEqual(sorted(outputs), [".gz", ".xz"])
+        for path in [self.path, *outputs.values()]:
+            self.assertEqual(list(iter_artifact(path)), self.TEST_CASES)
+            self.assertEqual(load_consolidated(path), self.TEST_CASES)
+            self.assertEqual(load_consolidated(path, snapshot=True), self.TEST_CASES)
+
+    def test_corrupt_compressed_file(self):
+        """Test that a truncated or corrupt compressed file raises ValueError."""
+        for path in compress_artifact(self.path).values():
+            path.write_bytes(path.read_bytes()[:40])
+            for snapshot in [False, True]:
+                with self.assertRaises(ValueError):
+                    load_consolidated(path, snapshot=snapshot)
+            with self.assertRaises(ValueError):
+                list(iter_artifact(path))
+            path.write_bytes(b"not compressed")
+            with self.assertRaises(ValueError):
+                load_consolidated(path)
+
+    def test_deterministic(self):
+        """Test that compressing the same input twice gives the same bytes."""
+        first = {suffix: path.read_bytes() for suffix, path in compress_artifact(self.path).items()}
+        second = {suffix: path.read_bytes() for suffix, path in compress_artifact(self.path).items()}
+        self.assertEqual(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,160 @@
+"""
+Unit tests for the export_sqlite.py script.
+
+Tests the normalized tables, indexes, results import, views, and that a failed
+export keeps the previous database.
+"""
+
+import json
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from src.scripts.export_sqlite import INDEX_SQL, SCHEMA_SQL, execute_script, export_corpus, import_results, main
+
+TEST_CASES = [
+    {
+        "error_code": "TAG_INVALID",
+        "alt_codes": ["VALUE_INVALID"],
+        "name": "tag-test",
+        "description": "Test",
+        "schema": "8.4.0",
+        "definitions": ["(Definition/Acc/#, (Red))"],
+        "tests": {
+            "string_tests": {"fails": ["Bad"], "passes": ["Red"]},
+            "event_tests": {"fails": [[["onset", "HED"], [1, "Bad"]]]},
+        },
+    },
+    {
+        "error_code": "UNITS_INVALID",
+        "name": "units-test",
+        "description": "Test",
+        "schema": ["8.4.0", "sc:score_1.0.0"],
+        "warning": True,
+        "tests": {"sidecar_tests": {"passes": [{"a": {"HED": "Red"}}]}},
+    },
+]
+
+
+class TestExportSqlite(unittest.TestCase):
+    """Test exporting the corpus and importing results."""
+
+    def setUp(self):
+        """Export the sample corpus to an in-memory database."""
+        self.connection = sqlite3.connect(":memory:")
+        with self.connection:
+            self.connection.executescript(SCHEMA_SQL)
+            self.count = export_corpus(self.connection, [("validation", TEST_CASES)])
+            self.connection.executescript(INDEX_SQL)
+
+    def tearDown(self):
+        """Close the database."""
+        self.connection.close()
+
+    def query(self, sql, *params):
+        """Helper to run a query and return all rows."""
+        return self.connection.execute(sql, params).fetchall()
+
+    def test_normalized_tables(self):
+        """Test that cases, alt codes, versions, and definitions are split into tables."""
+        self.assertEqual(self.count, 2)
+        self.assertEqual(self.query("SELECT name, warning FROM test_cases ORDER BY id"), [("tag-test", 0), ("units-test", 1)])
+        self.assertEqual(self.query("SELECT code FROM alt_codes"), [("VALUE_INVALID",)])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM schema_versions WHERE version = '8.4.0'"), [(2,)])
+        self.assertEqual(self.query("SELECT definition FROM definitions"), [("(Definition/Acc/#, (Red))",)])
+
+    def test_subtest_payloads(self):
+        """Test that each sub-test is a row with its kind, outcome, and payload."""
+        rows = self.query("SELECT kind, outcome, position, payload FROM subtests ORDER BY id")
+        self.assertEqual(
+            rows,
+            [
+                ("string", "fails", 0, "Bad"),
+                ("string", "passes", 0, "Red"),
+                ("event", "fails", 0, '[["onset","HED"],[1,"Bad"]]'),
+                ("sidecar", "passes", 0, '{"a":{"HED":"Red"}}'),
+            ],
+        )
+
+    def test_code_lookup_uses_index(self):
+        """Test that a lookup by error code is an indexed search."""
+        plan = self.query("EXPLAIN QUERY PLAN SELECT * FROM test_cases WHERE error_code = 'TAG_INVALID'")
+        self.assertTrue(any("idx_test_cases_code" in row[-1] for row in plan))
+
+    def test_results_and_views(self):
+        """Test that imported results feed the disagreements view."""
+        results = [
+            {"name": "tag-test", "test_type": "string_tests", "outcome": "fails", "index": 0, "passed": False},
+            {"name": "tag-test", "test_type": "string_tests", "outcome": "passes", "index": 0, "passed": True},
+        ]
+        with self.connection:
+            self.assertEqual(import_results(self.connection, results, "run.jsonl"), 2)
+        self.assertEqual(
+            self.query("SELECT error_code, name, kind, outcome FROM disagreements"),
+            [("TAG_INVALID", "tag-test", "string", "fails")],
+        )
+        self.assertEqual(
+            self.query(
+                "SELECT subtests FROM coverage WHERE error_code = 'TAG_INVALID' AND kind = 'string' AND outcome = 'fails'"
+            ),
+            [(1,)],
+        )
+
+
+class TestExportSqliteMain(unittest.TestCase):
+    """Test the transaction and the replacement of the output file."""
+
+    def setUp(self):
+        """Create a temporary directory for the database."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.output = self.temp_dir / "hed_tests.db"
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def _main(self, *args) -> int:
+        """Run main quietly and return its exit code."""
+        with redirect_stdout(StringIO()):
+            return main(["--output", str(self.output), *args])
+
+    def _runs(self) -> int:
+        """Return the number of imported runs in the output database."""
+        connection = sqlite3.connect(self.output)
+        try:
+            return connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        finally:
+            connection.close()
+
+    def test_execute_script_rolls_back(self):
+        """Test that schema statements stay in the open transaction."""
+        connection = sqlite3.connect(":memory:", isolation_level=None)
+        connection.execute("BEGIN")
+        execute_script(connection, SCHEMA_SQL)
+        self.assertTrue(connection.in_transaction)
+        connection.rollback()
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM sqlite_master").fetchone(), (0,))
+        connection.close()
+
+    def test_failed_export_keeps_database(self):
+        """Test that a bad results record fails the export without touching the previous database."""
+        good = self.temp_dir / "good.jsonl"
+        bad = self.temp_dir / "bad.jsonl"
+        record = {"name": "a", "test_type": "string_tests", "outcome": "fails", "index": 0, "passed": True}
+        good.write_text(json.dumps(record) + "\n", encoding="utf-8")
+        bad.write_text(json.dumps({**record, "index": "x"}) + "\n", encoding="utf-8")
+
+        self.assertEqual(self._main("--results", str(good)), 0)
+        self.assertEqual(self._main("--results", str(bad)), 1)
+        self.assertEqual(self._runs(), 1)
+        self.assertEqual(self._main("--results-only", "--results", str(good), str(bad)), 1)
+        self.assertEqual(self._runs(), 1)
+        self.assertEqual(list(self.temp_dir.glob("*.tmp")), [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,127 @@
+"""
+Unit tests for the extract_kinds.py script.
+
+Tests field escaping and the per-kind extract files.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from src.scripts.extract_kinds import escape_field, events_file_text, extract_kinds, read_tsv_records, unescape_field
+
+TEST_CASE = {
+    "error_code": "TAG_INVALID",
+    "alt_codes": ["VALUE_INVALID"],
+    "name": "tag-test",
+    "description": "Test",
+    "schema": ["8.4.0", "sc:score_1.0.0"],
+    "definitions": ["(Definition/Acc/#, (Red))"],
+    "tests": {
+        "string_tests": {"fails": ["Bad\tTag"], "passes": ["Red"]},
+        "sidecar_tests": {"fails": [{"a": {"HED": "Bad"}}]},
+        "event_tests": {"passes": [[["onset", "duration", "HED"], [4.5, 0, "Red"]]]},
+        "combo_tests": {"passes": [{"sidecar": {"a": {"HED": "Red"}}, "events": [["onset", "a"], [1, "x"]]}]},
+    },
+}
+
+
+class TestEscaping(unittest.TestCase):
+    """Test TSV field escaping."""
+
+    def test_round_trip(self):
+        """Test that special characters survive escaping."""
+        for text in ["plain", "a\tb", "line\nbreak\r", "back\\slash", "\\t literal", ""]:
+            escaped = escape_field(text)
+            self.assertNotIn("\t", escaped)
+            self.assertNotIn("\n", escaped)
+            self.assertEqual(unescape_field(escaped), text)
+
+    def test_numbers(self):
+        """Test that numbers are written as text."""
+        self.assertEqual(escape_field(4.5), "4.5")
+        self.assertEqual(escape_field(0), "0")
+
+    def test_events_file_values_unchanged(self):
+        """Test that BIDS events files keep backslashes and reject tabs and line breaks."""
+        self.assertEqual(events_file_text([["onset", "HED"], [1, "a\\b"]]), "onset\tHED\n1\ta\\b\n")
+        for value in ["a\tb", "a\nb", "a\rb"]:
+            with self.assertRaises(ValueError):
+                events_file_text([["onset", "HED"], [1, value]])
+
+
+class TestExtractKinds(unittest.TestCase):
+    """Test writing the extracts."""
+
+    def setUp(self):
+        """Create a temporary output directory."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Remove the temporary output directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_counts(self):
+        """Test that every sub-test of a supported kind is written once."""
+        counts = extract_kinds([[TEST_CASE]], self.temp_dir)
+        self.assertEqual(counts, {"string": 2, "sidecar": 1, "combo": 1, "event": 1, "rejected": 0})
+
+    def test_strings(self):
+        """Test the string extract fields."""
+        extract_kinds([[TEST_CASE]], self.temp_dir)
+        records = list(read_tsv_records(self.temp_dir / "strings.tsv"))
+        self.assertEqual(len(records), 2)
+        self.assertEqual(
+            records[0],
+            {
+                "name": "tag-test",
+                "schema": "8.4.0,sc:score_1.0.0",
+                "outcome": "fails",
+                "index": "0",
+                "codes": "TAG_INVALID,VALUE_INVALID",
+                "definitions": '["(Definition/Acc/#, (Red))"]',
+                "hed": "Bad\tTag",
+            },
+        )
+
+    def test_jsonl(self):
+        """Test the sidecar and combo extracts."""
+        extract_kinds([[TEST_CASE]], self.temp_dir)
+        with open(self.temp_dir / "sidecars.jsonl", "r", encoding="utf-8") as f:
+            sidecar = json.loads(f.readline())
+        self.assertEqual(sidecar["sidecar"], {"a": {"HED": "Bad"}})
+        self.assertEqual(sidecar["outcome"], "fails")
+        self.assertEqual(sidecar["codes"], ["TAG_INVALID", "VALUE_INVALID"])
+        with open(self.temp_dir / "combos.jsonl", "r", encoding="utf-8") as f:
+            combo = json.loads(f.readline())
+        self.assertEqual(combo["events"], [["onset", "a"], [1, "x"]])
+
+    def test_event_files(self):
+        """Test that event sub-tests become real events files."""
+        (self.temp_dir / "events").mkdir()
+        stale = self.temp_dir / "events" / "old_passes_0_events.tsv"
+        stale.write_text("onset\n", encoding="utf-8")
+
+        extract_kinds([[TEST_CASE]], self.temp_dir)
+        records = list(read_tsv_records(self.temp_dir / "events.tsv"))
+        self.assertEqual(records[0]["file"], "events/tag-test_passes_0_events.tsv")
+        content = (self.temp_dir / records[0]["file"]).read_text(encoding="utf-8")
+        self.assertEqual(content, "onset\tduration\tHED\n4.5\t0\tRed\n")
+        self.assertFalse(stale.exists())
+
+    def test_event_file_with_tab_rejected(self):
+        """Test that an event sub-test whose values cannot be written as a BIDS file is left out."""
+        test_case = {"name": "tab-test", "tests": {"event_tests": {"fails": [[["onset", "HED"], [1, "a\tb"]]]}}}
+        with redirect_stdout(StringIO()):
+            counts = extract_kinds([[test_case]], self.temp_dir)
+        self.assertEqual((counts["event"], counts["rejected"]), (0, 1))
+        self.assertEqual(list(read_tsv_records(self.temp_dir / "events.tsv")), [])
+        self.assertEqual(list((self.temp_dir / "events").iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,59 @@
+"""
+Unit tests for the hed_tokens.py helpers.
+
+Tests tag splitting, tag prefixes, and HED string extraction from payloads.
+"""
+
+import unittest
+
+from src.scripts.hed_tokens import DEFINITIONS, iter_case_hed, iter_payload_hed, iter_tags, tag_prefixes
+
+
+class TestTokenizer(unittest.TestCase):
+    """Test splitting HED strings into tags."""
+
+    def test_groups_and_whitespace(self):
+        """Test that commas and parentheses separate tags."""
+        tags = list(iter_tags("Red, (Def/Acc/4.5 m-per-s^2, (Item/Blue)),Label/x "))
+        self.assertEqual(tags, ["Red", "Def/Acc/4.5 m-per-s^2", "Item/Blue", "Label/x"])
+
+    def test_column_references_skipped(self):
+        """Test that sidecar column references are not tags."""
+        self.assertEqual(list(iter_tags("{response}, Red, ()")), ["Red"])
+
+    def test_prefixes(self):
+        """Test that every path prefix is returned in lowercase."""
+        self.assertEqual(tag_prefixes("Definition/Acc/#"), ["definition", "definition/acc", "definition/acc/#"])
+
+
+class TestPayloadHed(unittest.TestCase):
+    """Test pulling HED strings out of sub-test payloads."""
+
+    def test_sidecar(self):
+        """Test value and categorical sidecar columns."""
+        sidecar = {"a": {"HED": "Red"}, "b": {"HED": {"x": "Blue", "y": "Green"}}, "c": {"Levels": {}}}
+        self.assertEqual(list(iter_payload_hed("sidecar_tests", sidecar)), ["Red", "Blue", "Green"])
+
+    def test_events(self):
+        """Test that only non-empty HED cells are returned."""
+        rows = [["onset", "HED"], [1, "Red"], [2, "n/a"], [3, ""]]
+        self.assertEqual(list(iter_payload_hed("event_tests", rows)), ["Red"])
+        self.assertEqual(list(iter_payload_hed("event_tests", [["onset"], [1]])), [])
+
+    def test_combo_and_schema(self):
+        """Test combo payloads and that schema payloads have no HED strings."""
+        combo = {"sidecar": {"a": {"HED": "Red"}}, "events": [["onset", "HED"], [1, "Blue"]]}
+        self.assertEqual(list(iter_payload_hed("combo_tests", combo)), ["Red", "Blue"])
+        self.assertEqual(list(iter_payload_hed("schema_tests", ["HED version=1"])), [])
+
+    def test_case(self):
+        """Test that definitions and sub-tests are reported with their positions."""
+        test_case = {"definitions": ["(Definition/A, (Red))"], "tests": {"string_tests": {"fails": ["Blue"]}}}
+        self.assertEqual(
+            list(iter_case_hed(test_case)),
+            [(DEFINITIONS, "(Definition/A, (Red))"), (("string_tests", "fails", 0), "Blue")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
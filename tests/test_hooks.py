@@ -0,0 +1,122 @@
+"""
+Unit tests for the hooks.py event registry.
+
+Tests registering hooks, the start and end events the scripts emit, and the
+JSON-lines metrics sink.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from src.scripts import hooks, validate_test_structure
+from src.scripts.check_coverage import CoverageAnalyzer
+from src.scripts.consolidate_tests import combine_tests
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCHEMA_PATH = PROJECT_ROOT / "src" / "schemas" / "test_schema.json"
+
+
+class TestHooks(unittest.TestCase):
+    """Test the event hook registry."""
+
+    def setUp(self):
+        """Create a temporary directory and record every event."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.events = []
+        hooks.register("*", self._record)
+
+    def tearDown(self):
+        """Remove the hooks and the temporary directory."""
+        hooks.HOOKS.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def _record(self, event: str, payload: dict):
+        """Hook that records each event."""
+        self.events.append((event, dict(payload)))
+
+    def _write_tests(self, name: str, test_cases):
+        """Write a test file into the temporary directory."""
+        path = self.temp_dir / name
+        path.write_text(json.dumps(test_cases), encoding="utf-8")
+        return path
+
+    def test_register_and_unregister(self):
+        """Test that hooks for one event and for every event both run, and stop after unregistering."""
+        seen = []
+        hooks.register("a.end", lambda event, payload: seen.append(event))
+        hooks.emit("a.end", {})
+        hooks.emit("b.end", {})
+        self.assertEqual(seen, ["a.end"])
+        self.assertEqual([event for event, _ in self.events], ["a.end", "b.end"])
+
+        hooks.unregister("*", self._record)
+        hooks.unregister("*", self._record)
+        self.assertNotIn("*", hooks.HOOKS)
+
+    def test_no_span_without_hooks(self):
+        """Test that no span is started when no hook is registered."""
+        hooks.HOOKS.clear()
+        self.assertIsNone(hooks.start_span("index.case", name="a"))
+
+    def test_span_payload(self):
+        """Test that the end event repeats the start payload and adds timing and counts."""
+        span = hooks.start_span("work", name="a", event="payload field")
+        span.end(cases=3)
+        (start, start_payload), (end, end_payload) = self.events
+        self.assertEqual((start, start_payload), ("work.start", {"name": "a", "event": "payload field"}))
+        self.assertEqual(end, "work.end")
+        self.assertEqual(end_payload["cases"], 3)
+        self.assertGreaterEqual(end_payload["seconds"], 0)
+
+        hooks.start_span("work", name="b").end(seconds=2.5)
+        self.assertEqual(self.events[-1][1]["seconds"], 2.5)
+
+    def test_combine_tests_events(self):
+        """Test that consolidation emits directory and per-file events, also with workers."""
+        path = self._write_tests("A.json", [{"name": "a", "error_code": "A"}, {"name": "b", "error_code": "A"}])
+        self._write_tests("B.json", [{"name": "c", "error_code": "B"}])
+        for workers in [1, 2]:
+            self.events.clear()
+            with redirect_stdout(StringIO()):
+                combine_tests(self.temp_dir, self.temp_dir / "out.json", dry_run=True, workers=workers)
+            ends = [payload for event, payload in self.events if event.endswith(".end")]
+            self.assertEqual([(p["file"], p["cases"]) for p in ends[:2]], [("A.json", 2), ("B.json", 1)])
+            self.assertEqual(ends[0]["bytes"], path.stat().st_size)
+            self.assertGreaterEqual(ends[0]["seconds"], 0)
+            self.assertEqual((ends[2]["files"], ends[2]["cases"]), (2, 3))
+            self.assertEqual(self.events[0][0], "consolidate.start")
+
+    def test_validate_and_case_events(self):
+        """Test the validate.file and coverage.case events."""
+        path = self._write_tests("A.json", [{"name": "a"}])
+        validate_test_structure.TestValidator(SCHEMA_PATH).validate_file(path)
+        event, payload = self.events[-1]
+        self.assertEqual(event, "validate.file.end")
+        self.assertEqual((payload["valid"], payload["bytes"]), (False, path.stat().st_size))
+        self.assertGreater(payload["errors"], 0)
+
+        self.events.clear()
+        CoverageAnalyzer(self.temp_dir).add_test_case("A", {"name": "a"}, path, "validation")
+        self.assertEqual([event for event, _ in self.events], ["coverage.case.start", "coverage.case.end"])
+
+    def test_json_lines_sink(self):
+        """Test that the metrics sink appends one JSON object per event."""
+        metrics_path = self.temp_dir / "metrics.jsonl"
+        sink = hooks.open_metrics(str(metrics_path))
+        hooks.start_span("work", file="A.json").end(cases=1)
+        hooks.close_metrics(sink)
+        hooks.emit("after.close", {})
+
+        records = [json.loads(line) for line in metrics_path.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([record["event"] for record in records], ["work.start", "work.end"])
+        self.assertEqual(records[1]["cases"], 1)
+        self.assertIsNone(hooks.open_metrics(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Unit tests for the json_stream.py module.
+
+Tests incremental array parsing, error reporting, and
+byte-identical array writing.
+"""
+
+import io
+import json
+import unittest
+from pathlib import Path
+
+from src.scripts.json_stream import JsonArrayWriter, JsonObjectWriter, NotAnArrayError, iter_json_array
+
+
+class TestIterJsonArray(unittest.TestCase):
+    """Test the iter_json_array function."""
+
+    def parse(self, text, chunk_size=3):
+        """Helper to parse text into a list of elements."""
+        return [item for _, item in iter_json_array(io.StringIO(text), chunk_size=chunk_size)]
+
+    def test_small_chunks_match_json_loads(self):
+        """Test that values split across chunk boundaries decode correctly."""
+        text = ' [ 12 , 3.5e3,true,null,"a\\"b", -0.25E-2 ,[1,[2]], {"k": [1, {"x": "y"}]}] '
+        for chunk_size in [1, 2, 3, 7, 1000]:
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.parse(text, chunk_size), json.loads(text))
+
+    def test_indices(self):
+        """Test that array indices are yielded with each element."""
+        indices = [index for index, _ in iter_json_array(io.StringIO('["a", "b", "c"]'))]
+        self.assertEqual(indices, [0, 1, 2])
+
+    def test_empty_array(self):
+        """Test that an empty array yields nothing."""
+        self.assertEqual(self.parse("[ ]"), [])
+
+    def test_not_an_array(self):
+        """Test that a non-array document raises NotAnArrayError."""
+        with self.assertRaises(NotAnArrayError):
+            self.parse('{"not": "a list"}')
+
+    def test_syntax_errors_match_json_loads(self):
+        """Test that syntax errors report the same position as json.loads."""
+        for text in ["", "[1,]", "[1 2]", "[1]x", '[{"a":\n1,}]', "[1", "[tru]"]:
+            with self.subTest(text=text):
+                with self.assertRaises(json.JSONDecodeError) as expected:
+                    json.loads(text)
+                with self.assertRaises(json.JSONDecodeError) as actual:
+                    self.parse(text)
+                self.assertEqual(str(actual.exception), str(expected.exception))
+
+    def test_actual_consolidated_data(self):
+        """Test that the consolidated test file decodes the same as json.load."""
+        path = Path(__file__).parent.parent / "json_test_data" / "validation_tests.json"
+        if not path.exists():
+            self.skipTest("Consolidated validation tests not found")
+        with open(path, "r", encoding="utf-8") as f:
+            expected = json.load(f)
+        with open(path, "r", encoding="utf-8") as f:
+            actual = [item for _, item in iter_json_array(f, chunk_size=4096)]
+        self.assertEqual(actual, expected)
+
+
+class TestJsonArrayWriter(unittest.TestCase):
+    """Test the JsonArrayWriter class."""
+
+    def test_matches_json_dump(self):
+        """Test that the output is byte-identical to json.dump with indent."""
+        items = [{"name": "a", "tests": {"string_tests": {"fails": ["x\ny"]}}}, [1, [2, {}]], "text", 3]
+        for count in range(len(items) + 1):
+            with self.subTest(count=count):
+                out = io.StringIO()
+                with JsonArrayWriter(out) as writer:
+                    for item in items[:count]:
+                        writer.write(item)
+                self.assertEqual(out.getvalue(), json.dumps(items[:count], indent=4))
+
+
+class TestJsonObjectWriter(unittest.TestCase):
+    """Test the JsonObjectWriter class."""
+
+    def test_matches_json_dump(self):
+        """Test that the output is byte-identical to json.dump with indent."""
+        members = {"test-1": {"explanation": "a\nb", "common_causes": ["x"]}, "test-2": {}, "test-3": [1, 2]}
+        for count in range(len(members) + 1):
+            with self.subTest(count=count):
+                expected = dict(list(members.items())[:count])
+                out = io.StringIO()
+                with JsonObjectWriter(out) as writer:
+                    for key, value in expected.items():
+                        writer.write(key, value)
+                self.assertEqual(out.getvalue(), json.dumps(expected, indent=4))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
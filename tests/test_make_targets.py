@@ -0,0 +1,167 @@
+"""
+Unit tests for the make_targets.py script.
+
+Tests dependency ordering, staleness detection from content digests,
+skipping of targets whose dependencies failed, and finding the local modules
+each script imports.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.scripts.make_targets import (
+    SCRIPTS_DIR,
+    TARGETS as PROJECT_TARGETS,
+    Target,
+    load_state,
+    make,
+    resolve_order,
+    script_inputs,
+)
+
+
+def copy_source(project_root: str, module: str, args: list):
+    """Fake runner that copies src/<module>.txt to the output named in args, failing for module "broken"."""
+    if module == "broken":
+        return 1, "broken\n", 0.0
+    root = Path(project_root)
+    (root / args[0]).parent.mkdir(parents=True, exist_ok=True)
+    (root / args[0]).write_text((root / "src" / f"{module}.txt").read_text(encoding="utf-8"), encoding="utf-8")
+    return 0, "", 0.001
+
+
+def _target(name: str, deps=None) -> Target:
+    """Declare a target built from src/<name>.txt into out/<name>.txt."""
+    return Target(name, name, [f"out/{name}.txt"], [f"src/{name}.txt"], [f"out/{name}.txt"], deps=deps)
+
+
+TARGETS = [_target("a"), _target("b", deps=["a"]), _target("c")]
+
+
+class TestMakeTargets(unittest.TestCase):
+    """Test rebuilding only stale targets."""
+
+    def setUp(self):
+        """Create a temporary project with one source file per target."""
+        self.root = Path(tempfile.mkdtemp())
+        (self.root / "src").mkdir()
+        for name in ["a", "b", "c"]:
+            (self.root / "src" / f"{name}.txt").write_text(f"{name}\n", encoding="utf-8")
+        self.state_path = self.root / "state.json"
+
+    def tearDown(self):
+        """Remove the temporary project."""
+        shutil.rmtree(self.root)
+
+    def _make(self, targets=TARGETS, names=("a", "b", "c"), **kwargs):
+        """Run make over the temporary project and return the status of each target."""
+        results = make(targets, list(names), self.root, self.state_path, jobs=2, runner=copy_source, **kwargs)
+        return {result["name"]: result["status"] for result in results}
+
+    def test_resolve_order(self):
+        """Test that dependencies come first and bad graphs are rejected."""
+        by_name = {target.name: target for target in TARGETS}
+        self.assertEqual(resolve_order(by_name, ["b", "c"]), ["a", "b", "c"])
+        with self.assertRaises(ValueError):
+            resolve_order(by_name, ["missing"])
+        cyclic = {"x": _target("x", deps=["y"]), "y": _target("y", deps=["x"])}
+        with self.assertRaises(ValueError):
+            resolve_order(cyclic, ["x"])
+
+    def test_second_run_skips(self):
+        """Test that an unchanged project rebuilds nothing."""
+        self.assertEqual(self._make(), {"a": "rebuilt", "b": "rebuilt", "c": "rebuilt"})
+        self.assertEqual(self._make(), {"a": "skipped", "b": "skipped", "c": "skipped"})
+        self.assertEqual(self._make(force=True), {"a": "rebuilt", "b": "rebuilt", "c": "rebuilt"})
+
+    def test_changed_input_rebuilds_dependents(self):
+        """Test that a changed source rebuilds its target and the targets reading its output."""
+        self._make()
+        (self.root / "src" / "a.txt").write_text("a changed\n", encoding="utf-8")
+        self.assertEqual(self._make(), {"a": "rebuilt", "b": "rebuilt", "c": "skipped"})
+        (self.root / "src" / "c.txt").write_text("c changed\n", encoding="utf-8")
+        self.assertEqual(self._make(), {"a": "skipped", "b": "skipped", "c": "rebuilt"})
+
+    def test_missing_output_rebuilds(self):
+        """Test that a deleted output is rebuilt even though its inputs did not change."""
+        self._make()
+        (self.root / "out" / "c.txt").unlink()
+        results = make(TARGETS, ["c"], self.root, self.state_path, runner=copy_source)
+        self.assertEqual((results[0]["status"], results[0]["reason"]), ("rebuilt", "out/c.txt missing"))
+
+    def test_failure_blocks_dependents(self):
+        """Test that a failed target is not recorded and its dependents do not run."""
+        targets = [Target("a", "broken", [], [], ["out/a.txt"]), _target("b", deps=["a"]), _target("c")]
+        self.assertEqual(self._make(targets), {"a": "failed", "b": "blocked", "c": "rebuilt"})
+        self.assertEqual(set(load_state(self.state_path)), {"c"})
+
+    def test_dry_run(self):
+        """Test that a dry run reports stale targets without building them."""
+        self.assertEqual(self._make(dry_run=True), {"a": "stale", "b": "stale", "c": "stale"})
+        self.assertFalse((self.root / "out").exists())
+        self.assertFalse(self.state_path.exists())
+
+
+class TestScriptInputs(unittest.TestCase):
+    """Test deriving script inputs from imports."""
+
+    def setUp(self):
+        """Create a temporary scripts directory."""
+        self.scripts_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Remove the temporary scripts directory."""
+        shutil.rmtree(self.scripts_dir)
+
+    def test_transitive_imports(self):
+        """Test that modules imported directly, through other modules, or inside functions are inputs."""
+        sources = {
+            "a": "try:\n    from .b import f\nexcept ImportError:\n    from b import f\nimport json\n",
+            "b": "from . import c\n\n\ndef f():\n    import d\n",
+            "c": "import a\n",
+            "d": "",
+            "unused": "",
+        }
+        for name, source in sources.items():
+            (self.scripts_dir / f"{name}.py").write_text(source, encoding="utf-8")
+        self.assertEqual({path.stem for path in script_inputs("a", self.scripts_dir)}, {"a", "b", "c", "d"})
+        self.assertEqual(script_inputs("missing", self.scripts_dir), set())
+
+    def test_project_targets_cover_imports(self):
+        """Test that every target's inputs include the local modules its script imports."""
+        project_root = Path(__file__).parent.parent
+        expected = {
+            "index": {"generate_test_index.py", "paged_markdown.py", "hooks.py"},
+            "coverage": {"check_coverage.py", "corpus.py", "hed_tokens.py", "paged_markdown.py", "hooks.py"},
+            "consolidate": {"consolidate_tests.py", "code_graph.py", "git_changes.py", "hooks.py", "json_stream.py"},
+            "tag_index": {"select_tests.py", "code_graph.py", "corpus.py", "smoke_subset.py", "cost_model.py"},
+        }
+        by_name = {target.name: target for target in PROJECT_TARGETS}
+        for name, files in expected.items():
+            inputs = {path.name for path in script_inputs(by_name[name].module, project_root / SCRIPTS_DIR)}
+            self.assertLessEqual(files, inputs, name)
+
+    def test_changed_import_rebuilds(self):
+        """Test that editing a module a script imports makes its target stale."""
+        root = Path(tempfile.mkdtemp())
+        try:
+            scripts_dir = root / SCRIPTS_DIR
+            scripts_dir.mkdir(parents=True)
+            (scripts_dir / "a.py").write_text("from helper import f\n", encoding="utf-8")
+            (scripts_dir / "helper.py").write_text("def f(): pass\n", encoding="utf-8")
+            (root / "src" / "a.txt").write_text("a\n", encoding="utf-8")
+            state_path = root / "state.json"
+            targets = [_target("a")]
+
+            make(targets, ["a"], root, state_path, jobs=1, runner=copy_source)
+            self.assertEqual(make(targets, ["a"], root, state_path, jobs=1, runner=copy_source)[0]["status"], "skipped")
+            (scripts_dir / "helper.py").write_text("def f(): return 1\n", encoding="utf-8")
+            self.assertEqual(make(targets, ["a"], root, state_path, jobs=1, runner=copy_source)[0]["status"], "rebuilt")
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    unittest.main()
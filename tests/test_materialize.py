@@ -0,0 +1,157 @@
+"""
+Unit tests for the materialize.py script.
+
+Tests content-addressed file writing, skipping, and pruning for schema and
+events inputs.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.scripts.materialize import (
+    MANIFEST_NAME,
+    collect_event_files,
+    collect_schema_files,
+    content_name,
+    materialize,
+    schema_text,
+)
+
+SCHEMA_LINES = ['HED version="1.0.0"', "'''Prologue'''", "!# start schema", "!# end schema", "!# end hed"]
+
+TEST_CASES = [
+    {
+        "error_code": "SCHEMA_ATTRIBUTE_INVALID",
+        "name": "schema-test",
+        "schema": "",
+        "tests": {"schema_tests": {"fails": [SCHEMA_LINES + ["extra"]], "passes": [SCHEMA_LINES, SCHEMA_LINES]}},
+    }
+]
+
+
+class TestMaterializeSchemas(unittest.TestCase):
+    """Test materializing schema sub-tests."""
+
+    def setUp(self):
+        """Create a temporary output directory."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.output_dir = self.temp_dir / "schemas"
+
+    def tearDown(self):
+        """Remove the temporary output directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_collect(self):
+        """Test that identical sub-tests share one file."""
+        files, entries = collect_schema_files(TEST_CASES)
+        self.assertEqual(len(files), 2)
+        self.assertEqual([(e["outcome"], e["index"]) for e in entries], [("fails", 0), ("passes", 0), ("passes", 1)])
+        self.assertEqual(entries[1]["path"], entries[2]["path"])
+        self.assertEqual(files[entries[1]["path"]], "\n".join(SCHEMA_LINES) + "\n")
+        self.assertEqual(entries[1]["path"], content_name(schema_text(SCHEMA_LINES), ".mediawiki"))
+
+    def test_repeat_run_writes_nothing(self):
+        """Test that a second run over the same corpus writes no files."""
+        files, entries = collect_schema_files(TEST_CASES)
+        first = materialize(self.output_dir, files, entries, workers=2)
+        self.assertEqual((first["written"], first["manifest"]), (2, True))
+        second = materialize(self.output_dir, files, entries, workers=2)
+        self.assertEqual((second["written"], second["manifest"]), (0, False))
+
+        with open(self.output_dir / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        for entry in manifest:
+            self.assertTrue((self.output_dir / entry["path"]).exists())
+
+    def test_prune(self):
+        """Test that files no longer in the manifest are removed only with prune."""
+        files, entries = collect_schema_files(TEST_CASES)
+        materialize(self.output_dir, files, entries)
+        (self.output_dir / "stale.mediawiki").write_text("old\n", encoding="utf-8")
+        self.assertEqual(materialize(self.output_dir, files, entries)["pruned"], 0)
+        self.assertEqual(materialize(self.output_dir, files, entries, prune=True)["pruned"], 1)
+        self.assertFalse((self.output_dir / "stale.mediawiki").exists())
+        self.assertTrue((self.output_dir / MANIFEST_NAME).exists())
+
+
+class TestMaterializeEvents(unittest.TestCase):
+    """Test materializing event, sidecar, and combo sub-tests."""
+
+    EVENTS = [["onset", "duration", "event_code"], [4.5, 0, "show"]]
+    SIDECAR = {"event_code": {"HED": {"show": "Red"}}}
+    TEST_CASES = [
+        {
+            "error_code": "TAG_INVALID",
+            "name": "events-test",
+            "schema": "8.4.0",
+            "definitions": ["(Definition/Acc, (Red))"],
+            "warning": True,
+            "tests": {
+                "string_tests": {"passes": ["Red"]},
+                "sidecar_tests": {"passes": [SIDECAR]},
+                "event_tests": {"fails": [EVENTS]},
+                "combo_tests": {"passes": [{"sidecar": SIDECAR, "events": EVENTS}]},
+            },
+        }
+    ]
+
+    def test_collect(self):
+        """Test that each sub-test gets a directory with a BIDS events file and matching sidecar."""
+        files, entries = collect_event_files(self.TEST_CASES)
+        self.assertEqual([e["test_type"] for e in entries], ["sidecar_tests", "event_tests", "combo_tests"])
+        self.assertNotIn("events", entries[0])
+        self.assertNotIn("sidecar", entries[1])
+        self.assertEqual(len(files), 4)
+        self.assertEqual(len({entry["path"] for entry in entries}), 3)
+        combo = entries[2]
+        self.assertEqual(combo["events"], f"{combo['path']}/sub-01_task-test_events.tsv")
+        self.assertEqual(combo["sidecar"], f"{combo['path']}/sub-01_task-test_events.json")
+        self.assertEqual(files[combo["events"]], files[entries[1]["events"]])
+        self.assertEqual(files[entries[1]["events"]], "onset\tduration\tevent_code\n4.5\t0\tshow\n")
+        self.assertEqual(json.loads(files[entries[0]["sidecar"]]), self.SIDECAR)
+        self.assertEqual(
+            (combo["schema"], combo["definitions"], combo["warning"]), ("8.4.0", ["(Definition/Acc, (Red))"], True)
+        )
+
+    def test_identical_inputs_share_directory(self):
+        """Test that sub-tests with the same inputs map to the same directory."""
+        test_case = json.loads(json.dumps(self.TEST_CASES[0]))
+        test_case["tests"]["combo_tests"]["passes"].append({"sidecar": self.SIDECAR, "events": self.EVENTS})
+        _, entries = collect_event_files([test_case])
+        self.assertEqual(entries[-1]["path"], entries[-2]["path"])
+
+    def test_prune_directories(self):
+        """Test that prune removes directories no entry refers to."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            files, entries = collect_event_files(self.TEST_CASES)
+            materialize(temp_dir, files, entries)
+            for entry in entries:
+                self.assertTrue((temp_dir / entry["path"]).is_dir())
+            (temp_dir / "stale").mkdir()
+            (temp_dir / "stale" / "sub-01_task-test_events.tsv").write_text("onset\n", encoding="utf-8")
+            self.assertEqual(materialize(temp_dir, files, entries, prune=True)["pruned"], 1)
+            self.assertFalse((temp_dir / "stale").exists())
+            self.assertEqual(materialize(temp_dir, files, entries)["written"], 0)
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_only_changed_payloads_written(self):
+        """Test that a changed payload writes only its new file."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            files, entries = collect_event_files(self.TEST_CASES)
+            materialize(temp_dir, files, entries)
+            changed = json.loads(json.dumps(self.TEST_CASES))
+            changed[0]["tests"]["event_tests"]["fails"][0][1][0] = 5.0
+            files, entries = collect_event_files(changed)
+            self.assertEqual(materialize(temp_dir, files, entries)["written"], 1)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
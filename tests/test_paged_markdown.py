@@ -0,0 +1,106 @@
+"""
+Unit tests for the paged markdown output of the test index and coverage report.
+
+Tests that only changed pages are rewritten, that pages of removed error codes
+are deleted, and that worker processes write the same pages as a serial run.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.scripts import generate_test_index
+from src.scripts.check_coverage import CoverageAnalyzer
+from src.scripts.paged_markdown import write_pages
+
+
+def _case(name: str, error_code: str) -> dict:
+    """Return a minimal test case."""
+    return {"name": name, "error_code": error_code, "description": f"{name} description", "schema": "8.4.0", "tests": {}}
+
+
+def _lines(argument):
+    """Render a page whose only line is its argument."""
+    return [str(argument)]
+
+
+class TestPagedMarkdown(unittest.TestCase):
+    """Test writing reports as pages."""
+
+    def setUp(self):
+        """Create a temporary output directory."""
+        self.root = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Remove the temporary output directory."""
+        shutil.rmtree(self.root)
+
+    def _generator(self, cases):
+        """Return an index generator over test cases from one file."""
+        generator = generate_test_index.TestIndexGenerator(self.root)
+        for test_case in cases:
+            generator.add_test_case(test_case, Path(f"{test_case['error_code']}.json"), "validation")
+        generator.sort_index()
+        return generator
+
+    def test_only_changed_pages_are_written(self):
+        """Test that unchanged pages are skipped and pages no longer produced are removed."""
+        pages = [("a.md", _lines, "a"), ("b.md", _lines, "b")]
+        self.assertEqual(write_pages(self.root, pages)["written"], ["a.md", "b.md"])
+        self.assertEqual(write_pages(self.root, pages)["unchanged"], ["a.md", "b.md"])
+
+        result = write_pages(self.root, [("a.md", _lines, "a changed")])
+        self.assertEqual(result, {"written": ["a.md"], "unchanged": [], "removed": ["b.md"]})
+        self.assertEqual((self.root / "a.md").read_text(encoding="utf-8"), "a changed")
+        self.assertFalse((self.root / "b.md").exists())
+
+    def test_deleted_page_is_rewritten(self):
+        """Test that a page deleted from disk is written again even though its content did not change."""
+        pages = [("a.md", _lines, "a")]
+        write_pages(self.root, pages)
+        (self.root / "a.md").unlink()
+        self.assertEqual(write_pages(self.root, pages)["written"], ["a.md"])
+
+    def test_index_pages(self):
+        """Test that each error code gets a page listing its cases and the navigation page counts them."""
+        generator = self._generator([_case("b", "TAG_INVALID"), _case("a", "TAG_INVALID"), _case("c", "UNITS_INVALID")])
+        result = generator.generate_pages(self.root / "pages")
+        self.assertEqual(sorted(result["written"]), ["TAG_INVALID.md", "UNITS_INVALID.md", "index.md"])
+
+        navigation = (self.root / "pages" / "index.md").read_text(encoding="utf-8")
+        self.assertIn("- [TAG_INVALID](TAG_INVALID.md) (2 tests)", navigation)
+        page = (self.root / "pages" / "TAG_INVALID.md").read_text(encoding="utf-8")
+        self.assertLess(page.index("### a"), page.index("### b"))
+        self.assertNotIn("### c", page)
+
+        # A new case rewrites its own page and the navigation page only
+        generator = self._generator([_case("b", "TAG_INVALID"), _case("a", "TAG_INVALID"), _case("d", "UNITS_INVALID")])
+        result = generator.generate_pages(self.root / "pages")
+        self.assertEqual(sorted(result["written"]), ["UNITS_INVALID.md"])
+        self.assertEqual(sorted(result["unchanged"]), ["TAG_INVALID.md", "index.md"])
+
+    def test_workers_match_serial(self):
+        """Test that pages rendered in worker processes are the same as serial ones."""
+        cases = [_case(f"case-{i}", f"CODE_{i % 5}") for i in range(20)]
+        self._generator(cases).generate_pages(self.root / "serial")
+        self._generator(cases).generate_pages(self.root / "parallel", workers=2)
+        for page in sorted((self.root / "serial").glob("*.md")):
+            self.assertEqual(page.read_bytes(), (self.root / "parallel" / page.name).read_bytes())
+
+    def test_coverage_pages(self):
+        """Test that the coverage report links a page per error code."""
+        analyzer = CoverageAnalyzer(self.root)
+        for test_case in [_case("a", "TAG_INVALID"), {**_case("b", "TAG_INVALID"), "warning": True}]:
+            analyzer.add_test_case(test_case["error_code"], test_case, Path("TAG_INVALID.json"), "validation")
+        analyzer.generate_markdown_pages(self.root / "coverage")
+
+        navigation = (self.root / "coverage" / "index.md").read_text(encoding="utf-8")
+        self.assertIn("| [TAG_INVALID](TAG_INVALID.md) | 2 |", navigation)
+        page = (self.root / "coverage" / "TAG_INVALID.md").read_text(encoding="utf-8")
+        self.assertIn("- **Test cases**: 2 (1 errors, 1 warnings)", page)
+        self.assertIn("- `TAG_INVALID.json`", page)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Unit tests for the schedule_tests.py script.
+
+Tests the run history store and budgeted, failure-prioritized planning.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.scripts.schedule_tests import RunHistory, plan_schedule, subtest_key
+
+
+def make_corpus():
+    """Helper to build a small corpus with two error codes."""
+    return [
+        [
+            {"name": "a", "error_code": "TAG_INVALID", "tests": {"string_tests": {"fails": ["x"], "passes": ["y"]}}},
+            {"name": "b", "error_code": "UNITS_INVALID", "tests": {"string_tests": {"fails": ["z"]}}},
+        ]
+    ]
+
+
+class TestRunHistory(unittest.TestCase):
+    """Test the RunHistory class."""
+
+    def test_failures_raise_probability(self):
+        """Test that recorded failures raise and passes lower the failure probability."""
+        history = RunHistory()
+        fail_key = subtest_key("a", "string_tests", "fails", 0)
+        pass_key = subtest_key("b", "string_tests", "fails", 0)
+        prior = history.failure_probability(fail_key)
+        history.record(
+            [
+                {"name": "a", "test_type": "string_tests", "outcome": "fails", "index": 0, "passed": False},
+                {"name": "b", "test_type": "string_tests", "outcome": "fails", "index": 0, "passed": True},
+            ]
+        )
+        self.assertGreater(history.failure_probability(fail_key), prior)
+        self.assertLess(history.failure_probability(pass_key), prior)
+
+    def test_save_and_load(self):
+        """Test that a saved history loads back unchanged."""
+        history = RunHistory()
+        history.record([{"name": "a", "test_type": "string_tests", "outcome": "fails", "index": 0, "seconds": 0.5}])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "history.json"
+            history.save(path)
+            loaded = RunHistory.load(path)
+        self.assertEqual(loaded.runs, 1)
+        self.assertEqual(loaded.tests, history.tests)
+
+    def test_missing_file_is_empty(self):
+        """Test that loading a missing file gives an empty history."""
+        history = RunHistory.load(Path(tempfile.gettempdir()) / "does-not-exist-history.json")
+        self.assertEqual(history.runs, 0)
+
+
+class TestPlanSchedule(unittest.TestCase):
+    """Test the plan_schedule function."""
+
+    def test_recent_failures_first(self):
+        """Test that a sub-test that failed recently is scheduled first."""
+        history = RunHistory()
+        history.record([{"name": "b", "test_type": "string_tests", "outcome": "fails", "index": 0, "passed": False}])
+        scheduled, missed = plan_schedule(make_corpus(), history)
+        self.assertEqual(scheduled[0]["name"], "b")
+        self.assertEqual(len(scheduled), 3)
+        self.assertEqual(missed, set())
+
+    def test_budget_stops_and_reports_missed_codes(self):
+        """Test that the plan stops at the budget and lists unreached error codes."""
+        history = RunHistory()
+        history.record(
+            [
+                {"name": "a", "test_type": "string_tests", "outcome": "fails", "index": 0, "passed": False, "seconds": 1.0},
+                {"name": "a", "test_type": "string_tests", "outcome": "passes", "index": 0, "passed": True, "seconds": 1.0},
+                {"name": "b", "test_type": "string_tests", "outcome": "fails", "index": 0, "passed": True, "seconds": 1.0},
+            ]
+        )
+        scheduled, missed = plan_schedule(make_corpus(), history, budget=1.5)
+        self.assertEqual([entry["name"] for entry in scheduled], ["a"])
+        self.assertEqual(missed, {"UNITS_INVALID"})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
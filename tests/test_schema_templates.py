@@ -0,0 +1,75 @@
+"""
+Unit tests for the schema_templates.py script.
+
+Tests skeleton deltas and lossless expansion of the compact form.
+"""
+
+import unittest
+
+from src.scripts.schema_templates import apply_delta, compact_schema_tests, expand_schema_tests, make_delta
+
+HEADER = ['HED version="1.0.0"', "'''Prologue'''", "!# start schema"]
+FOOTER = ["!# end schema", "'''Unit classes'''", "'''Epilogue'''", "!# end hed"]
+
+
+def schema_case(name, fails, passes):
+    """Helper to build a schema test case."""
+    return {
+        "error_code": "SCHEMA_ATTRIBUTE_INVALID",
+        "name": name,
+        "description": "Test",
+        "schema": "",
+        "tests": {"schema_tests": {"fails": fails, "passes": passes}},
+    }
+
+
+class TestDelta(unittest.TestCase):
+    """Test skeleton deltas."""
+
+    def test_round_trip(self):
+        """Test that insertions, replacements, and deletions are restored."""
+        skeleton = ["a", "b", "c", "d"]
+        for lines in [["a", "x", "b", "c", "d"], ["a", "y", "d"], ["b", "c"], [], ["a", "b", "c", "d", "z"]]:
+            self.assertEqual(apply_delta(skeleton, make_delta(skeleton, lines)), lines)
+
+    def test_identical(self):
+        """Test that a line list equal to its skeleton has no operations."""
+        self.assertEqual(make_delta(["a", "b"], ["a", "b"]), [])
+
+
+class TestCompactSchemaTests(unittest.TestCase):
+    """Test the compact skeleton-plus-delta form."""
+
+    def setUp(self):
+        """Build schema test cases sharing a skeleton."""
+        self.test_cases = [
+            schema_case(
+                f"case-{i}",
+                [HEADER + [f"'''Tag{i}''' {{bad}}"] + FOOTER],
+                [HEADER + [f"'''Tag{i}'''"] + FOOTER, HEADER + FOOTER],
+            )
+            for i in range(5)
+        ]
+        self.test_cases.append({"error_code": "X", "name": "no-schema", "tests": {"string_tests": {"passes": ["Red"]}}})
+
+    def test_lossless(self):
+        """Test that expansion restores the original test cases."""
+        compact = compact_schema_tests(self.test_cases)
+        self.assertEqual(expand_schema_tests(compact), self.test_cases)
+
+    def test_shared_skeleton(self):
+        """Test that common lines are stored once."""
+        compact = compact_schema_tests(self.test_cases)
+        self.assertEqual(list(compact["skeletons"].values()), [HEADER + FOOTER])
+        delta = compact["tests"][0]["tests"]["schema_tests"]["fails"][0]
+        self.assertEqual(delta["ops"], [[3, 3, ["'''Tag0''' {bad}"]]])
+        self.assertEqual(compact["tests"][0]["tests"]["schema_tests"]["passes"][1]["ops"], [])
+
+    def test_bad_format(self):
+        """Test that an unknown document is rejected."""
+        with self.assertRaises(ValueError):
+            expand_schema_tests({"format": 99, "skeletons": {}, "tests": []})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
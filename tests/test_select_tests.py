@@ -0,0 +1,101 @@
+"""
+Unit tests for the select_tests.py script.
+
+Tests the tag index and tag-based selection of sub-tests.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.scripts.select_tests import (
+    build_tag_index,
+    control_tag_matches,
+    load_tag_index,
+    select_by_names,
+    select_by_tags,
+    tag_index_path,
+)
+
+TEST_CASES = [
+    {
+        "error_code": "DEF_INVALID",
+        "name": "def-test",
+        "definitions": ["(Definition/Acc/#, (Acceleration/#))"],
+        "tests": {"string_tests": {"fails": ["Def/Acc/4.5"], "passes": ["Red"]}},
+    },
+    {
+        "error_code": "TAG_INVALID",
+        "name": "tag-test",
+        "tests": {
+            "string_tests": {"fails": ["Item/Bl"]},
+            "event_tests": {"passes": [[["onset", "HED"], [1, "Onset, Red"]]]},
+        },
+    },
+]
+
+
+class TestTagIndex(unittest.TestCase):
+    """Test building and querying the tag index."""
+
+    def setUp(self):
+        """Build the index of the sample test cases."""
+        self.index = build_tag_index(TEST_CASES)
+
+    def test_prefix_postings(self):
+        """Test that every prefix of a tag points at its sub-test."""
+        self.assertEqual(self.index["item/bl"], [[1, "string_tests", "fails", 0]])
+        self.assertEqual(self.index["item"], [[1, "string_tests", "fails", 0]])
+        self.assertIn([0, "string_tests", "fails", 0], self.index["def/acc"])
+
+    def test_select(self):
+        """Test that selection matches any tag without regard to case."""
+        selected = select_by_tags(self.index, TEST_CASES, ["ONSET", "Item/Bl"])
+        self.assertEqual(selected, {(1, "string_tests", "fails", 0), (1, "event_tests", "passes", 0)})
+        self.assertEqual(select_by_tags(self.index, TEST_CASES, ["Unknown"]), set())
+
+    def test_definitions_select_case(self):
+        """Test that a tag in the definitions selects every sub-test of the case."""
+        selected = select_by_tags(self.index, TEST_CASES, ["Definition"])
+        self.assertEqual(selected, {(0, "string_tests", "fails", 0), (0, "string_tests", "passes", 0)})
+
+    def test_placeholder_key(self):
+        """Test that every placeholder use is under the # key."""
+        self.assertEqual(self.index["#"], [[0, "definitions", "", -1]])
+
+    def test_select_by_names(self):
+        """Test that naming a test selects all of its sub-tests."""
+        selected = select_by_names(TEST_CASES, ["tag-test"])
+        self.assertEqual(selected, {(1, "string_tests", "fails", 0), (1, "event_tests", "passes", 0)})
+
+    def test_control_characters_reported(self):
+        """Test that tags with control characters are collected while indexing and matched without them."""
+        test_cases = [{"name": "backspace-test", "tests": {"string_tests": {"fails": ["Item/Bl\b, Red"]}}}]
+        control_tags = {}
+        index = build_tag_index(test_cases, control_tags)
+        self.assertEqual(control_tags, {"Item/Bl\b": {"backspace-test"}})
+        self.assertNotIn("item/bl", index)
+        self.assertEqual(control_tag_matches(control_tags, "Item/Bl"), ["Item/Bl\b"])
+        self.assertEqual(control_tag_matches(control_tags, "Item"), [])
+        self.assertEqual(control_tag_matches(control_tags, "Red"), [])
+
+    def test_stale_index_rebuilt(self):
+        """Test that the stored index is rebuilt when the source changes."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            path = temp_dir / "validation_tests.json"
+            path.write_text(json.dumps(TEST_CASES), encoding="utf-8")
+            self.assertIn("onset", load_tag_index(path)["tags"])
+            self.assertTrue(tag_index_path(path).exists())
+            self.assertEqual(load_tag_index(path)["control_tags"], {})
+
+            path.write_text(json.dumps(TEST_CASES[:1]), encoding="utf-8")
+            self.assertNotIn("onset", load_tag_index(path)["tags"])
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
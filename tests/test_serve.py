@@ -0,0 +1,164 @@
+"""
+Unit tests for the serve.py script.
+
+Tests the queries of the in-memory service, the response cache, reloading of
+changed files, and the ETag and gzip handling of the HTTP server.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+from src.scripts import serve
+from src.scripts.serve import CorpusService, accepts_gzip, make_handler
+
+VALIDATION_CASES = [
+    {
+        "name": "tag-bad",
+        "error_code": "TAG_INVALID",
+        "alt_codes": ["PLACEHOLDER_INVALID"],
+        "schema": "8.4.0",
+        "description": "x" * 2000,
+        "tests": {"string_tests": {"fails": ["Bad"], "passes": []}, "sidecar_tests": {}},
+    },
+    {
+        "name": "units-bad",
+        "error_code": "UNITS_INVALID",
+        "schema": ["8.3.0", "8.4.0"],
+        "tests": {"event_tests": {"fails": [], "passes": [[["onset"], [1]]]}},
+    },
+]
+
+SCHEMA_CASES = [{"name": "schema-bad", "error_code": "SCHEMA_LOAD_FAILED", "schema": "", "tests": {"schema_tests": {}}}]
+
+
+def _write(path: Path, data):
+    """Write JSON data to a file."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+class TestServe(unittest.TestCase):
+    """Test the test suite query service."""
+
+    def setUp(self):
+        """Create a temporary json_test_data directory."""
+        self.root = Path(tempfile.mkdtemp())
+        _write(self.root / "validation_tests.json", VALIDATION_CASES)
+        _write(self.root / "schema_tests.json", SCHEMA_CASES)
+        _write(self.root / "validation_code_dict.json", {"TAG_INVALID": ["tag-bad"]})
+        self.service = CorpusService(self.root, reload_interval=0)
+        self.service.refresh()
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.root)
+
+    def _names(self, path: str):
+        """Return the status and the names of the test cases a query returns."""
+        status, result = self.service.query(path)
+        return status, [test_case["name"] for test_case in result["test_cases"]]
+
+    def test_queries(self):
+        """Test each endpoint."""
+        self.assertEqual(self.service.query("/cases/units-bad")[1]["error_code"], "UNITS_INVALID")
+        self.assertEqual(self.service.query("/cases/missing")[0], 404)
+        self.assertEqual(self._names("/codes/PLACEHOLDER_INVALID"), (200, ["tag-bad"]))
+        self.assertEqual(self._names("/schemas/8.4.0"), (200, ["tag-bad", "units-bad"]))
+        self.assertEqual(self._names("/kinds/string"), (200, ["tag-bad"]))
+        self.assertEqual(self._names("/kinds/sidecar"), (200, []))
+        self.assertEqual(self.service.query("/dictionaries/validation_code_dict"), (200, {"TAG_INVALID": ["tag-bad"]}))
+        self.assertEqual(self.service.query("/dictionaries/schema_code_dict")[0], 404)
+        self.assertEqual(self.service.query("/")[1]["files"], {"validation_tests.json": 2, "schema_tests.json": 1})
+        self.assertEqual(self.service.query("/coverage")[1]["codes"]["UNITS_INVALID"]["schema_versions"], ["8.3.0", "8.4.0"])
+        self.assertEqual(self.service.query("/codes/a/b")[0], 404)
+
+    def test_reload_changed_files_only(self):
+        """Test that only a changed file is reloaded and cached responses are dropped."""
+        self.assertEqual(self.service.refresh(), [])
+        before = self.service.response("/codes/TAG_INVALID")
+        schema_index = self.service.corpora["schema_tests.json"]
+
+        path = self.root / "validation_tests.json"
+        _write(path, VALIDATION_CASES + [{"name": "tag-worse", "error_code": "TAG_INVALID", "tests": {}}])
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(self.service.refresh(), ["validation_tests.json"])
+        self.assertIs(self.service.corpora["schema_tests.json"], schema_index)
+        after = self.service.response("/codes/TAG_INVALID")
+        self.assertNotEqual(before[2], after[2])
+        self.assertEqual(self._names("/codes/TAG_INVALID"), (200, ["tag-bad", "tag-worse"]))
+
+        (self.root / "validation_code_dict.json").unlink()
+        self.assertEqual(self.service.refresh(), ["validation_code_dict.json"])
+        self.assertEqual(self.service.query("/dictionaries/validation_code_dict")[0], 404)
+
+    def test_response_cache(self):
+        """Test that responses are cached by URL path, 404s are not cached, and the cache is bounded."""
+        first = self.service.response("/cases/tag-bad?a=1")
+        self.assertEqual(self.service.response("/cases/tag-bad?b=2"), first)
+        self.assertEqual(list(self.service.responses), ["/cases/tag-bad"])
+        compressed = self.service.response("/cases/tag-bad", accept_gzip=True)
+        self.assertIs(compressed[1], self.service.responses["/cases/tag-bad"][3])
+        self.assertEqual((compressed[2], compressed[3]), (first[2][:-1] + '-gzip"', "gzip"))
+        self.assertEqual(self.service.response("/codes/UNITS_INVALID", accept_gzip=True)[3], None)
+        self.assertEqual(self.service.response("/cases/missing")[0], 404)
+        self.assertNotIn("/cases/missing", self.service.responses)
+
+        limit = serve.MAX_CACHED_RESPONSES
+        for number in range(limit + 1):
+            self.service.response(f"/codes/CODE_{number}")
+        self.assertEqual(len(self.service.responses), limit)
+        self.assertNotIn("/cases/tag-bad", self.service.responses)
+
+    def test_accepts_gzip(self):
+        """Test that Accept-Encoding q-values are honored."""
+        self.assertTrue(accepts_gzip("gzip, deflate, br"))
+        self.assertTrue(accepts_gzip("br;q=1.0, GZIP;q=0.5"))
+        self.assertTrue(accepts_gzip("*"))
+        self.assertFalse(accepts_gzip("gzip;q=0"))
+        self.assertFalse(accepts_gzip("gzip;q=0.0, *"))
+        self.assertFalse(accepts_gzip("identity, *;q=0"))
+        self.assertFalse(accepts_gzip(""))
+
+    def test_http_etag_and_gzip(self):
+        """Test that the server answers 304 for a matching ETag and compresses large bodies."""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(self.service))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/cases/tag-bad"
+            request = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+            with urllib.request.urlopen(request) as response:
+                self.assertEqual(response.headers["Content-Encoding"], "gzip")
+                self.assertEqual(json.loads(gzip.decompress(response.read()))["name"], "tag-bad")
+                etag = response.headers["ETag"]
+
+            self.assertTrue(etag.endswith('-gzip"'))
+
+            request = urllib.request.Request(url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                urllib.request.urlopen(request)
+            self.assertEqual(context.exception.code, 304)
+
+            # The gzip ETag does not validate the identity body
+            request = urllib.request.Request(url, headers={"Accept-Encoding": "gzip;q=0", "If-None-Match": etag})
+            with urllib.request.urlopen(request) as response:
+                self.assertIsNone(response.headers["Content-Encoding"])
+                self.assertEqual(json.loads(response.read())["name"], "tag-bad")
+                self.assertEqual(response.headers["ETag"], etag.replace("-gzip", ""))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
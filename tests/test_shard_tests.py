@@ -0,0 +1,114 @@
+"""
+Unit tests for the shard_tests.py script and its cost model.
+
+Tests cost estimation, timing calibration, and LPT partitioning.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.scripts.cost_model import calibrate_costs, estimate_case_cost, estimate_subtest_cost
+from src.scripts.shard_tests import main, partition_lpt
+
+
+class TestCostModel(unittest.TestCase):
+    """Test the cost estimation functions."""
+
+    def test_event_rows_increase_cost(self):
+        """Test that more event rows give a higher estimate."""
+        header = ["onset", "duration", "HED"]
+        small = estimate_subtest_cost("event_tests", [header, [1, 0, "Red"]])
+        large = estimate_subtest_cost("event_tests", [header] + [[i, 0, "Red"] for i in range(20)])
+        self.assertGreater(large, small)
+
+    def test_combo_costs_more_than_string(self):
+        """Test that a combo test costs more than a string test."""
+        combo = {"sidecar": {"event_code": {"HED": {"a": "Red"}}}, "events": [["onset", "HED"], [1, "Red"]]}
+        self.assertGreater(estimate_subtest_cost("combo_tests", combo), estimate_subtest_cost("string_tests", "Red"))
+
+    def test_case_cost_sums_subtests(self):
+        """Test that a case cost includes every sub-test."""
+        one = {"tests": {"string_tests": {"fails": ["Red"]}}}
+        two = {"tests": {"string_tests": {"fails": ["Red"], "passes": ["Red"]}}}
+        self.assertAlmostEqual(estimate_case_cost(two) - estimate_case_cost(one), estimate_subtest_cost("string_tests", "Red"))
+
+    def test_calibrate_costs(self):
+        """Test that timings replace estimates on the estimate scale."""
+        estimates = {"a": 10.0, "b": 10.0, "c": 5.0}
+        calibrated = calibrate_costs(estimates, {"a": 1.0, "b": 3.0})
+        # 20 units over 4 seconds gives 5 units per second
+        self.assertEqual(calibrated, {"a": 5.0, "b": 15.0, "c": 5.0})
+        self.assertEqual(calibrate_costs(estimates, {}), estimates)
+
+
+class TestPartitionLpt(unittest.TestCase):
+    """Test the partition_lpt function."""
+
+    def test_every_item_assigned_once(self):
+        """Test that the shards partition the items."""
+        costs = [5.0, 1.0, 3.0, 3.0, 2.0, 8.0, 1.0]
+        shards = partition_lpt(costs, 3)
+        self.assertEqual(sorted(i for shard in shards for i in shard), list(range(len(costs))))
+
+    def test_balanced_and_deterministic(self):
+        """Test the LPT assignment for a known case and that it is the same every time."""
+        costs = [7.0, 5.0, 4.0, 4.0, 3.0, 3.0]
+        shards = partition_lpt(costs, 2)
+        # LPT gives 14/12 here, within 4/3 of the optimal 13/13
+        self.assertEqual(shards, [[0, 3, 5], [1, 2, 4]])
+        self.assertEqual(partition_lpt(costs, 2), shards)
+
+    def test_more_shards_than_items(self):
+        """Test that extra shards are empty."""
+        self.assertEqual(partition_lpt([1.0], 3), [[0], [], []])
+
+    def test_invalid_shard_count(self):
+        """Test that a shard count below one is rejected."""
+        with self.assertRaises(ValueError):
+            partition_lpt([1.0], 0)
+
+
+class TestMainFunction(unittest.TestCase):
+    """Test the main function."""
+
+    def test_shards_cover_input(self):
+        """Test that the written shards together hold every input case."""
+        project_root = Path(__file__).parent.parent
+        input_path = project_root / "json_test_data" / "validation_tests.json"
+        if not input_path.exists():
+            self.skipTest("Consolidated validation tests not found")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = main(["--shards", "3", "--input", str(input_path), "--output-dir", temp_dir, "--format", "names"])
+            self.assertEqual(result, 0)
+            names = []
+            for shard_file in sorted(Path(temp_dir).glob("*.txt")):
+                names.extend(shard_file.read_text(encoding="utf-8").split("\n")[:-1])
+
+        with open(input_path, "r", encoding="utf-8") as f:
+            expected = [case["name"] for case in json.load(f)]
+        self.assertEqual(sorted(names), sorted(expected))
+
+    def test_relative_paths_from_project_root(self):
+        """Test that relative input and output paths resolve against the project root, not the working directory."""
+        project_root = Path(__file__).parent.parent
+        if not (project_root / "json_test_data" / "validation_tests.json").exists():
+            self.skipTest("Consolidated validation tests not found")
+
+        with tempfile.TemporaryDirectory(dir=project_root) as temp_dir:
+            cwd = os.getcwd()
+            os.chdir(Path(temp_dir).parent.parent)
+            try:
+                args = ["--shards", "2", "--input", "json_test_data/validation_tests.json", "--format", "names"]
+                result = main(args + ["--output-dir", Path(temp_dir).name])
+            finally:
+                os.chdir(cwd)
+            self.assertEqual(result, 0)
+            self.assertEqual(len(list(Path(temp_dir).glob("*.txt"))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
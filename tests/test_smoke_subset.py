@@ -0,0 +1,80 @@
+"""
+Unit tests for the smoke_subset.py script.
+
+Tests the weighted greedy set cover and that the generated
+subset keeps every coverage element of the full suite.
+"""
+
+import unittest
+from pathlib import Path
+
+from src.scripts.corpus import iter_subtests, load_consolidated
+from src.scripts.smoke_subset import build_subset, coverage_elements, greedy_set_cover, select_smoke_subset
+
+
+def all_elements(test_cases):
+    """Helper to collect every coverage element of a list of test cases."""
+    elements = set()
+    for test_case in test_cases:
+        for test_type, outcome, _, _ in iter_subtests(test_case):
+            elements |= coverage_elements(test_case, test_type, outcome)
+    return elements
+
+
+class TestGreedySetCover(unittest.TestCase):
+    """Test the greedy_set_cover function."""
+
+    def test_prefers_cheap_cover(self):
+        """Test that two cheap sets are preferred to one expensive set with the same elements."""
+        candidates = [(10.0, {1, 2}), (1.0, {1}), (1.0, {2})]
+        self.assertEqual(sorted(greedy_set_cover(candidates)), [1, 2])
+
+    def test_prefers_large_set_at_equal_cost(self):
+        """Test that a set covering more elements wins at equal cost."""
+        candidates = [(1.0, {1}), (1.0, {1, 2, 3}), (1.0, {3})]
+        self.assertEqual(greedy_set_cover(candidates), [1])
+
+    def test_empty_input(self):
+        """Test that no candidates give an empty cover."""
+        self.assertEqual(greedy_set_cover([]), [])
+
+
+class TestSmokeSubset(unittest.TestCase):
+    """Test subset construction."""
+
+    def test_build_subset_trims_tests(self):
+        """Test that only selected sub-tests are kept and other fields are unchanged."""
+        test_case = {
+            "name": "a",
+            "error_code": "TAG_INVALID",
+            "tests": {"string_tests": {"fails": ["x", "y"], "passes": ["z"]}},
+        }
+        subset = build_subset([test_case], {(0, "string_tests", "fails", 1)})
+        self.assertEqual(subset, [{"name": "a", "error_code": "TAG_INVALID", "tests": {"string_tests": {"fails": ["y"]}}}])
+
+    def test_pass_and_fail_required(self):
+        """Test that a code is covered with both a passing and a failing sub-test."""
+        test_cases = [
+            {"name": "a", "error_code": "TAG_INVALID", "tests": {"string_tests": {"fails": ["x"]}}},
+            {"name": "b", "error_code": "TAG_INVALID", "tests": {"string_tests": {"passes": ["y"]}}},
+        ]
+        (subset,), _, chosen = select_smoke_subset([test_cases])
+        self.assertEqual(chosen, 2)
+        self.assertEqual([case["name"] for case in subset], ["a", "b"])
+
+    def test_actual_data_coverage_preserved(self):
+        """Test that the subset of the actual suite keeps every coverage element."""
+        data_dir = Path(__file__).parent.parent / "json_test_data"
+        paths = [data_dir / "validation_tests.json", data_dir / "schema_tests.json"]
+        if not all(path.exists() for path in paths):
+            self.skipTest("Consolidated test files not found")
+
+        corpora = [load_consolidated(path) for path in paths]
+        subsets, covered, _ = select_smoke_subset(corpora)
+        full = all_elements([case for cases in corpora for case in cases])
+        self.assertEqual(all_elements([case for cases in subsets for case in cases]), full)
+        self.assertEqual(covered, len(full))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)